@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Admission Control
+Bounded job queue for the web backend's analyses, so a burst of requests cannot start more
+yt-dlp processes than the machine (and the YouTube request budget) can take:
+
+- at most `concurrency` jobs run at once; up to `max_queued` more wait in arrival order
+- each client may have at most `per_client` jobs running or waiting
+- a full queue or quota is refused at once with a Retry-After estimate, never by blocking
+- waiting jobs are told their position and estimated start whenever the queue moves, and
+  every few seconds in between; estimates come from the durations of recent jobs
+- a job whose client has gone (its EventQueue is closed) leaves the queue without running
+
+Given a `path`, the queue lives in a small SQLite file shared by every worker process, so the
+limits hold for the whole server rather than per worker: each worker runs the jobs whose
+streams it holds, and starts them when they reach a free slot (checked every POLL_INTERVAL).
+Workers keep their jobs' rows fresh; the rows of a worker that died expire after
+STALE_SECONDS. Without a path the queue is private to the process.
+
+Limits are read from the environment by limits_from_env(), so the web backend and
+gunicorn.conf.py (which sizes each worker's threads to them) agree.
+
+    admission = AdmissionQueue(*limits_from_env(), path='analysis/.admission.sqlite3')
+    admission.submit(client, lambda: run_job(events), events)   # raises Rejected
+"""
+
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_JOB_SECONDS = 300.0  # Estimate until a job has finished
+DURATION_SAMPLES = 20        # Recent job durations averaged for estimates
+UPDATE_INTERVAL = 5.0        # Seconds between position updates while nothing moves
+POLL_INTERVAL = 1.0          # Seconds between checks for slots freed by other workers
+STALE_SECONDS = 30.0         # A job not refreshed this long belongs to a worker that died
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,  -- arrival order
+    owner     INTEGER NOT NULL,                   -- pid of the worker holding the client's stream
+    client    TEXT    NOT NULL,
+    submitted REAL    NOT NULL,
+    started   REAL,
+    seen      REAL    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS durations (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    seconds REAL NOT NULL
+);
+"""
+
+# Environment variable -> default, in AdmissionQueue argument order
+LIMIT_DEFAULTS = {
+    'ANALYZE_CONCURRENCY': 2,   # Jobs running at once
+    'ANALYZE_QUEUE_SIZE': 8,    # Jobs waiting for a slot
+    'ANALYZE_CLIENT_QUOTA': 1,  # Jobs one client may have running or waiting
+}
+
+
+def limits_from_env(environ=os.environ):
+    """(concurrency, max_queued, per_client) from the ANALYZE_* environment variables."""
+    return tuple(int(environ.get(name, default)) for name, default in LIMIT_DEFAULTS.items())
+
+
+class Rejected(Exception):
+    """A job refused at the door; retry_after is whole seconds until it is worth retrying."""
+
+    def __init__(self, reason, retry_after):
+        messages = {
+            'queue_full': 'Too many analyses are waiting',
+            'client_quota': 'You already have the maximum number of analyses running or queued',
+        }
+        super().__init__(f"{messages[reason]}; retry in about {retry_after}s")
+        self.reason = reason  # 'queue_full' or 'client_quota'
+        self.retry_after = retry_after
+
+
+class _Job:
+    def __init__(self, client, target, events, submitted):
+        self.client = client
+        self.target = target
+        self.events = events
+        self.submitted = submitted
+        self.started = None
+
+
+def _seconds(estimate):
+    return max(1, math.ceil(estimate))
+
+
+class AdmissionQueue:
+    """Runs submitted jobs in threads, at most `concurrency` at a time (see module docs)."""
+
+    def __init__(self, concurrency=2, max_queued=8, per_client=1,
+                 update_interval=UPDATE_INTERVAL, depth_gauge=None, path=None):
+        if concurrency < 1 or max_queued < 0 or per_client < 1:
+            raise ValueError("concurrency and per_client must be at least 1, max_queued at least 0")
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.per_client = per_client
+        self.update_interval = update_interval
+        self.depth_gauge = depth_gauge  # Optional gauge kept at the number of jobs waiting here
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._jobs = {}  # Row id -> _Job, for the jobs whose streams this process holds
+        self._ticking = False
+        self._notified = (None, 0.0)  # Waiting row ids at the last position update, and when
+
+    def _db(self):
+        """This process's connection; a forked worker opens its own."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            if self.path is None:
+                conn = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+                conn.execute('PRAGMA journal_mode=WAL')
+            conn.row_factory = sqlite3.Row
+            conn.executescript(SCHEMA)
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        """The queue, locked against this process's other threads and every other worker."""
+        with self._lock:
+            conn = self._db()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def _load(self, conn, now):
+        """(running rows, waiting rows in arrival order), after refreshing this process's rows
+        and dropping jobs whose client has gone or whose worker has died."""
+        gone = [job_id for job_id, job in self._jobs.items() if job.started is None and job.events.closed]
+        for job_id in gone:
+            del self._jobs[job_id]
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in gone])
+        # Rewriting our own rows also restores any that expired while this process was stalled
+        conn.executemany(
+            "INSERT OR REPLACE INTO jobs (id, owner, client, submitted, started, seen) VALUES (?, ?, ?, ?, ?, ?)",
+            [(job_id, os.getpid(), job.client, job.submitted, job.started, now)
+             for job_id, job in self._jobs.items()]
+        )
+        conn.execute("DELETE FROM jobs WHERE seen < ?", (now - STALE_SECONDS,))
+        rows = conn.execute("SELECT id, client, started FROM jobs ORDER BY id").fetchall()
+        return [row for row in rows if row['started'] is not None], [row for row in rows if row['started'] is None]
+
+    def _expected(self, conn):
+        seconds = conn.execute(
+            "SELECT AVG(seconds) FROM (SELECT seconds FROM durations ORDER BY id DESC LIMIT ?)",
+            (DURATION_SAMPLES,)
+        ).fetchone()[0]
+        return DEFAULT_JOB_SECONDS if seconds is None else seconds
+
+    def expected_duration(self):
+        """Seconds a job is expected to take: the mean of recent jobs."""
+        with self._lock:
+            return self._expected(self._db())
+
+    def stats(self):
+        now = time.time()
+        with self._transaction() as conn:
+            running, waiting = self._load(conn, now)
+            return {'running': len(running), 'queued': len(waiting),
+                    'concurrency': self.concurrency, 'maxQueued': self.max_queued,
+                    'expectedSeconds': round(self._expected(conn), 1)}
+
+    def submit(self, client, target, events):
+        """Queue target() for client, reporting to events; raises Rejected when full."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Rejections are raised after the commit, which keeps the load-time cleanup
+            rejected = self._rejection(conn, client, now)
+            if rejected is None:
+                job_id = conn.execute(
+                    "INSERT INTO jobs (owner, client, submitted, seen) VALUES (?, ?, ?, ?)",
+                    (os.getpid(), client, now, now)
+                ).lastrowid
+                self._jobs[job_id] = _Job(client, target, events, now)
+                self._update(conn, now, force=True)
+        if rejected is not None:
+            raise rejected
+
+    def _rejection(self, conn, client, now):
+        """Rejected for a job that client may not queue now, else None."""
+        running, waiting = self._load(conn, now)
+        mine = [row for row in (*running, *waiting) if row['client'] == client]
+        if len(mine) >= self.per_client:
+            estimates = self._estimates(conn, running, waiting, now)
+            return Rejected('client_quota', _seconds(min(estimates[row['id']][1] for row in mine)))
+        if len(running) >= self.concurrency and len(waiting) >= self.max_queued:
+            # Nothing waiting (max_queued 0): retry when a running job should be done
+            estimates = self._estimates(conn, running, waiting, now)
+            waits = ([estimates[row['id']][0] for row in waiting]
+                     or [estimates[row['id']][1] for row in running])
+            return Rejected('queue_full', _seconds(min(waits)))
+        return None
+
+    def _estimates(self, conn, running, waiting, now):
+        """{row id: (seconds until it starts, seconds until it finishes)} for every job."""
+        typical = self._expected(conn)
+        estimates = {}
+        slots = []
+        for row in running:
+            left = max(0.0, typical - (now - row['started']))
+            estimates[row['id']] = (0.0, left)
+            slots.append(left)
+        slots += [0.0] * (self.concurrency - len(slots))
+        heapq.heapify(slots)
+        # Each waiting job takes the first slot to free up, in arrival order
+        for row in waiting:
+            start = heapq.heappop(slots)
+            estimates[row['id']] = (start, start + typical)
+            heapq.heappush(slots, start + typical)
+        return estimates
+
+    def _update(self, conn, now, force=False):
+        """Start whichever of our jobs have reached a free slot, then send position updates
+        when the queue has moved, when forced, or every update_interval."""
+        running, waiting = self._load(conn, now)
+        due = waiting[:max(0, self.concurrency - len(running))]
+        ours = [row['id'] for row in due if row['id'] in self._jobs]  # Other workers start theirs
+        for job_id in ours:
+            job = self._jobs[job_id]
+            job.started = now
+            conn.execute("UPDATE jobs SET started = ? WHERE id = ?", (now, job_id))
+            job.events.event({'type': 'started', 'waitedSeconds': round(now - job.submitted, 1)})
+            threading.Thread(target=self._run, args=(job_id, job), daemon=True).start()
+        if ours:
+            running, waiting = self._load(conn, now)
+
+        queue = tuple(row['id'] for row in waiting)
+        last_queue, last_time = self._notified
+        if force or queue != last_queue or now - last_time >= self.update_interval:
+            self._notify(conn, running, waiting, now)
+            self._notified = (queue, now)
+
+        if self._jobs and not self._ticking:
+            self._ticking = True
+            threading.Thread(target=self._tick, daemon=True).start()
+
+    def _run(self, job_id, job):
+        try:
+            job.target()
+        finally:
+            now = time.time()
+            with self._transaction() as conn:
+                del self._jobs[job_id]
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                conn.execute("INSERT INTO durations (seconds) VALUES (?)", (now - job.started,))
+                conn.execute("DELETE FROM durations WHERE id <= (SELECT MAX(id) FROM durations) - ?",
+                             (DURATION_SAMPLES,))
+                self._update(conn, now, force=True)
+
+    def _notify(self, conn, running, waiting, now):
+        """Send each of our waiting jobs its position and estimated start."""
+        if self.depth_gauge is not None:
+            self.depth_gauge.set(sum(1 for row in waiting if row['id'] in self._jobs))
+        estimates = self._estimates(conn, running, waiting, now)
+        for position, row in enumerate(waiting, 1):
+            job = self._jobs.get(row['id'])
+            if job is None:
+                continue
+            wait = estimates[row['id']][0]
+            job.events.event({
+                'type': 'queued',
+                'position': position,
+                'queued': len(waiting),
+                'etaSeconds': round(wait),
+                'startsAt': datetime.fromtimestamp(now + wait, timezone.utc).isoformat(timespec='seconds'),
+            })
+
+    def _tick(self):
+        # While this process has jobs: keep their rows fresh, start them when another worker
+        # frees a slot, and by writing to each stream, reveal clients that left
+        while True:
+            time.sleep(min(POLL_INTERVAL, self.update_interval))
+            with self._transaction() as conn:
+                if not self._jobs:
+                    self._ticking = False
+                    if self.depth_gauge is not None:
+                        self.depth_gauge.set(0)
+                    return
+                self._update(conn, time.time())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Anomaly Detection
+Flags spikes and drops in daily views for YouTubePerformanceAuditor with robust z-scores:
+each day is compared with the median and MAD (median absolute deviation) of the
+trailing window before it, for every video of the TrendEngine's Date × Video matrix at
+once and for the channel as a whole.
+
+    z = 0.6745 × (views − median) / MAD
+
+Consecutive flagged days form one event. Short events are one-off spikes (or dips);
+events that last SUSTAINED_DAYS or more are sustained growth (or decline), because the
+trailing median takes that long to catch up with a new level. Channel spikes are
+attributed to the videos whose views rose furthest above their own baselines that day.
+
+A video is only checked once it has a full baseline window since its first view, so
+launches are never flagged.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASELINE_WINDOW = 28   # Trailing days in each baseline
+Z_THRESHOLD = 3.5      # |z| above this is anomalous (Iglewicz & Hoaglin)
+MIN_EXCESS_VIEWS = 10  # Ignore deviations smaller than this, however unusual
+MAD_FLOOR = 1.0        # Views; keeps flat (e.g. all-zero) baselines from dividing by zero
+SUSTAINED_DAYS = 7
+EVENT_LABELS = {
+    ('spike', 'one-off'): 'one-off spike',
+    ('spike', 'sustained'): 'sustained growth',
+    ('drop', 'one-off'): 'one-off dip',
+    ('drop', 'sustained'): 'sustained decline',
+}
+CHUNK_CELLS = 1 << 22  # Window cells materialised at once (~32 MB of float64)
+
+
+def first_active_days(matrix):
+    """Index of each column's first non-zero day (len(matrix) for all-zero columns)."""
+    return np.where(matrix.any(axis=0), (matrix > 0).argmax(axis=0), len(matrix))
+
+
+def candidate_cells(matrix, first_active, window=BASELINE_WINDOW, min_excess=MIN_EXCESS_VIEWS):
+    """(days, columns) of the cells that could deviate from their baseline by min_excess.
+
+    The trailing median lies between the window's minimum and maximum, so a cell within
+    min_excess of both can never be flagged. This cheap screen skips the median for most
+    cells: quiet days, long-tail videos and days without a full baseline.
+    """
+    days = len(matrix)
+    if days <= window:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    windows = sliding_window_view(matrix, window, axis=0)[:-1]  # windows[s]: baseline of day s+window
+    current = matrix[window:]
+    possible = ((current - windows.min(axis=-1) >= min_excess)
+                | (windows.max(axis=-1) - current >= min_excess))
+    possible &= np.arange(window, days)[:, None] >= first_active + window
+    rows, columns = np.nonzero(possible)
+    return rows + window, columns
+
+
+def baseline_at(matrix, rows, columns, window=BASELINE_WINDOW):
+    """Trailing median and MAD (excluding the day itself) of the given cells."""
+    median = np.empty(len(rows))
+    mad = np.empty(len(rows))
+    offsets = np.arange(-window, 0)
+    step = max(1, CHUNK_CELLS // window)
+    for c in range(0, len(rows), step):
+        chunk = slice(c, c + step)
+        windows = matrix[rows[chunk, None] + offsets, columns[chunk, None]].astype(np.float64)
+        median[chunk] = np.median(windows, axis=1)
+        mad[chunk] = np.median(np.abs(windows - median[chunk, None]), axis=1)
+    return median, mad
+
+
+def _runs(flags):
+    """Runs of consecutive same-sign flags in every column: (column, start day, days) arrays."""
+    days, columns = flags.shape
+    # Column-major with a zero separator after each column, so runs never cross columns
+    padded = np.zeros((columns, days + 1), dtype=np.int8)
+    padded[:, :days] = flags.T
+    flat = padded.ravel()
+    changes = np.flatnonzero(np.diff(flat, prepend=0))  # First index of every run
+    lengths = np.diff(np.append(changes, len(flat)))
+    flagged = flat[changes] != 0
+    column, start = np.divmod(changes[flagged], days + 1)
+    return column, start, lengths[flagged]
+
+
+def detect_anomalies(trends, window=BASELINE_WINDOW, threshold=Z_THRESHOLD,
+                     min_excess=MIN_EXCESS_VIEWS, drivers=3):
+    """Spike and drop events for the channel and every video of a TrendEngine.
+
+    Returns {'channel': [event, ...], 'videos': [event, ...]}, strongest first. Each event is
+    a dict with kind ('spike' / 'drop'), pattern ('one-off' / 'sustained'), start date, days,
+    peak date, peak views, baseline and z; video events carry their 'video_code' and channel
+    spikes their 'drivers' ({video_code, excess_views, share}).
+    """
+    result = {'channel': [], 'videos': []}
+    series = {'channel': trends.daily[:, None]}
+    if trends.video_daily is not None:
+        series['videos'] = trends.video_daily
+
+    for name, matrix in series.items():
+        width = matrix.shape[1]
+        rows, columns = candidate_cells(matrix, first_active_days(matrix), window, min_excess)
+        median, mad = baseline_at(matrix, rows, columns, window)
+        excess = matrix[rows, columns] - median
+        z = 0.6745 * excess / np.maximum(mad, MAD_FLOOR)
+        kind = np.where((z >= threshold) & (excess >= min_excess), 1,
+                        np.where((z <= -threshold) & (excess <= -min_excess), -1, 0)).astype(np.int8)
+
+        flags = np.zeros(matrix.shape, dtype=np.int8)
+        flags[rows, columns] = kind
+        cell_keys = rows * width + columns  # Sorted: np.nonzero walks the matrix in row order
+
+        for v, start, length in zip(*_runs(flags)):
+            # Every day of an event is a candidate cell, so its z and baseline are at hand
+            cells = np.searchsorted(cell_keys, (start + np.arange(length)) * width + v)
+            peak = cells[np.abs(z[cells]).argmax()]
+            day = int(rows[peak])
+            event = {
+                'kind': 'spike' if kind[peak] > 0 else 'drop',
+                'pattern': 'sustained' if length >= SUSTAINED_DAYS else 'one-off',
+                'start': str(trends.dates[start]),
+                'days': int(length),
+                'peak_date': str(trends.dates[day]),
+                'peak_views': int(matrix[day, v]),
+                'baseline': float(median[peak]),
+                'z': round(float(z[peak]), 2),
+            }
+            if name == 'videos':
+                event['video_code'] = int(v)
+            result[name].append(event)
+
+    # Attribute channel spikes to the videos furthest above their own baseline that day
+    if 'videos' in series:
+        matrix = series['videos']
+        first_active = first_active_days(matrix)
+        for event in result['channel']:
+            if event['kind'] != 'spike':
+                continue
+            day = int(np.searchsorted(trends.dates, np.datetime64(event['peak_date'])))
+            # Videos without a full baseline yet (new uploads) count all their views as excess
+            established = np.flatnonzero(first_active + window <= day)
+            baseline = np.zeros(matrix.shape[1])
+            baseline[established] = baseline_at(matrix, np.full(len(established), day), established, window)[0]
+            excess = matrix[day] - baseline
+            channel_excess = max(event['peak_views'] - event['baseline'], 1.0)
+            event['drivers'] = [
+                {'video_code': int(v), 'excess_views': round(float(excess[v]), 1),
+                 'share': round(float(excess[v] / channel_excess), 3)}
+                for v in np.argsort(excess)[::-1][:drivers] if excess[v] > 0
+            ]
+
+    for events in result.values():
+        events.sort(key=lambda e: abs(e['z']), reverse=True)
+    return result
@@ -1,109 +1,573 @@
 """
 Flask Backend for YouTube Success Analyzer Web Interface
 """
-from flask import Flask, request, jsonify, Response, send_from_directory
+from flask import Flask, request, jsonify, Response, send_from_directory, send_file
 from flask_cors import CORS
 import subprocess
 import json
+import hashlib
+import pickle
+import mimetypes
 import sys
 import os
 from pathlib import Path
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from urllib.parse import urlencode
+
+from run_profiler import load_profile, CPU_PROFILERS
+from run_status import active_runs, latest_run
+from run_catalogue import RunCatalogue
+from run_output import is_failed
+from report_downloads import (list_artefacts, resolve_artefact, choose_encoding, compressed_copy,
+                              run_bundle, supported_encodings)
+from youtube_success_analyzer import INTERIM_FILENAME
+from youtube_performance_auditor import YouTubePerformanceAuditor
+from sse_stream import EventQueue, coalesce, encode_events, VERBOSITY_LEVELS
+from admission import AdmissionQueue, Rejected, limits_from_env
+import service_metrics as metrics
+
+APP_DIR = Path(__file__).resolve().parent
+ANALYSIS_DIR = APP_DIR / 'analysis'
+STATUS_DIR = ANALYSIS_DIR / '.status'
+CATALOGUE_PATH = ANALYSIS_DIR / 'catalogue.sqlite3'
+COMPRESSED_DIR = ANALYSIS_DIR / '.compressed'  # Cached gzip / brotli copies of run artefacts
+MAX_TIME_BUDGET = 3600  # Seconds
+MAX_UPLOAD_BYTES = 1024 * 1024 * 1024  # Analytics exports per audit upload
+AUDIT_DIR = ANALYSIS_DIR / '.audits'  # Finished upload audits, shared by every worker process
+ADMISSION_PATH = ANALYSIS_DIR / '.admission.sqlite3'  # Analysis queue shared by every worker process
+AUDIT_CACHE_SIZE = 8  # Finished upload audits kept in memory (per worker process)
+AUDIT_STORE_SIZE = 64  # Finished upload audits kept in AUDIT_DIR
+SERIES_CACHE_SIZE = 32  # Rendered chart-series responses kept per audit
+SERIES_MAX_AGE = 24 * 3600  # Seconds browsers may reuse a chart series: an audit never changes
+REPORT_MAX_AGE = 300  # Seconds browsers may reuse a downloaded artefact before revalidating
+PROXY_HOPS = int(os.environ.get('PROXY_HOPS', 0))  # Reverse proxies whose X-Forwarded-For is trusted
 
 app = Flask(__name__, static_folder='.')
 CORS(app)
+if PROXY_HOPS:
+    # Behind a proxy every request comes from the proxy: take the client address it forwards
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS)
+
+# The audit report is captured by redirecting stdout, which is process-wide: one audit at a time
+audit_lock = threading.Lock()
+audits = OrderedDict()  # Audit id -> {'auditor', 'results'}, least recently used first
+audits_lock = threading.Lock()  # Request threads share the audit cache
+catalogue = RunCatalogue(CATALOGUE_PATH, read_only=True)  # The analyzer is the only writer
+# Admission control for /api/analyze, across every worker process: each analysis runs its own yt-dlp
+admission = AdmissionQueue(*limits_from_env(), depth_gauge=metrics.QUEUED_ANALYSES, path=ADMISSION_PATH)
+
+
+def read_interim(path):
+    """Interim results written by an anytime-mode checkpoint, or None"""
+    run_dir = resolve_run_dir(path)
+    if run_dir is None:
+        return None
+    try:
+        with open(run_dir / INTERIM_FILENAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def resolve_run_dir(path):
+    """Resolve an output path reported by the analyzer, refusing anything outside analysis/."""
+    if not path:
+        return None
+    run_dir = (APP_DIR / path).resolve()
+    if ANALYSIS_DIR.resolve() not in run_dir.parents or not run_dir.is_dir():
+        return None
+    return run_dir
+
+def resolve_report_dir(path):
+    """A published run directory, refusing hidden ones (staging runs, status files, caches)"""
+    run_dir = resolve_run_dir(path)
+    if run_dir is None or any(part.startswith('.') for part in run_dir.relative_to(ANALYSIS_DIR.resolve()).parts):
+        return None
+    return run_dir
 
 @app.route('/')
 def index():
     """Serve the main HTML page"""
     return send_from_directory('.', 'index.html')
 
+def sse_response(events, verbosity):
+    """Stream an EventQueue as coalesced SSE frames, gzip-compressed when the client accepts it"""
+    compress = bool(request.accept_encodings['gzip'])
+    
+    def generate():
+        metrics.SSE_CLIENTS.inc()
+        try:
+            yield from encode_events(coalesce(events, verbosity), compress=compress)
+        finally:
+            metrics.SSE_CLIENTS.dec()
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Keep reverse proxies from holding frames back
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def run_analysis(command, events):
+    """Run the analyzer, reporting its output, progress and interim results to events"""
+    metrics.ACTIVE_ANALYSES.inc()
+    started = time.perf_counter()
+    status = 'failed'
+    try:
+        # Run the Python script
+        process = subprocess.Popen(
+            command,
+            cwd=APP_DIR,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        
+        output_path = ''
+        video_count = 0
+        
+        # Read every line, even after the client has gone, so the analyzer never blocks on a full pipe
+        for line in iter(process.stdout.readline, ''):
+            if line:
+                events.log(line.strip())
+                
+                # Extract statistics from output
+                if 'Found' in line and 'videos' in line:
+                    try:
+                        video_count = int(line.split()[2])
+                    except:
+                        pass
+                
+                if 'Progress:' in line:
+                    try:
+                        events.progress(int(line.split('(')[1].split('%')[0]))
+                    except:
+                        pass
+                
+                if 'Interim reports' in line:
+                    interim = read_interim(line.split('):', 1)[-1].strip())
+                    if interim:
+                        events.event({'type': 'interim', **interim})
+                
+                if 'All files saved to:' in line:
+                    output_path = line.split('All files saved to:')[1].strip()
+        
+        process.wait()
+        
+        run_dir = resolve_run_dir(output_path)
+        profile = load_profile(run_dir) if run_dir else None
+        metrics.observe_profile(profile)
+        if process.returncode == 0 and run_dir:
+            status = 'success'
+        
+        # Send completion message
+        events.event({'type': 'complete', 'outputPath': output_path, 'stats': {'videoCount': video_count, 'totalViews': '0'}, 'profile': profile})
+        
+    except Exception as e:
+        events.event({'type': 'error', 'message': str(e)})
+    finally:
+        metrics.ANALYSES_TOTAL.labels(status=status).inc()
+        metrics.ANALYSIS_SECONDS.observe(time.perf_counter() - started)
+        metrics.ACTIVE_ANALYSES.dec()
+        events.close()
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_channel():
     """Run the YouTube analyzer with streaming output"""
     data = request.get_json()
     channel_url = data.get('channelUrl', '')
+    cpu_profile = data.get('cpuProfile')
+    time_budget = data.get('timeBudget')
+    verbosity = data.get('verbosity', 'normal')
     
     if not channel_url:
         return jsonify({'error': 'No channel URL provided'}), 400
     
-    def generate():
-        """Stream the analysis progress"""
+    if cpu_profile and cpu_profile not in CPU_PROFILERS:
+        return jsonify({'error': f"cpuProfile must be one of: {', '.join(CPU_PROFILERS)}"}), 400
+    
+    if time_budget is not None and (isinstance(time_budget, bool) or not isinstance(time_budget, (int, float))
+                                    or not 0 < time_budget <= MAX_TIME_BUDGET):
+        return jsonify({'error': f'timeBudget must be a number of seconds above 0 and at most {MAX_TIME_BUDGET}'}), 400
+    
+    if verbosity not in VERBOSITY_LEVELS:
+        return jsonify({'error': f"verbosity must be one of: {', '.join(VERBOSITY_LEVELS)}"}), 400
+    
+    # Anytime mode: interim reports are streamed to the page as they improve
+    command = [sys.executable, 'youtube_success_analyzer.py', '--url', channel_url, '--no-open', '--anytime']
+    if time_budget:
+        # A budget paces per-video requests, which only deep extraction makes
+        command += ['--deep', '--time-budget', str(time_budget)]
+    if cpu_profile:
+        command += ['--cpu-profile', cpu_profile]
+    
+    # Admitted analyses stream 'queued' (position, ETA) and 'started' events before any output
+    events = EventQueue()
+    try:
+        admission.submit(request.remote_addr, lambda: run_analysis(command, events), events)
+    except Rejected as e:
+        metrics.ANALYSES_REJECTED.labels(reason=e.reason).inc()
+        response = jsonify({'error': str(e), 'reason': e.reason, 'retryAfter': e.retry_after})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    return sse_response(events, verbosity)
+
+@app.route('/api/analyze/queue', methods=['GET'])
+def analyze_queue():
+    """Running and waiting analyses, and how long one is expected to take"""
+    return jsonify(admission.stats())
+
+class LineQueue:
+    """stdout stand-in that collects the audit report, handing each complete line to events as it is printed"""
+    
+    def __init__(self, events=None):
+        self.events = events
+        self.report = []
+        self._partial = ''
+    
+    def write(self, text):
+        *lines, self._partial = (self._partial + text).split('\n')
+        for line in lines:
+            self.report.append(line)
+            if self.events:
+                self.events.log(line)
+        return len(text)
+    
+    def flush(self):
+        pass
+
+def parse_uploaded_exports():
+    """Parse the multipart upload's CSV files while the body streams in; returns auditor frames"""
+    # Deferred: only upload audits need the form parser and the export parser
+    from werkzeug.formparser import parse_form_data
+    from export_stream import ExportStreamParser, frames_from_parsers
+    
+    parsers = []
+    
+    def stream_factory(*args, **kwargs):
+        # Each file part is parsed as it arrives instead of being spooled to memory or disk
+        parsers.append(ExportStreamParser())
+        return parsers[-1]
+    
+    parse_form_data(request.environ, stream_factory=stream_factory,
+                    max_content_length=MAX_UPLOAD_BYTES, silent=False)
+    frames = frames_from_parsers(parser.finish() for parser in parsers)
+    files = [{'kind': p.kind, 'bytes': p.bytes, 'rows': p.rows} for p in parsers]
+    return frames, files
+
+def run_upload_audit(auditor, out):
+    """Run a full audit with its report written to out; returns (ok, audit seconds)"""
+    started = time.perf_counter()
+    with audit_lock, redirect_stdout(out):
+        ok = auditor.run_audit()
+    return ok, time.perf_counter() - started
+
+def remember_audit(audit_id, entry):
+    """Put an audit in this worker's cache, evicting the least recently used; returns the cached entry"""
+    with audits_lock:
+        entry = audits.setdefault(audit_id, entry)  # Another thread may have loaded it meanwhile
+        audits.move_to_end(audit_id)
+        while len(audits) > AUDIT_CACHE_SIZE:
+            audits.popitem(last=False)
+    return entry
+
+def register_audit(auditor, results):
+    """Keep a finished audit for follow-up requests on any worker; returns its id"""
+    audit_id = uuid.uuid4().hex[:12]
+    entry = {'auditor': auditor, 'results': results}
+    
+    # Follow-up requests may land on another worker process: store the audit where all can load it
+    try:
+        AUDIT_DIR.mkdir(parents=True, exist_ok=True)
+        partial = AUDIT_DIR / f".{audit_id}.partial"
+        with open(partial, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, AUDIT_DIR / f"{audit_id}.pkl")
+    except OSError as e:
+        # stdout may be redirected into another audit's report: log instead of printing
+        app.logger.warning("Upload audit %s is only available on this worker: %s", audit_id, e)
+    stored = []
+    for path in AUDIT_DIR.glob('*.pkl'):
+        try:
+            stored.append((path.stat().st_mtime, path))
+        except OSError:
+            pass  # Pruned by another worker
+    for _, path in sorted(stored)[:-AUDIT_STORE_SIZE]:
+        path.unlink(missing_ok=True)
+    
+    remember_audit(audit_id, entry)
+    return audit_id
+
+def find_audit(audit_id):
+    """A finished upload audit from this worker's cache or the shared store, or None"""
+    if not (len(audit_id) == 12 and all(c in '0123456789abcdef' for c in audit_id)):
+        return None
+    with audits_lock:
+        entry = audits.get(audit_id)
+        if entry is not None:
+            audits.move_to_end(audit_id)
+            return entry
+    try:
+        with open(AUDIT_DIR / f"{audit_id}.pkl", 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None  # Pruned, or stored by an incompatible version of the auditor
+    return remember_audit(audit_id, entry)
+
+@app.route('/api/audit', methods=['POST'])
+def audit_exports():
+    """Audit uploaded Analytics CSVs in-process; JSON, or SSE with ?stream=1 / Accept: text/event-stream"""
+    if request.mimetype != 'multipart/form-data':
+        return jsonify({'error': 'Upload the Totals / Chart data / Table data CSVs as multipart/form-data'}), 400
+    
+    stream = (request.args.get('stream') == '1'
+              or request.accept_mimetypes.best == 'text/event-stream')
+    verbosity = request.args.get('verbosity', 'normal')
+    if verbosity not in VERBOSITY_LEVELS:
+        return jsonify({'error': f"verbosity must be one of: {', '.join(VERBOSITY_LEVELS)}"}), 400
+    
+    started = time.perf_counter()
+    try:
+        frames, files = parse_uploaded_exports()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    upload = {'files': files, 'parseSeconds': round(time.perf_counter() - started, 3)}
+    auditor = YouTubePerformanceAuditor.from_frames(**frames)
+    
+    def finish(ok, seconds, report):
+        upload['auditSeconds'] = round(seconds, 3)
+        if not ok:
+            return None
+        results = auditor.results()
+        results['auditId'] = register_audit(auditor, {**results, 'upload': upload, 'report': report})
+        return {**results, 'upload': upload}
+    
+    if not stream:
+        out = LineQueue()
+        ok, seconds = run_upload_audit(auditor, out)
+        results = finish(ok, seconds, '\n'.join(out.report))
+        if results is None:
+            return jsonify({'error': 'Could not audit the uploaded exports', 'report': '\n'.join(out.report)}), 422
+        return jsonify({**results, 'report': '\n'.join(out.report)})
+    
+    def work(events):
+        """Audit with the report streamed as log lines, then send the structured results"""
+        out = LineQueue(events)
         try:
-            # Run the Python script
-            process = subprocess.Popen(
-                [sys.executable, 'youtube_success_analyzer.py'],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
-            )
-            
-            # Send the URL and confirmation
-            process.stdin.write(f"{channel_url}\n")
-            process.stdin.write("y\n")
-            process.stdin.flush()
-            
-            output_path = ''
-            video_count = 0
-            total_views = 0
-            
-            # Stream output
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    # Parse output for progress updates
-                    yield f"data: {json.dumps({'type': 'log', 'message': line.strip()})}\n\n"
-                    
-                    # Extract statistics from output
-                    if 'Found' in line and 'videos' in line:
-                        try:
-                            video_count = int(line.split()[2])
-                        except:
-                            pass
-                    
-                    if 'Progress:' in line:
-                        try:
-                            percent = int(line.split('(')[1].split('%')[0])
-                            yield f"data: {json.dumps({'type': 'progress', 'percent': percent})}\n\n"
-                        except:
-                            pass
-                    
-                    if 'All files saved to:' in line:
-                        output_path = line.split('All files saved to:')[1].strip()
-            
-            process.stdin.close()
-            process.wait()
-            
-            # Send completion message
-            yield f"data: {json.dumps({'type': 'complete', 'outputPath': output_path, 'stats': {'videoCount': video_count, 'totalViews': '0'}})}\n\n"
-            
+            ok, seconds = run_upload_audit(auditor, out)
+            results = finish(ok, seconds, '\n'.join(out.report))
+            if results is None:
+                events.event({'type': 'error', 'message': 'Could not audit the uploaded exports'})
+            else:
+                events.event({'type': 'complete', **results})
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            events.event({'type': 'error', 'message': f"{type(e).__name__}: {e}"})
+        finally:
+            events.close()
     
-    return Response(generate(), mimetype='text/event-stream')
+    events = EventQueue()
+    threading.Thread(target=work, args=(events,), daemon=True).start()
+    return sse_response(events, verbosity)
 
-@app.route('/api/open-folder', methods=['POST'])
-def open_folder():
-    """Open the output folder in file explorer"""
-    data = request.get_json()
-    path = data.get('path', '')
+@app.route('/api/audit/<audit_id>', methods=['GET'])
+def get_audit(audit_id):
+    """Results of a recent upload audit, report included"""
+    entry = find_audit(audit_id)
+    if entry is None:
+        return jsonify({'error': 'Unknown or expired audit'}), 404
+    return jsonify({**entry['results'], 'auditId': audit_id})
+
+def parse_series_query(auditor):
+    """build_series() keyword arguments from the query string; raises ValueError"""
+    from chart_series import DEFAULT_POINTS, MAX_POINTS
+    
+    points = request.args.get('points', DEFAULT_POINTS, type=int)
+    if not 3 <= points <= MAX_POINTS:
+        raise ValueError(f'points must be between 3 and {MAX_POINTS}')
+    options = {
+        'points': points,
+        'method': request.args.get('method', 'lttb'),
+        'metric': request.args.get('metric', 'daily'),
+        'start': request.args.get('start') or None,
+        'end': request.args.get('end') or None,
+    }
+    
+    top = request.args.get('top')
+    if top == 'all':
+        options['top'] = len(auditor.videos_df) if auditor.videos_df is not None else 0
+    elif top is not None:
+        if not top.isdigit():
+            raise ValueError("top must be a number of videos or 'all'")
+        options['top'] = int(top)
+    
+    videos = request.args.get('videos')
+    if videos:
+        if auditor.videos_df is None:
+            raise ValueError('This audit has no per-video data')
+        # Video codes or Content ids
+        codes_by_id = {content: code for code, content in enumerate(auditor.videos_df['Content'])}
+        codes = []
+        for video in videos.split(','):
+            if video.isdigit() and int(video) < len(codes_by_id):
+                codes.append(int(video))
+            elif video in codes_by_id:
+                codes.append(codes_by_id[video])
+            else:
+                raise ValueError(f'Unknown video: {video}')
+        options['videos'] = codes
+    return options
+
+@app.route('/api/audit/<audit_id>/series', methods=['GET'])
+def get_audit_series(audit_id):
+    """Downsampled daily-view series of an upload audit for charts (cacheable)"""
+    entry = find_audit(audit_id)
+    if entry is None:
+        return jsonify({'error': 'Unknown or expired audit'}), 404
+    auditor = entry['auditor']
+    if auditor.trends is None:
+        return jsonify({'error': 'This audit has no daily views'}), 404
     
-    if not path or not os.path.exists(path):
+    # An audit never changes, so the query alone identifies the response
+    query = urlencode(sorted(request.args.items(multi=True)))
+    etag = hashlib.sha1(f"{audit_id}?{query}".encode()).hexdigest()[:20]
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        # The cache is shared by request threads: look up and evict under the audit cache's lock
+        with audits_lock:
+            cache = entry.setdefault('series', OrderedDict())
+            body = cache.get(etag)
+            if body is not None:
+                cache.move_to_end(etag)
+        if body is None:
+            from chart_series import build_series
+            try:
+                payload = build_series(auditor.trends, auditor.videos_df, **parse_series_query(auditor))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            body = json.dumps(payload, separators=(',', ':'))
+            with audits_lock:
+                cache[etag] = body
+                while len(cache) > SERIES_CACHE_SIZE:
+                    cache.popitem(last=False)
+        response = Response(body, mimetype='application/json')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={SERIES_MAX_AGE}, immutable'
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Expose service metrics in Prometheus text format"""
+    body, content_type = metrics.render_metrics()
+    return Response(body, content_type=content_type)
+
+@app.route('/api/status', methods=['GET'])
+def get_status():
+    """Live status of running analyses plus the most recently finished run"""
+    return jsonify({
+        'active': active_runs(STATUS_DIR),
+        'latest': latest_run(STATUS_DIR)
+    })
+
+@app.route('/api/runs', methods=['GET'])
+def list_channels():
+    """Catalogued channels with run counts, plus the latest run overall"""
+    return jsonify({'channels': catalogue.channels(), 'latest': catalogue.latest_run()})
+
+@app.route('/api/runs/<channel>', methods=['GET'])
+def list_channel_runs(channel):
+    """Runs for one channel, newest first"""
+    limit = request.args.get('limit', 100, type=int)
+    return jsonify({'runs': catalogue.channel_runs(channel, limit=limit)})
+
+@app.route('/api/runs/<channel>/views', methods=['GET'])
+def channel_views_over_time(channel):
+    """Total views per run for one channel, oldest first"""
+    since = request.args.get('since', type=float)
+    return jsonify({'series': catalogue.views_over_time(channel, since=since)})
+
+@app.route('/api/profile', methods=['GET'])
+def get_profile():
+    """Return the run_profile.json timings for a completed run"""
+    run_dir = resolve_run_dir(request.args.get('path', ''))
+    if run_dir is None:
+        return jsonify({'error': 'Invalid path'}), 400
+    
+    profile = load_profile(run_dir)
+    if profile is None:
+        return jsonify({'error': 'No profile recorded for this run'}), 404
+    
+    return jsonify(profile)
+
+@app.route('/api/reports', methods=['GET'])
+def list_reports():
+    """Artefacts of a run with their download links; failed runs (RUN_FAILED.json) are flagged"""
+    path = request.args.get('path', '')
+    run_dir = resolve_report_dir(path)
+    if run_dir is None:
+        return jsonify({'error': 'Invalid path'}), 400
+    
+    files = list_artefacts(run_dir)
+    for artefact in files:
+        artefact['url'] = f"/api/reports/file?{urlencode({'path': path, 'name': artefact['name']})}"
+    return jsonify({'files': files, 'failed': is_failed(run_dir),
+                    'bundle': f"/api/reports/bundle?{urlencode({'path': path})}"})
+
+@app.route('/api/reports/file', methods=['GET'])
+def download_report():
+    """Stream one run artefact, compressed when the client accepts it (conditional and range requests)"""
+    run_dir = resolve_report_dir(request.args.get('path', ''))
+    artefact = resolve_artefact(run_dir, request.args.get('name', '')) if run_dir else None
+    if artefact is None:
+        return jsonify({'error': 'No such file in this run'}), 404
+    
+    mimetype = mimetypes.guess_type(artefact.name)[0] or 'application/octet-stream'
+    if artefact.suffix.lower() == '.md':
+        mimetype = 'text/markdown'
+    accepted = {encoding for encoding in supported_encodings() if request.accept_encodings[encoding]}
+    encoding = choose_encoding(artefact, accepted)
+    
+    # The compressed copy is a file of its own, so its ETag and byte ranges differ from the original's
+    response = send_file(
+        compressed_copy(artefact, encoding, COMPRESSED_DIR) if encoding else artefact,
+        mimetype=mimetype,
+        as_attachment=request.args.get('download') == '1',
+        download_name=artefact.name,
+        conditional=True,
+        last_modified=artefact.stat().st_mtime,
+        max_age=REPORT_MAX_AGE,
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/api/reports/bundle', methods=['GET'])
+def download_report_bundle():
+    """Stream a completed run as one .zip (built once, then reused until the run changes)"""
+    run_dir = resolve_report_dir(request.args.get('path', ''))
+    if run_dir is None:
         return jsonify({'error': 'Invalid path'}), 400
     
     try:
-        if sys.platform == 'win32':
-            os.startfile(path)
-        elif sys.platform == 'darwin':
-            subprocess.run(['open', path])
-        else:
-            subprocess.run(['xdg-open', path])
-        
-        return jsonify({'success': True})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        archive = run_bundle(run_dir)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except OSError as e:
+        app.logger.warning("Could not bundle %s: %s", run_dir, e)
+        return jsonify({'error': 'Could not build the report bundle'}), 500
+    return send_file(archive, mimetype='application/zip', as_attachment=True,
+                     download_name=f"{run_dir.parent.name}_{archive.name}",
+                     conditional=True, max_age=REPORT_MAX_AGE)
 
 if __name__ == '__main__':
     import os
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Auditor Groupby Benchmark
+Times the per-video aggregation of YouTubePerformanceAuditor on synthetic Chart data,
+grouping on (title, Content, Duration) string tuples versus factorised integer video
+codes (including the cost of factorising and joining the attributes back).
+
+Usage:
+    python3 benchmarks/bench_auditor_groupby.py
+    python3 benchmarks/bench_auditor_groupby.py --videos 2000 --days 365 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_data import write_analytics_csvs  # noqa: E402
+
+
+def by_string_tuple(chart_df):
+    stats = chart_df.groupby(['Video title', 'Content', 'Duration']).agg({
+        'Views': 'sum',
+        'Date': ['min', 'max']
+    }).reset_index()
+    stats.columns = ['Video title', 'Content', 'Duration', 'Total Views', 'First Date', 'Last Date']
+    return stats
+
+
+def by_video_code(auditor):
+    auditor.chart_df = auditor.chart_df.drop(columns='video_code')
+    auditor.index_videos()
+    grouped = auditor.chart_df.groupby('video_code', sort=False)
+    return auditor.videos_df.join([
+        grouped['Views'].sum().rename('Total Views'),
+        grouped['Date'].min().rename('First Date'),
+        grouped['Date'].max().rename('Last Date'),
+    ])
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the auditor's per-video groupby")
+    parser.add_argument('--videos', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from youtube_performance_auditor import YouTubePerformanceAuditor
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = write_analytics_csvs(workdir, videos=args.videos, days=args.days)
+        auditor = YouTubePerformanceAuditor(str(paths['totals']), str(paths['chart']), str(paths['table']))
+        with contextlib.redirect_stdout(io.StringIO()):
+            auditor.load_data()
+
+    rows = len(auditor.chart_df)
+    print(f"⏱️  Per-video groupby on {rows:,} chart rows ({args.videos:,} videos × {args.days} days)")
+    print("-" * 80)
+    print(f"   {'grouping':<16}{'best ms':>10}{'median ms':>11}")
+
+    best_str, median_str, expected = best_of(lambda: by_string_tuple(auditor.chart_df), args.repeat)
+    best_int, median_int, actual = best_of(lambda: by_video_code(auditor), args.repeat)
+    print(f"   {'string tuple':<16}{best_str * 1000:>10.1f}{median_str * 1000:>11.1f}")
+    print(f"   {'video code':<16}{best_int * 1000:>10.1f}{median_int * 1000:>11.1f}")
+    print(f"\n   Speed-up: {best_str / best_int:.2f}x")
+
+    same = (expected.set_index('Content')['Total Views'].sort_index()
+            .equals(actual.set_index('Content')['Total Views'].sort_index()))
+    print(f"   Totals match: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Engagement Metric Derivation Benchmark
+Compares the original per-video derivation (strptime, formatting and rate rounding
+inside the extraction loop) with the batch stage in video_metrics.
+
+Usage:
+    python3 benchmarks/bench_metrics.py              # 100k synthetic videos
+    python3 benchmarks/bench_metrics.py --videos 1000000
+"""
+
+import argparse
+import copy
+import gc
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_data import generate_channel_entries  # noqa: E402
+from video_metrics import derive_metrics, format_rows, format_number  # noqa: E402
+
+RENDERED_ROWS = 50  # Largest table any report renders
+
+
+def legacy_per_item(videos):
+    """The derivation as it ran inside the original extraction loop."""
+    for metadata in videos:
+        if metadata['duration']:
+            duration = int(metadata['duration'])
+            metadata['duration_formatted'] = f"{duration // 3600:02d}:{(duration % 3600) // 60:02d}:{duration % 60:02d}"
+        else:
+            metadata['duration_formatted'] = "Unknown"
+
+        if metadata['upload_date']:
+            try:
+                date_obj = datetime.strptime(metadata['upload_date'], '%Y%m%d')
+                metadata['upload_date_formatted'] = date_obj.strftime('%Y-%m-%d')
+            except ValueError:
+                metadata['upload_date_formatted'] = metadata['upload_date']
+        else:
+            metadata['upload_date_formatted'] = "Unknown"
+
+        metadata['view_count_formatted'] = format_number(metadata['view_count'])
+        metadata['like_count_formatted'] = format_number(metadata['like_count'])
+        metadata['comment_count_formatted'] = format_number(metadata['comment_count'])
+
+        views = metadata['view_count']
+        likes = metadata['like_count']
+        comments = metadata['comment_count']
+        if views > 0:
+            metadata['engagement_rate'] = round(((likes + comments) / views) * 100, 2)
+            metadata['like_rate'] = round((likes / views) * 100, 2)
+            metadata['comment_rate'] = round((comments / views) * 100, 2)
+        else:
+            metadata['engagement_rate'] = 0
+            metadata['like_rate'] = 0
+            metadata['comment_rate'] = 0
+
+
+def batch_rendered_only(videos):
+    """Batch rates for everything, display formatting for the rendered rows only."""
+    derive_metrics(videos)
+    top = sorted(videos, key=lambda v: v['view_count'], reverse=True)[:RENDERED_ROWS]
+    format_rows(top)
+
+
+def batch_all_rows(videos):
+    """Batch rates plus formatting for every row (what a full CSV export needs)."""
+    derive_metrics(videos)
+    format_rows(videos)
+
+
+def timed(fn, videos, runs):
+    best = float('inf')
+    for _ in range(runs):
+        data = copy.deepcopy(videos)
+        gc.collect()
+        gc.disable()  # Like timeit: keep collector pauses from the deep copies out of the timing
+        try:
+            start = time.perf_counter()
+            fn(data)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-item vs batch metric derivation")
+    parser.add_argument('--videos', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=3, help="Best of N runs")
+    args = parser.parse_args()
+
+    videos = generate_channel_entries(args.videos)
+    print(f"⏱️  Metric derivation on {args.videos:,} synthetic videos (best of {args.runs})")
+    print("-" * 80)
+
+    baseline, legacy = timed(legacy_per_item, videos, args.runs)
+    print(f"   per-item (original loop)        {baseline * 1000:9.1f} ms")
+
+    for label, fn in (("batch, rendered rows formatted", batch_rendered_only),
+                      ("batch, all rows formatted", batch_all_rows)):
+        elapsed, batch = timed(fn, videos, args.runs)
+        print(f"   {label:<32}{elapsed * 1000:9.1f} ms   ({baseline / elapsed:.1f}x)")
+
+    # Rates must agree with the original round() to within float representation error
+    mismatches = sum(
+        1 for old, new in zip(legacy, batch)
+        if any(abs(old[f] - new[f]) > 0.0100001 for f in ('engagement_rate', 'like_rate', 'comment_rate'))
+        or old['upload_date_formatted'] != new['upload_date_formatted']
+    )
+    print(f"\n   {'✅' if not mismatches else '❌'} {mismatches} rows differ from the per-item results")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Extraction Profile Benchmark
+Extracts the same synthetic channel from the local stand-in server once per extraction
+profile (minimal / standard / full) and reports bytes transferred, time per video and
+the size of the data kept in memory and exported.
+
+Usage:
+    python3 benchmarks/bench_profiles.py
+    python3 benchmarks/bench_profiles.py --videos 5000 --latency 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from standin_server import start_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction profiles against the stand-in server")
+    parser.add_argument('--videos', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0, help="Mean response latency in ms")
+    args = parser.parse_args()
+
+    from extractors import StandInExtractor, EXTRACTION_PROFILES
+    from youtube_success_analyzer import YouTubeSuccessAnalyzer
+
+    server = start_server(videos=args.videos, latency_ms=args.latency)
+    print(f"⏱️  Extraction profiles on {args.videos:,} synthetic videos ({args.latency:g}ms latency)")
+    print("-" * 80)
+    print(f"   {'profile':<10}{'bytes/video':>13}{'ms/video':>10}{'kept KB':>10}{'CSV KB':>9}")
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir, StandInExtractor(server.url) as extractor:
+            for profile in EXTRACTION_PROFILES:
+                analyzer = YouTubeSuccessAnalyzer(extractor=extractor, profile=profile)
+                analyzer.channel_name = 'synthetic'
+                analyzer.channel_url = 'https://www.youtube.com/@synthetic/videos'
+                analyzer.output_dir = Path(workdir)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    analyzer.extract_video_metadata()
+                    analyzer.create_performance_rankings()  # Writes detailed_video_data.csv
+
+                summary = analyzer.profiler.summary()
+                videos = summary['videos']
+                # Every request but the channel listing is a per-video fetch
+                listing_bytes = len(json.dumps({'entries': analyzer.scanned_videos}).encode('utf-8'))
+                video_bytes = summary['network']['bytes'] - listing_bytes
+                kept_kb = len(pickle.dumps(analyzer.video_data, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+                csv_kb = (Path(workdir) / 'detailed_video_data.csv').stat().st_size / 1024
+                print(f"   {profile:<10}{video_bytes / max(videos['count'], 1):>13,.0f}"
+                      f"{videos['mean_seconds'] * 1000:>10.2f}{kept_kb:>10.1f}{csv_kb:>9.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Start-up Import Budget Benchmark
+Measures how long each entry-point module takes to import using `python -X importtime`
+and fails if any of them exceeds its budget.
+
+Usage:
+    python3 benchmarks/bench_startup.py            # check budgets
+    python3 benchmarks/bench_startup.py --runs 9   # more samples, steadier median
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budget per entry point, in milliseconds.
+# Heavy dependencies (yt_dlp, pandas) must stay out of these paths.
+IMPORT_BUDGET_MS = {
+    'youtube_success_analyzer': 100,
+    'youtube_performance_auditor': 100,
+    'check_analyzer_status': 100,
+    'run_performance_audit': 100,
+    'watch_exports': 100,
+}
+
+# Modules that must never be imported just to start a CLI
+FORBIDDEN_AT_STARTUP = ('yt_dlp', 'pandas', 'numpy')
+
+
+def measure_import(module):
+    """Import `module` in a fresh interpreter and return (total_ms, {name: cumulative_ms})."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cum_us, name = [p.strip() for p in line.replace('import time:', '|').split('|')]
+        cumulative[name.strip()] = int(cum_us) / 1000
+
+    return cumulative.get(module, 0.0), cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check start-up import time budgets")
+    parser.add_argument('--runs', type=int, default=5, help="Samples per module (median is reported)")
+    args = parser.parse_args()
+
+    print("⏱️  Start-up import benchmark (median of %d runs)" % args.runs)
+    print("-" * 80)
+
+    failures = []
+    for module, budget in IMPORT_BUDGET_MS.items():
+        samples = []
+        imported = {}
+        for _ in range(args.runs):
+            total_ms, imported = measure_import(module)
+            samples.append(total_ms)
+        median = statistics.median(samples)
+
+        heavy = [name for name in imported if name.split('.')[0] in FORBIDDEN_AT_STARTUP]
+        status = "✅" if median <= budget and not heavy else "❌"
+        print(f"   {status} {module:<32} {median:7.1f} ms  (budget {budget} ms)")
+
+        slowest = sorted(
+            ((ms, name) for name, ms in imported.items() if name != module and '.' not in name),
+            reverse=True
+        )[:3]
+        for ms, name in slowest:
+            print(f"         ↳ {name:<28} {ms:7.1f} ms")
+
+        if median > budget:
+            failures.append(f"{module}: {median:.1f} ms > {budget} ms")
+        if heavy:
+            failures.append(f"{module}: imports {', '.join(sorted(set(h.split('.')[0] for h in heavy)))} at start-up")
+
+    print()
+    if failures:
+        print("❌ Import budget exceeded:")
+        for failure in failures:
+            print(f"   • {failure}")
+        return 1
+
+    print("✅ All entry points within their import budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
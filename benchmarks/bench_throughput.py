@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Extraction Throughput Benchmark
+Runs YouTubeSuccessAnalyzer.extract_video_metadata end to end against the local
+stand-in server and reports videos/s, per-request latency, retries, throttled requests
+and errors, with and without HTTP connection pooling. Every channel in a batch shares
+one extractor session, as `youtube_success_analyzer.py --url A --url B` does.
+
+Usage:
+    python3 benchmarks/bench_throughput.py
+    python3 benchmarks/bench_throughput.py --videos 2000 --latency 20 --error-rate 0.05 --throttle 300
+    python3 benchmarks/bench_throughput.py --channels 5 --pool-size 8
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from standin_server import start_server  # noqa: E402
+
+
+def run_batch(server_url, channels, pool_size, workdir):
+    """Extract `channels` channels over one shared extractor; return aggregated results."""
+    from extractors import StandInExtractor
+    from youtube_success_analyzer import YouTubeSuccessAnalyzer
+
+    extractor = StandInExtractor(server_url, backoff=0.05, pool_size=pool_size)
+    latencies, videos, errors, ok = [], 0, 0, True
+
+    start = time.perf_counter()
+    with extractor:
+        for c in range(channels):
+            analyzer = YouTubeSuccessAnalyzer(extractor=extractor)
+            analyzer.channel_name = f'synthetic{c}'
+            analyzer.channel_url = f'https://www.youtube.com/@synthetic{c}/videos'
+            analyzer.output_dir = Path(workdir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                ok = analyzer.extract_video_metadata() and ok
+            latencies.extend(analyzer.profiler.request_timings)
+            videos += len(analyzer.video_data)
+            errors += analyzer.profiler.video_errors
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'ok': ok,
+        'videos': videos,
+        'seconds': elapsed,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        'connections': extractor.pool.created if extractor.pool else len(latencies),
+        'retries': extractor.retries,
+        'throttled': extractor.throttled,
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction throughput against the stand-in server")
+    parser.add_argument('--videos', type=int, default=1000, help="Videos per channel")
+    parser.add_argument('--channels', type=int, default=3, help="Channels per batch (one shared session)")
+    parser.add_argument('--latency', type=float, default=10, help="Mean response latency in ms")
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--throttle', type=float, help="Server requests per second before 429")
+    parser.add_argument('--pool-size', type=int, default=4, help="Keep-alive connections in the pooled run")
+    args = parser.parse_args()
+
+    server = start_server(videos=args.videos, latency_ms=args.latency,
+                          error_rate=args.error_rate, throttle=args.throttle)
+    print(f"⏱️  Extraction against stand-in server ({args.channels} x {args.videos:,} videos, "
+          f"{args.latency:g}ms latency, {args.error_rate:.0%} errors, "
+          f"throttle {f'{args.throttle:g}/s' if args.throttle else 'off'})")
+    print("-" * 80)
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for label, pool_size in (("new connection per request", 0),
+                                     (f"pooled ({args.pool_size} keep-alive)", args.pool_size)):
+                r = results[label] = run_batch(server.url, args.channels, pool_size, workdir)
+                print(f"   {'✅' if r['ok'] else '❌'} {label:<28} {r['videos'] / r['seconds']:7.1f} videos/s   "
+                      f"request mean {r['mean_ms']:.2f}ms  p50 {r['p50_ms']:.2f}ms  p95 {r['p95_ms']:.2f}ms")
+                print(f"      🔌 Connections: {r['connections']}   🔁 Retries: {r['retries']}   "
+                      f"🚦 Throttled: {r['throttled']}   ⚠️ Failed videos: {r['errors']}")
+    finally:
+        server.shutdown()
+
+    unpooled, pooled = results.values()
+    print(f"\n   🚀 Pooling: {unpooled['mean_ms'] / max(pooled['mean_ms'], 1e-9):.2f}x lower mean request latency, "
+          f"{unpooled['seconds'] / pooled['seconds']:.2f}x faster batch")
+    print(f"   📊 Server: {server.stats}")
+    return 0 if all(r['ok'] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
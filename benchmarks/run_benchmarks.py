@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Analyzer Pipeline Benchmark Suite
+Times every stage of the pipeline on deterministic synthetic data and records time
+and peak memory, so regressions can be caught by comparing results across commits.
+
+Benchmarks:
+    extract/<n>          YouTubeSuccessAnalyzer.extract_video_metadata with a stub YoutubeDL
+    reports/<writer>/<n> every report writer on the extracted data
+    audit/<videos>x<days> YouTubePerformanceAuditor.run_audit on synthetic Analytics CSVs
+    trends/<videos>x<days> TrendEngine build plus 1,000 cached date-range summaries
+    anomalies/<videos>x<days> spike and drop detection over the Date × Video matrix
+    series/<videos>x<days> every video's chart series downsampled to 500 points (LTTB and min/max)
+
+Usage:
+    python3 benchmarks/run_benchmarks.py                          # writes benchmarks/results/<commit>.json
+    python3 benchmarks/run_benchmarks.py --sizes 1000,100000,1000000
+    python3 benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import contextlib
+import copy
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+sys.path.insert(0, str(REPO_ROOT))
+
+from synthetic_data import generate_channel_entries, write_analytics_csvs  # noqa: E402
+
+REPORT_WRITERS = (
+    'create_statistics_report',
+    'create_success_metrics_report',
+    'create_content_themes_report',
+    'create_performance_rankings',
+    'generate_notebooklm_prompts',
+    'create_master_summary',
+)
+
+# A benchmark counts as a regression when it is this much slower than the baseline
+# and the slowdown is larger than timer noise
+REGRESSION_THRESHOLD = 0.25
+NOISE_FLOOR_SECONDS = 0.005
+
+
+class StubYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL: returns pre-generated channel entries, no network."""
+
+    entries = []
+
+    def __init__(self, opts=None):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def urlopen(self, request):
+        raise RuntimeError("network access is disabled in benchmarks")
+
+    def extract_info(self, url, download=False):
+        return {'entries': self.entries}
+
+
+def install_stub_yt_dlp():
+    sys.modules['yt_dlp'] = types.SimpleNamespace(YoutubeDL=StubYoutubeDL)
+
+
+def measure(fn, setup=None, repeat=3, memory=True):
+    """Run `fn(state)` `repeat` times; return best wall time and peak traced memory."""
+    best = float('inf')
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(state)
+            best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        state = setup() if setup else None
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / (1024 * 1024), 2)
+
+    return {'seconds': round(best, 6), 'peak_mb': peak_mb}
+
+
+def new_analyzer(output_dir):
+    from youtube_success_analyzer import YouTubeSuccessAnalyzer
+
+    analyzer = YouTubeSuccessAnalyzer()
+    analyzer.channel_name = 'synthetic'
+    analyzer.channel_url = 'https://www.youtube.com/@synthetic/videos'
+    analyzer.output_dir = Path(output_dir)
+    return analyzer
+
+
+def run_suite(sizes, audit_shape, repeat, memory, workdir):
+    install_stub_yt_dlp()
+    results = {}
+
+    for n in sizes:
+        StubYoutubeDL.entries = generate_channel_entries(n)
+
+        def extract(_):
+            new_analyzer(workdir).extract_video_metadata()
+
+        results[f'extract/{n}'] = measure(extract, repeat=repeat, memory=memory)
+        print(f"   ✅ extract/{n}: {results[f'extract/{n}']['seconds']:.3f}s")
+
+        base = new_analyzer(workdir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            base.extract_video_metadata()
+        extracted = base.video_data
+
+        for writer in REPORT_WRITERS:
+            def setup():
+                analyzer = new_analyzer(workdir)
+                analyzer.video_data = copy.deepcopy(extracted)
+                return analyzer
+
+            def run(analyzer, writer=writer):
+                getattr(analyzer, writer)()
+
+            name = f'reports/{writer}/{n}'
+            results[name] = measure(run, setup=setup, repeat=repeat, memory=memory)
+            print(f"   ✅ {name}: {results[name]['seconds']:.3f}s")
+
+    videos, days = audit_shape
+    paths = write_analytics_csvs(Path(workdir) / 'exports', videos=videos, days=days)
+
+    def audit(_):
+        from youtube_performance_auditor import YouTubePerformanceAuditor
+        YouTubePerformanceAuditor(str(paths['totals']), str(paths['chart'])).run_audit()
+
+    name = f'audit/{videos}x{days}'
+    results[name] = measure(audit, repeat=repeat, memory=memory)
+    print(f"   ✅ {name}: {results[name]['seconds']:.3f}s")
+
+    from youtube_performance_auditor import YouTubePerformanceAuditor
+    loaded = YouTubePerformanceAuditor(str(paths['totals']), str(paths['chart']))
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded.load_data()
+
+    def trends(_):
+        from trends import TrendEngine
+        engine = TrendEngine.from_frames(loaded.totals_df, loaded.chart_df, len(loaded.videos_df))
+        dates = engine.dates
+        for k in range(1000):
+            start = dates[(k * 37) % len(dates)]
+            engine.summary(start, start + 7 + k % 90)
+            engine.video_velocity(start, start + 28)
+
+    name = f'trends/{videos}x{days}'
+    results[name] = measure(trends, repeat=repeat, memory=memory)
+    print(f"   ✅ {name}: {results[name]['seconds']:.3f}s")
+
+    def anomalies(_):
+        from anomalies import detect_anomalies
+        detect_anomalies(loaded.trends)
+
+    name = f'anomalies/{videos}x{days}'
+    results[name] = measure(anomalies, repeat=repeat, memory=memory)
+    print(f"   ✅ {name}: {results[name]['seconds']:.3f}s")
+
+    def series(_):
+        from chart_series import build_series
+        for method in ('lttb', 'minmax'):
+            build_series(loaded.trends, loaded.videos_df, top=len(loaded.videos_df), method=method)
+
+    name = f'series/{videos}x{days}'
+    results[name] = measure(series, repeat=repeat, memory=memory)
+    print(f"   ✅ {name}: {results[name]['seconds']:.3f}s")
+
+    return results
+
+
+def git_label():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+
+def compare(results, baseline_path):
+    """Print per-benchmark ratios against a baseline; return the list of regressions."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    print(f"\n📊 Compared with {baseline_path}:")
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"   ➕ {name:<55} new")
+            continue
+        ratio = current['seconds'] / max(previous['seconds'], 1e-9)
+        significant = abs(current['seconds'] - previous['seconds']) > NOISE_FLOOR_SECONDS
+        regressed = significant and ratio > 1 + REGRESSION_THRESHOLD
+        improved = significant and ratio < 1 - REGRESSION_THRESHOLD
+        flag = "❌" if regressed else ("✅" if improved else "➖")
+        print(f"   {flag} {name:<55} {previous['seconds']:.3f}s → {current['seconds']:.3f}s ({ratio:.2f}x)")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analyzer pipeline on synthetic data")
+    parser.add_argument('--sizes', default='1000,10000',
+                        help="Comma-separated channel sizes (videos) to benchmark (default: 1000,10000)")
+    parser.add_argument('--audit-videos', type=int, default=200)
+    parser.add_argument('--audit-days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=3, help="Best of N timing runs")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument('--label', help="Results file name (default: current git commit)")
+    parser.add_argument('--compare', metavar='RESULTS_JSON', help="Baseline results to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    print("⏱️  Analyzer pipeline benchmarks")
+    print("-" * 80)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_suite(sizes, (args.audit_videos, args.audit_days), args.repeat,
+                            not args.no_memory, workdir)
+
+    label = args.label or git_label()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = RESULTS_DIR / f"{label}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'label': label,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to: {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.0%}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
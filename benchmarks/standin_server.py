@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Stand-in YouTube Server
+A local HTTP server that serves synthetic channel listings and per-video metadata in
+the shape yt-dlp returns, so the analyzer can be load-tested with no network:
+
+    GET /channel/<name>   → {"entries": [flat entries: id, title, url, view_count, duration]}
+    GET /video/<id>       → full metadata for one video (?fields=id,title,... for a subset)
+    GET /stats            → request, error and throttle counters
+
+Latency, error rate and 429 throttling are configurable to exercise retry and backoff.
+
+Usage:
+    python3 benchmarks/standin_server.py --videos 5000 --latency 40 --error-rate 0.02 --throttle 200
+    python3 youtube_success_analyzer.py --url https://www.youtube.com/@synthetic \\
+        --extractor-url http://127.0.0.1:8765 --no-open
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_data import generate_channel_entries  # noqa: E402
+
+DEFAULT_PORT = 8765
+FLAT_FIELDS = ('id', 'title', 'url', 'view_count', 'duration')
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts up to `rate`; None disables throttling."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate or 0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Return 0 if a request may proceed, else the seconds until a token is available."""
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, videos=1000, seed=42, latency_ms=0, jitter_ms=None,
+                 error_rate=0.0, throttle=None):
+        super().__init__(address, StandInHandler)
+        self.videos = videos
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = latency_ms / 2 if jitter_ms is None else jitter_ms
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(throttle)
+        self.rng = random.Random(seed)
+        self.channels = {}  # name → full entries
+        self.index = {}     # video id → full entry
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'channels': 0, 'videos': 0, 'errors': 0, 'throttled': 0, 'not_found': 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def channel(self, name):
+        with self.lock:
+            if name not in self.channels:
+                entries = generate_channel_entries(self.videos, seed=self.seed, channel=name.lstrip('@'))
+                self.channels[name] = entries
+                self.index.update((entry['id'], entry) for entry in entries)
+            return self.channels[name]
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so pooled clients can reuse connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        path, _, query = self.path.partition('?')
+        parts = [unquote(p) for p in path.strip('/').split('/')]
+
+        if parts == ['stats']:
+            with server.lock:
+                return self.send_json(200, dict(server.stats))
+
+        server.count('requests')
+        wait = server.bucket.take()
+        if wait:
+            server.count('throttled')
+            return self.send_json(429, {'error': 'rate limited'}, {'Retry-After': f"{wait:.3f}"})
+
+        if server.latency_ms:
+            delay = server.latency_ms + server.rng.uniform(-server.jitter_ms, server.jitter_ms)
+            time.sleep(max(0.0, delay) / 1000)
+
+        if server.error_rate and server.rng.random() < server.error_rate:
+            server.count('errors')
+            return self.send_json(500, {'error': 'injected failure'})
+
+        if len(parts) == 2 and parts[0] == 'channel':
+            server.count('channels')
+            entries = server.channel(parts[1])
+            return self.send_json(200, {'entries': [{k: e[k] for k in FLAT_FIELDS} for e in entries]})
+
+        if len(parts) == 2 and parts[0] == 'video':
+            entry = server.index.get(parts[1])
+            if entry:
+                server.count('videos')
+                fields = parse_qs(query).get('fields')
+                if fields:
+                    wanted = fields[0].split(',')
+                    entry = {k: entry[k] for k in wanted if k in entry}
+                return self.send_json(200, entry)
+
+        server.count('not_found')
+        return self.send_json(404, {'error': 'not found'})
+
+
+def start_server(port=0, **options):
+    """Start a StandInServer on a background thread; returns the server (call .shutdown())."""
+    server = StandInServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic YouTube channel data for offline testing")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--videos', type=int, default=1000, help="Videos per channel")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0, help="Mean response latency in ms")
+    parser.add_argument('--jitter', type=float, help="Latency jitter in ms (default: half the latency)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--throttle', type=float, help="Requests per second before answering 429")
+    args = parser.parse_args()
+
+    server = StandInServer(('127.0.0.1', args.port), videos=args.videos, seed=args.seed,
+                           latency_ms=args.latency, jitter_ms=args.jitter,
+                           error_rate=args.error_rate, throttle=args.throttle)
+    print(f"🎬 Stand-in YouTube server on {server.url} ({args.videos:,} videos per channel)")
+    print(f"   Latency {args.latency:g}ms, error rate {args.error_rate:.1%}, "
+          f"throttle {f'{args.throttle:g}/s' if args.throttle else 'off'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
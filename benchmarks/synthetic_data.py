@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Synthetic Channel Generator
+Deterministic, realistic-looking test data for benchmarks and offline testing:
+
+- `generate_channel_entries` → yt-dlp-shaped video entry dicts (what
+  `YoutubeDL.extract_info(channel)['entries']` returns), from 1k to 1M videos
+- `write_analytics_csvs` → YouTube Analytics exports (Totals, Chart data, Table data)
+
+The same seed always produces the same data, so benchmark results are comparable
+across commits.
+
+Usage:
+    python3 benchmarks/synthetic_data.py --analytics-dir /tmp/exports --videos 200 --days 365
+"""
+
+import argparse
+import csv
+import random
+import string
+from datetime import date, timedelta
+from pathlib import Path
+
+ID_ALPHABET = string.ascii_letters + string.digits + '-_'
+
+TOPIC_WORDS = [
+    'ai', 'python', 'javascript', 'rust', 'startup', 'money', 'investing', 'crypto', 'fitness',
+    'cooking', 'travel', 'gaming', 'productivity', 'design', 'marketing', 'youtube', 'camera',
+    'iphone', 'linux', 'cloud', 'security', 'database', 'career', 'interview', 'review',
+]
+TITLE_TEMPLATES = [
+    "I tried {a} for 30 days",
+    "{a} in 100 seconds",
+    "The truth about {a}",
+    "Why {a} is better than {b}",
+    "{a} vs {b} - which one wins?",
+    "Stop using {a} (do this instead)",
+    "{a} tutorial for beginners",
+    "How I learned {a} and {b}",
+    "10 {a} tips nobody tells you",
+    "The {a} mistake everyone makes",
+]
+CATEGORIES = [
+    ('Education', 40), ('Science & Technology', 30), ('Entertainment', 12),
+    ('People & Blogs', 10), ('Howto & Style', 8),
+]
+
+
+def _video_id(rng):
+    return ''.join(rng.choice(ID_ALPHABET) for _ in range(11))
+
+
+def _zipf_word(rng):
+    """Pick a topic word with a Zipf-like skew (a few topics dominate, like real channels)."""
+    index = min(int(rng.paretovariate(1.1)) - 1, len(TOPIC_WORDS) - 1)
+    return TOPIC_WORDS[index]
+
+
+def _publish_time(day):
+    """YouTube Studio's 'Video publish time' format, e.g. 'Oct 6, 2025'."""
+    return f"{day:%b} {day.day}, {day.year}"
+
+
+def generate_channel_entries(n, seed=42, channel='synthetic'):
+    """Return `n` deterministic yt-dlp-shaped entry dicts, newest upload first."""
+    rng = random.Random(seed)
+    categories = [name for name, _ in CATEGORIES]
+    weights = [weight for _, weight in CATEGORIES]
+    newest = date(2025, 10, 1)
+
+    entries = []
+    for i in range(n):
+        a, b = _zipf_word(rng), _zipf_word(rng)
+        title = rng.choice(TITLE_TEMPLATES).format(a=a, b=b)
+        # Views follow a heavy-tailed distribution: most videos modest, a few viral
+        views = int(rng.paretovariate(1.16) * 800)
+        video_id = _video_id(rng)
+        uploaded = newest - timedelta(days=i * 3 + rng.randint(0, 2))
+        tags = list(dict.fromkeys([a, b] + [_zipf_word(rng) for _ in range(rng.randint(0, 8))]))
+
+        entries.append({
+            'id': video_id,
+            'title': title,
+            'url': f"https://www.youtube.com/watch?v={video_id}",
+            'webpage_url': f"https://www.youtube.com/watch?v={video_id}",
+            'description': f"{title}. Everything you need to know about {a} and {b}.",
+            'upload_date': uploaded.strftime('%Y%m%d'),
+            'uploader': channel,
+            'duration': int(rng.lognormvariate(6.3, 0.8)) + 15,
+            'view_count': views,
+            'like_count': int(views * rng.uniform(0.01, 0.06)),
+            'comment_count': int(views * rng.uniform(0.0005, 0.006)),
+            'tags': tags,
+            'categories': rng.choices(categories, weights)[:1],
+            'thumbnail': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        })
+    return entries
+
+
+def write_analytics_csvs(output_dir, videos=50, days=90, seed=42, prefix='Untitled spreadsheet - '):
+    """Write Totals, Chart data and Table data CSVs shaped like YouTube Studio exports.
+
+    Returns a dict of {'totals': path, 'chart': path, 'table': path}.
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = date(2025, 10, 1) - timedelta(days=days - 1)
+    dates = [start + timedelta(days=d) for d in range(days)]
+    entries = generate_channel_entries(videos, seed=seed)
+
+    totals = [0] * days
+    table_rows = []
+    chart_path = output_dir / f"{prefix}Chart data.csv"
+    with open(chart_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Content', 'Video title', 'Video publish time', 'Duration', 'Views'])
+        for entry in entries:
+            publish_day = rng.randint(0, days - 1)
+            publish_date = dates[publish_day]
+            appeal = rng.paretovariate(1.3)
+            video_views = 0
+            for d, day in enumerate(dates):
+                if d < publish_day:
+                    daily = 0
+                else:
+                    # Launch spike decaying to a long tail, plus weekend lift and noise
+                    age = d - publish_day
+                    expected = appeal * 40 / (1 + age * 0.3) * (1.2 if day.weekday() >= 5 else 1.0)
+                    daily = max(0, int(rng.gauss(expected, expected * 0.3 + 0.5)))
+                video_views += daily
+                totals[d] += daily
+                writer.writerow([
+                    day.isoformat(), entry['id'], entry['title'],
+                    _publish_time(publish_date), entry['duration'], daily
+                ])
+
+            avg_view_s = int(entry['duration'] * rng.uniform(0.1, 0.6))
+            table_rows.append([
+                entry['id'], entry['title'], _publish_time(publish_date), entry['duration'],
+                video_views,
+                f"{avg_view_s // 3600}:{(avg_view_s % 3600) // 60:02d}:{avg_view_s % 60:02d}",
+                round(avg_view_s / entry['duration'] * 100, 2),
+            ])
+
+    totals_path = output_dir / f"{prefix}Totals.csv"
+    with open(totals_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Views'])
+        for day, views in zip(dates, totals):
+            writer.writerow([day.isoformat(), views])
+
+    table_path = output_dir / f"{prefix}Table data.csv"
+    with open(table_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Content', 'Video title', 'Video publish time', 'Duration', 'Views',
+                         'Average view duration', 'Average percentage viewed (%)'])
+        total_views = sum(row[4] for row in table_rows)
+        writer.writerow(['Total', '', '', '', total_views, '', ''])
+        table_rows.sort(key=lambda row: row[4], reverse=True)
+        writer.writerows(table_rows)
+
+    return {'totals': totals_path, 'chart': chart_path, 'table': table_path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic YouTube Analytics exports")
+    parser.add_argument('--analytics-dir', required=True, help="Directory to write the CSVs to")
+    parser.add_argument('--videos', type=int, default=50)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    paths = write_analytics_csvs(args.analytics_dir, args.videos, args.days, args.seed)
+    for kind, path in paths.items():
+        print(f"✅ {kind}: {path}")
+
+
+if __name__ == "__main__":
+    main()
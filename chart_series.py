@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Chart Series
+Downsampled daily-view series for charts, cut from a TrendEngine so the browser receives a
+few hundred points per line however long the export or however many videos it holds:
+
+- LTTB (Largest-Triangle-Three-Buckets) keeps the points that preserve a line's visual shape
+- min/max bucketing keeps every bucket's lowest and highest day, so no spike is lost
+
+Both run over all selected videos at once: the TrendEngine's calendar is shared by every
+video, so each bucket is one vectorised step across the whole Date × Video slice.
+
+    payload = build_series(auditor.trends, auditor.videos_df, top=100, points=500)
+"""
+
+import numpy as np
+
+DEFAULT_POINTS = 500
+MAX_POINTS = 5000
+METHODS = ('lttb', 'minmax')
+
+
+def lttb(values, target):
+    """Indices (target × series) of the LTTB points of every column of values (days × series)."""
+    days, width = values.shape
+    if target >= days or target < 3:
+        return np.repeat(np.arange(days)[:, None], width, axis=1)
+
+    y = values.astype(np.float64)
+    columns = np.arange(width)
+    # The first and last days are always kept; the days between form target - 2 buckets
+    edges = np.linspace(1, days - 1, target - 1).astype(np.int64)
+    selected = np.empty((target, width), dtype=np.int64)
+    selected[0], selected[-1] = 0, days - 1
+
+    previous = np.zeros(width, dtype=np.int64)
+    for b in range(target - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Third corner of the triangle: the mean of the next bucket (the last day for the final one)
+        next_lo, next_hi = (hi, edges[b + 2]) if b + 2 < len(edges) else (days - 1, days)
+        next_x = (next_lo + next_hi - 1) / 2
+        next_y = y[next_lo:next_hi].mean(axis=0)
+        prev_y = y[previous, columns]
+        x = np.arange(lo, hi)[:, None]
+        area = np.abs((previous - next_x) * (y[lo:hi] - prev_y) - (previous - x) * (next_y - prev_y))
+        previous = lo + area.argmax(axis=0)
+        selected[b + 1] = previous
+    return selected
+
+
+def min_max(values, target):
+    """Indices (≤ target × series) of every bucket's lowest and highest day, in date order."""
+    days, width = values.shape
+    if target >= days or target < 2:
+        return np.repeat(np.arange(days)[:, None], width, axis=1)
+
+    size = -(-days // (target // 2))  # Days per bucket
+    buckets = -(-days // size)
+    padding = ((0, buckets * size - days), (0, 0))
+    y = values.astype(np.float64)
+    offsets = (np.arange(buckets) * size)[:, None]
+    highs = np.pad(y, padding, constant_values=-np.inf).reshape(buckets, size, width).argmax(axis=1)
+    lows = np.pad(y, padding, constant_values=np.inf).reshape(buckets, size, width).argmin(axis=1)
+    pairs = np.sort(np.stack([lows, highs], axis=1), axis=1) + offsets[:, :, None]
+    return pairs.reshape(2 * buckets, width)
+
+
+def downsample(values, target, method='lttb'):
+    """Row indices to keep for every column of values (days × series), one sorted array each."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    selected = (lttb if method == 'lttb' else min_max)(values, target).T.copy()
+    # Indices come out in date order, but a flat min/max bucket picks the same day twice
+    keep = np.ones(selected.shape, dtype=bool)
+    keep[:, 1:] = np.diff(selected, axis=1) != 0
+    return [row[mask] for row, mask in zip(selected, keep)]
+
+
+def _points(dates, values, keep, start):
+    return {
+        'x': (dates[keep] - start).astype(np.int64).tolist(),
+        'y': np.round(values[keep], 2).tolist(),
+    }
+
+
+def build_series(trends, videos_df=None, videos=None, top=None, start=None, end=None,
+                 points=DEFAULT_POINTS, method='lttb', metric='daily'):
+    """Downsampled channel series plus the requested videos' series, ready for JSON.
+
+    videos is a list of video codes; otherwise top picks the N videos with the most views in
+    the range (None: channel only). Points are {'x': day offsets from 'start', 'y': values}.
+    """
+    dates, channel = trends.series(metric, start, end)
+    if not len(dates):
+        raise ValueError("No days in the requested range")
+    if top is not None and videos is None and trends.video_cumulative is not None:
+        range_views = trends.video_velocity(start, end)
+        videos = np.argsort(-range_views, kind='stable')[:top]
+
+    first = dates[0]
+    payload = {
+        'start': str(first),
+        'end': str(dates[-1]),
+        'days': len(dates),
+        'metric': metric,
+        'method': method,
+        'channel': _points(dates, channel[:, 0], downsample(channel, points, method)[0], first),
+        'videos': [],
+    }
+    if videos is not None and len(videos):
+        codes = np.asarray(videos, dtype=np.int64)
+        _, values = trends.series(metric, start, end, codes)
+        if videos_df is not None:
+            content_ids = videos_df['Content'].to_numpy()
+            titles = videos_df['Video title'].to_numpy()
+        for code, keep, column in zip(codes.tolist(), downsample(values, points, method), values.T):
+            entry = {'video_code': code, **_points(dates, column, keep, first)}
+            if videos_df is not None:
+                entry['content'], entry['title'] = content_ids[code], titles[code]
+            payload['videos'].append(entry)
+    return payload
@@ -4,115 +4,69 @@ YouTube Analyzer Status Checker
 Quickly diagnose if the analyzer is running, hung, or completed.
 """
 
-import os
-import sys
 import time
-import subprocess
 from pathlib import Path
 
+from run_status import active_runs, latest_run
+from run_catalogue import RunCatalogue
+
+ANALYSIS_DIR = Path(__file__).parent / 'analysis'
+STATUS_DIR = ANALYSIS_DIR / '.status'
+CATALOGUE_PATH = ANALYSIS_DIR / 'catalogue.sqlite3'
+
 
 def check_running_process():
-    """Check if analyzer is currently running."""
-    try:
-        result = subprocess.run(
-            ['ps', 'aux'], 
-            capture_output=True, 
-            text=True
-        )
-        
-        for line in result.stdout.split('\n'):
-            if 'youtube_success_analyzer.py' in line and 'grep' not in line:
-                parts = line.split()
-                pid = parts[1]
-                cpu_time = parts[9]  # CPU time
-                
-                # Parse CPU time (format: minutes:seconds.centiseconds)
-                if ':' in cpu_time:
-                    mins, secs = cpu_time.split(':')
-                    total_mins = int(mins) + int(float(secs)) / 60
-                else:
-                    total_mins = int(float(cpu_time)) / 60
-                
-                return {
-                    'running': True,
-                    'pid': pid,
-                    'cpu_time': cpu_time,
-                    'runtime_mins': total_mins
-                }
-        
+    """Check if analyzer is currently running (reads its live status file)."""
+    runs = active_runs(STATUS_DIR)
+    if not runs:
         return {'running': False}
     
-    except Exception as e:
-        return {'running': False, 'error': str(e)}
+    status = runs[0]
+    return {
+        'running': status['alive'],
+        'stale': not status['alive'],
+        'pid': status['pid'],
+        'channel': status['channel'],
+        'stage': status['stage'],
+        'done': status['done'],
+        'total': status['total'],
+        'runtime_mins': (time.time() - status['started_at']) / 60,
+        'activity_mins_ago': status['activity_age_s'] / 60,
+        'output_dir': status['output_dir'],
+        'others': len(runs) - 1
+    }
 
 
 def check_recent_output():
-    """Check for recent analysis output."""
-    analysis_dir = Path(__file__).parent / 'analysis'
+    """Check the most recently finished analysis run."""
+    latest = latest_run(STATUS_DIR)
     
-    if not analysis_dir.exists():
+    if not latest:
         return None
     
-    recent_dirs = []
-    for channel_dir in analysis_dir.iterdir():
-        if channel_dir.is_dir():
-            for run_dir in channel_dir.iterdir():
-                if run_dir.is_dir():
-                    mtime = run_dir.stat().st_mtime
-                    recent_dirs.append((mtime, channel_dir.name, run_dir.name, run_dir))
-    
-    if not recent_dirs:
-        return None
+    finished_at = latest.get('finished_at', latest['started_at'])
+    path = Path(latest['output_dir'])
+    if not path.is_absolute():
+        path = Path(__file__).parent / path
     
-    recent_dirs.sort(reverse=True)
-    latest = recent_dirs[0]
+    history = []
+    if CATALOGUE_PATH.exists():
+        history = RunCatalogue(CATALOGUE_PATH, read_only=True).channel_runs(latest['channel'], limit=2)
     
     return {
-        'timestamp': latest[0],
-        'age_mins': (time.time() - latest[0]) / 60,
-        'channel': latest[1],
-        'run_id': latest[2],
-        'path': latest[3],
-        'has_files': len(list(latest[3].iterdir())) > 0
+        'timestamp': finished_at,
+        'age_mins': (time.time() - finished_at) / 60,
+        'channel': latest['channel'],
+        'run_id': latest['run_id'],
+        'path': path,
+        'state': latest['state'],
+        'videos': latest.get('videos', 0),
+        'error': latest.get('error'),
+        'has_files': latest['state'] == 'completed',
+        'history': history
     }
 
 
-def check_yt_dlp_cache():
-    """Check recent yt-dlp activity."""
-    cache_dir = Path.home() / '.cache' / 'yt-dlp'
-    
-    if not cache_dir.exists():
-        return {'exists': False}
-    
-    recent_files = []
-    cutoff = time.time() - 600  # Last 10 minutes
-    
-    for root, dirs, files in os.walk(cache_dir):
-        for f in files:
-            path = Path(root) / f
-            try:
-                mtime = path.stat().st_mtime
-                if mtime > cutoff:
-                    recent_files.append(mtime)
-            except:
-                pass
-    
-    if recent_files:
-        latest = max(recent_files)
-        return {
-            'exists': True,
-            'recent_activity': True,
-            'last_activity': latest,
-            'mins_ago': (time.time() - latest) / 60,
-            'file_count': len(recent_files)
-        }
-    else:
-        return {
-            'exists': True,
-            'recent_activity': False
-        }
-
-
 def main():
     """Run full diagnostic."""
     print("\n" + "="*80)
@@ -128,12 +82,12 @@ def main():
         runtime = process['runtime_mins']
         print(f"   ✅ Analyzer is RUNNING")
         print(f"   🆔 PID: {process['pid']}")
-        print(f"   ⏱️  CPU Time: {process['cpu_time']}")
+        print(f"   📺 Channel: {process['channel']}")
         print(f"   📈 Runtime: {runtime:.1f} minutes")
-        
-        if runtime > 60:
-            print(f"   ⚠️  WARNING: Running for {runtime:.0f} minutes - may be hung")
-            print("   💡 Check yt-dlp activity below to confirm")
+        if process['others']:
+            print(f"   ➕ {process['others']} more analyzer(s) running")
+    elif process.get('stale'):
+        print(f"   ⚠️  Analyzer (PID {process['pid']}) stopped without finishing")
     else:
         print("   ⭕ Analyzer is NOT running")
     
@@ -149,32 +103,35 @@ def main():
         time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(output['timestamp']))
         
         print(f"   📂 Latest Analysis: {output['channel']}")
-        print(f"   🕒 Created: {time_str} ({age_hrs:.1f} hours ago)")
+        print(f"   🕒 Finished: {time_str} ({age_hrs:.1f} hours ago)")
         print(f"   📝 Run ID: {output['run_id']}")
-        print(f"   📊 Has Output: {'✅ Yes' if output['has_files'] else '❌ No (empty)'}")
+        print(f"   📊 Has Output: {'✅ Yes' if output['has_files'] else '❌ No (' + output['state'] + ')'}")
         
         if output['has_files']:
-            file_count = len(list(output['path'].iterdir()))
-            print(f"   📄 Files Generated: {file_count}")
-        else:
-            print("   ⚠️  WARNING: Directory exists but no files generated")
+            print(f"   🎬 Videos Analyzed: {output['videos']}")
+            if len(output['history']) > 1:
+                current, previous = output['history'][0], output['history'][1]
+                change = current['total_views'] - previous['total_views']
+                print(f"   📈 Views vs previous run ({previous['run_id']}): {change:+,}")
+        elif output['error']:
+            print(f"   ⚠️  Error: {output['error']}")
     else:
         print("   ⭕ No recent analysis runs found")
     
     print()
     
-    # Check yt-dlp activity
-    print("🌐 YT-DLP ACTIVITY:")
+    # Check live progress
+    print("🌐 LIVE ACTIVITY:")
     print("-" * 80)
-    cache = check_yt_dlp_cache()
     
-    if not cache['exists']:
-        print("   ⭕ No yt-dlp cache found")
-    elif cache['recent_activity']:
-        mins_ago = cache['mins_ago']
-        print(f"   ✅ Recent activity detected")
+    if process['running']:
+        mins_ago = process['activity_mins_ago']
+        if process['total']:
+            percent = process['done'] / process['total'] * 100
+            print(f"   🔧 Stage: {process['stage']} ({process['done']}/{process['total']}, {percent:.0f}%)")
+        else:
+            print(f"   🔧 Stage: {process['stage']}")
         print(f"   🕒 Last activity: {mins_ago:.1f} minutes ago")
-        print(f"   📊 Active files: {cache['file_count']}")
         
         if mins_ago < 5:
             print("   💚 Analyzer is actively working!")
@@ -183,8 +140,7 @@ def main():
         else:
             print("   ⚠️  WARNING: No activity in 15+ minutes - likely hung")
     else:
-        print("   ❌ No recent activity (last 10 minutes)")
-        print("   ⚠️  Analyzer may be HUNG or waiting for input")
+        print("   ⭕ No live activity")
     
     print()
     
@@ -193,10 +149,10 @@ def main():
     print("="*80)
     
     if process['running']:
-        if cache.get('recent_activity') and cache['mins_ago'] < 10:
+        if process['activity_mins_ago'] < 10:
             print("   ✅ STATUS: Analyzer is working normally")
             print("   💡 ACTION: Let it continue - check back in 15-30 minutes")
-        elif process['runtime_mins'] > 30 and not cache.get('recent_activity'):
+        elif process['activity_mins_ago'] > 30:
             print("   ❌ STATUS: Analyzer is HUNG (no activity)")
             print("   💡 ACTION: Kill process and restart:")
             print(f"      kill -9 {process['pid']}")
@@ -207,6 +163,9 @@ def main():
         else:
             print("   💛 STATUS: Running but slow progress")
             print("   💡 ACTION: Monitor for another 15-30 minutes")
+    elif process.get('stale'):
+        print("   ❌ STATUS: Analyzer crashed or was killed mid-run")
+        print(f"   💡 ACTION: Check partial output in: {process['output_dir']} and try again")
     else:
         if output and not output['has_files']:
             print("   ⚠️  STATUS: Previous run failed (no output)")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Streaming Export Parser
+Parses YouTube Analytics CSV exports (Totals, Chart data, Table data) batch by batch while
+an upload is still arriving, and keeps compact columns instead of the raw text:
+
+- each batch (a few MB of complete records) goes through pandas' C parser, then is dropped
+- dates become day numbers and views integers (16 bytes per Chart row in total)
+- each video's id, title and duration are stored once; rows refer to it by integer code,
+  the same codes YouTubePerformanceAuditor.index_videos() would assign
+- the kind of export is recognised from its header row, whatever the file is called
+
+A parser is a write-only file object, so werkzeug's multipart parser can stream each
+uploaded file straight into one instead of spooling it to memory or disk:
+
+    parse_form_data(environ, stream_factory=lambda *args, **kwargs: ExportStreamParser())
+"""
+
+import codecs
+import io
+from datetime import date, datetime
+
+BATCH_BYTES = 4 * 1024 * 1024  # Text parsed at once: bounds memory per upload
+EPOCH = date(1970, 1, 1)
+
+
+def _parse_day(value):
+    """Days since 1970-01-01 of an export date ('2025-10-06', or 'Oct 6, 2025')."""
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        parsed = datetime.strptime(value, '%b %d, %Y').date()
+    return (parsed - EPOCH).days
+
+
+class ExportStreamParser:
+    """Incremental parser for one Analytics CSV; feed it bytes with write(), then finish()."""
+
+    def __init__(self, batch_bytes=BATCH_BYTES):
+        self.kind = None     # 'totals', 'chart' or 'table' once the header has been read
+        self.rows = 0
+        self.bytes = 0
+        self.batch_bytes = batch_bytes
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+        self._pending = []   # Decoded text not parsed yet
+        self._pending_size = 0
+        self._header = None
+        self._days = []      # Per-batch arrays, concatenated by the frame builders
+        self._views = []
+        self._codes = []
+        self._video_codes = {}  # Content id -> video code
+        self._videos = []       # (Content, Video title, Duration) per code
+        self._tables = []
+        self._day_numbers = {}
+
+    # File-object interface used by werkzeug's multipart parser
+    def write(self, data):
+        self.bytes += len(data)
+        text = self._decoder.decode(data)
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.batch_bytes:
+            self._parse_complete_records()
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        return 0
+
+    def close(self):
+        pass
+
+    def finish(self):
+        """Parse the rest of the upload; returns the parser."""
+        text = ''.join(self._pending) + self._decoder.decode(b'', final=True)
+        self._pending, self._pending_size = [], 0
+        if text.strip():
+            self._parse(text)
+        if self.kind is None:
+            raise ValueError("Empty upload: expected a YouTube Analytics CSV export")
+        return self
+
+    def _parse_complete_records(self):
+        text = ''.join(self._pending)
+        end = text.rfind('\n') + 1
+        # A record ends at a newline outside quotes (titles may contain quoted line breaks);
+        # otherwise keep the text and try again once more has arrived
+        if end and text.count('"', 0, end) % 2 == 0:
+            self._parse(text[:end])
+            text = text[end:]
+        self._pending, self._pending_size = [text], len(text)
+
+    def _read_header(self, text):
+        import pandas as pd
+
+        header = [name.strip() for name in pd.read_csv(io.StringIO(text), nrows=0).columns]
+        columns = set(header)
+        if {'Content', 'Average view duration'} <= columns:
+            self.kind = 'table'
+        elif {'Date', 'Content', 'Views'} <= columns:
+            self.kind = 'chart'
+        elif {'Date', 'Views'} <= columns:
+            self.kind = 'totals'
+        else:
+            raise ValueError(f"Not a YouTube Analytics export (columns: {', '.join(header)})")
+        self._header = header
+
+    def _parse(self, text):
+        import numpy as np
+        import pandas as pd
+
+        first = self.kind is None
+        if first:
+            self._read_header(text)
+        if self.kind == 'table':
+            usecols = None
+        elif self.kind == 'chart':
+            usecols = [c for c in self._header if c in ('Date', 'Content', 'Video title', 'Duration', 'Views')]
+        else:
+            usecols = ['Date', 'Views']
+        batch = pd.read_csv(io.StringIO(text), header=None, names=self._header, skiprows=1 if first else 0,
+                            usecols=usecols, dtype={'Date': str, 'Content': str})
+        if self.kind == 'table':
+            self._tables.append(batch)
+            self.rows += len(batch)
+            return
+
+        batch = batch[batch['Date'].notna()]
+        self.rows += len(batch)
+
+        # Dates repeat on every row: convert each distinct one once
+        day_labels, day_index = pd.factorize(batch['Date'])
+        days = np.array([self._day_number(d) for d in day_index], dtype=np.int32)
+        self._days.append(days[day_labels])
+        self._views.append(pd.to_numeric(batch['Views'], errors='coerce').fillna(0).to_numpy(np.int64))
+        if self.kind == 'totals':
+            return
+
+        # Local codes -> video codes, numbered in order of first appearance across batches
+        labels, content_ids = pd.factorize(batch['Content'])
+        first_rows = batch.drop_duplicates('Content')
+        titles = first_rows['Video title'].to_numpy() if 'Video title' in batch else content_ids
+        durations = pd.to_numeric(first_rows['Duration'], errors='coerce').to_numpy() \
+            if 'Duration' in batch else np.full(len(content_ids), np.nan)
+        lookup = np.empty(len(content_ids), dtype=np.int32)
+        for i, content in enumerate(content_ids):
+            code = self._video_codes.get(content)
+            if code is None:
+                code = self._video_codes[content] = len(self._videos)
+                self._videos.append((content, titles[i], durations[i]))
+            lookup[i] = code
+        self._codes.append(lookup[labels])
+
+    def _day_number(self, value):
+        day = self._day_numbers.get(value)
+        if day is None:
+            day = self._day_numbers[value] = _parse_day(value)
+        return day
+
+    # Frames in the shape YouTubePerformanceAuditor.from_frames() expects
+    def _column(self, batches, dtype):
+        import numpy as np
+        return np.concatenate(batches) if batches else np.empty(0, dtype=dtype)
+
+    def _dates(self):
+        import numpy as np
+        return self._column(self._days, np.int32).astype('datetime64[D]').astype('datetime64[ns]')
+
+    def totals_frame(self):
+        import numpy as np
+        import pandas as pd
+        return pd.DataFrame({'Date': self._dates(), 'Views': self._column(self._views, np.int64)})
+
+    def chart_frame(self):
+        """(chart_df with 'video_code', videos_df indexed by video code)."""
+        import numpy as np
+        import pandas as pd
+
+        codes = self._column(self._codes, np.int32).astype(np.int64)
+        content_ids, titles, durations = zip(*self._videos) if self._videos else ((), (), ())
+        chart_df = pd.DataFrame({
+            'Date': self._dates(),
+            'Content': pd.Categorical.from_codes(codes, categories=list(content_ids)),
+            'Views': self._column(self._views, np.int64),
+            'video_code': codes,
+        })
+        videos_df = pd.DataFrame({
+            'Content': list(content_ids),
+            'Video title': list(titles),
+            'Duration': np.array(durations, dtype=np.float64),
+        })
+        videos_df.index.name = 'video_code'
+        return chart_df, videos_df
+
+    def table_frame(self):
+        import pandas as pd
+        return pd.concat(self._tables, ignore_index=True) if self._tables else pd.DataFrame(columns=self._header)
+
+
+def frames_from_parsers(parsers):
+    """Keyword arguments for YouTubePerformanceAuditor.from_frames() from finished parsers.
+
+    Raises ValueError for two exports of the same kind or an upload without Totals or Chart data.
+    """
+    by_kind = {}
+    for parser in parsers:
+        if parser.kind in by_kind:
+            raise ValueError(f"More than one {parser.kind} export uploaded")
+        by_kind[parser.kind] = parser
+    if 'totals' not in by_kind and 'chart' not in by_kind:
+        raise ValueError("Upload a Totals or Chart data CSV (Table data alone cannot be audited)")
+
+    frames = {}
+    if 'totals' in by_kind:
+        frames['totals_df'] = by_kind['totals'].totals_frame()
+    if 'chart' in by_kind:
+        frames['chart_df'], frames['videos_df'] = by_kind['chart'].chart_frame()
+    if 'table' in by_kind:
+        frames['table_df'] = by_kind['table'].table_frame()
+    return frames
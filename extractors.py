@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Video Extractors
+Pluggable sources of channel listings and per-video metadata for YouTubeSuccessAnalyzer.
+
+Every extractor is a context manager with two methods:
+
+    list_channel(channel_url) -> list of flat entry dicts (id, title, url, view_count, ...)
+    fetch_video(entry)        -> full yt-dlp-style metadata dict for one video
+
+- YtDlpExtractor talks to YouTube through yt-dlp (the default). Like the original
+  analyzer it works from the flat channel listing; pass deep=True to re-extract each
+  video for likes, tags and descriptions (one extra request per video).
+- StandInExtractor talks to the local stand-in server (benchmarks/standin_server.py),
+  so throughput, throttling and retry behaviour can be tested with no network.
+
+`extractor.per_video_requests` is True when fetch_video() makes a request per video; only
+then does the deep analysis take measurable time (and a time budget mean anything).
+
+Setting `extractor.fields` (see `source_fields`) asks an extractor for only the fields an
+extraction profile needs, where its source supports it.
+
+Extractors are long-lived sessions: the YoutubeDL instance (or HTTP connection pool)
+is created on first use and kept open until the outermost `with` block exits, so one
+extractor can be shared by every channel analysed in the same process:
+
+    with YtDlpExtractor() as extractor:
+        for url in channel_urls:
+            YouTubeSuccessAnalyzer(extractor=extractor).run_complete_analysis(url, offer_open=False)
+"""
+
+import json
+import queue
+import random
+import threading
+import time
+from urllib.parse import quote, urlparse
+
+DEFAULT_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',  # Fast: get basic info first, then fetch details only for videos we process
+    'writeinfojson': False,
+    'writethumbnail': False,
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+    'ignoreerrors': True,
+    'no_check_certificate': True,
+    'proxy': '',  # Explicitly disable proxy
+    'socket_timeout': 30,  # Add timeout to prevent hangs
+    'extractor_args': {'youtube': {'player_client': ['ios', 'web']}},  # Use multiple clients for reliability
+    'sleep_interval': 1,  # Reduced to 1 second - still safe but much faster
+    'max_sleep_interval': 2,  # Max 2 seconds
+    'sleep_interval_requests': 1,  # 1 second between API requests
+}
+
+DEFAULT_POOL_SIZE = 4
+
+# Extraction profiles: the per-video fields each profile requests, keeps in memory and exports.
+# Derived fields (formatted counts, engagement rates) are always computed.
+PROFILE_FIELDS = {
+    'minimal': ('title', 'url', 'video_id', 'upload_date', 'duration',
+                'view_count', 'like_count', 'comment_count'),
+}
+PROFILE_FIELDS['standard'] = PROFILE_FIELDS['minimal'] + ('uploader', 'tags', 'categories')
+PROFILE_FIELDS['full'] = PROFILE_FIELDS['standard'] + ('description', 'thumbnail')
+EXTRACTION_PROFILES = tuple(PROFILE_FIELDS)
+DEFAULT_PROFILE = 'full'
+
+# Metadata field → field name in yt-dlp info dicts, where they differ
+_SOURCE_FIELDS = {'video_id': 'id', 'url': 'webpage_url'}
+
+
+def source_fields(profile):
+    """The yt-dlp info fields an extraction profile needs."""
+    return tuple(_SOURCE_FIELDS.get(field, field) for field in PROFILE_FIELDS[profile])
+
+
+class ExtractorError(Exception):
+    """A listing or video could not be fetched (after any retries)."""
+
+
+class _Session:
+    """Nesting-aware context manager: opens lazily, closes when the outermost `with` exits."""
+
+    _depth = 0
+
+    def __enter__(self):
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            self.close()
+        return False
+
+    def close(self):
+        pass
+
+
+class YtDlpExtractor(_Session):
+    """Extract from YouTube with yt-dlp, reusing one YoutubeDL (and its connections) throughout."""
+
+    def __init__(self, ydl_opts=None, profiler=None, deep=False):
+        self.ydl_opts = dict(DEFAULT_YDL_OPTS, **(ydl_opts or {}))
+        self.deep = deep
+        self.fields = None  # yt-dlp always returns every field; the analyzer trims per profile
+        self.ydl = None
+        self._urlopen = None
+        self.profiler = profiler
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        # Each run brings its own profiler; re-point the request counters at it
+        self._profiler = profiler
+        if self.ydl is not None:
+            self._attach()
+
+    @property
+    def per_video_requests(self):
+        return self.deep
+
+    def _attach(self):
+        self.ydl.urlopen = self._urlopen
+        if self._profiler:
+            self._profiler.attach(self.ydl)
+
+    def _open(self):
+        if self.ydl is None:
+            # Deferred: yt-dlp costs ~200ms to import and is only needed here
+            import yt_dlp
+
+            self.ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+            self.ydl.__enter__()
+            self._urlopen = self.ydl.urlopen
+            self._attach()
+        return self.ydl
+
+    def close(self):
+        if self.ydl is not None:
+            self.ydl.__exit__(None, None, None)
+            self.ydl = None
+
+    def list_channel(self, channel_url):
+        channel_dict = self._open().extract_info(channel_url, download=False)
+        if not channel_dict or 'entries' not in channel_dict:
+            raise ExtractorError(f"No videos found at {channel_url}")
+        return [v for v in channel_dict['entries'] if v]
+
+    def fetch_video(self, entry):
+        """Full metadata (likes, tags, description...) for one flat-list entry."""
+        url = entry.get('webpage_url') or entry.get('url')
+        if not self.deep or not url:
+            return entry
+        info = self._open().extract_info(url, download=False)
+        # ignoreerrors=True makes yt-dlp return None for unavailable videos; keep the flat data
+        return {**entry, **info} if info else entry
+
+
+class ConnectionPool:
+    """Up to `size` keep-alive HTTP connections to one host, shared between threads."""
+
+    def __init__(self, base_url, size=DEFAULT_POOL_SIZE, timeout=10):
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme or 'http'
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.timeout = timeout
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        # Deferred: http.client pulls in email parsing (~30ms at start-up)
+        import http.client
+
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        self.created += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, connection, path):
+        import http.client
+
+        try:
+            connection.request('GET', path, headers={'Connection': 'keep-alive'})
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise ConnectionError(f"{type(e).__name__}: {e}") from e
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        return response.status, response.headers, body
+
+    def get(self, path):
+        """GET `path`; returns (status, headers, body)."""
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._send(self._connect(), path)
+            try:
+                return self._send(connection, path)
+            except ConnectionError:
+                # The server may have dropped an idle keep-alive connection; retry on a fresh one
+                return self._send(self._connect(), path)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class StandInExtractor(_Session):
+    """Extract from the local stand-in server, retrying throttled and failed requests.
+
+    429 responses are retried after their Retry-After delay; 5xx responses and connection
+    errors use exponential backoff with jitter. Requests share a pool of `pool_size`
+    keep-alive connections; pool_size=0 opens a new connection per request.
+    """
+
+    per_video_requests = True
+
+    def __init__(self, base_url, max_retries=5, backoff=0.25, timeout=10, profiler=None,
+                 pool_size=DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.profiler = profiler
+        self.pool = ConnectionPool(self.base_url, pool_size, timeout) if pool_size else None
+        self.fields = None  # None → every field
+        self.retries = 0
+        self.throttled = 0
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+
+    def _fetch(self, path):
+        if self.pool:
+            return self.pool.get(path)
+
+        # Deferred: urllib.request pulls in http.client and email (~40ms at start-up)
+        from urllib.error import HTTPError
+        from urllib.request import urlopen
+
+        try:
+            with urlopen(f"{self.base_url}{path}", timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def _get_json(self, path):
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                status, headers, body = self._fetch(path)
+            except OSError as e:  # URLError and dropped connections are OSErrors
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                last_error = str(e)
+            else:
+                if self.profiler:
+                    self.profiler.record_request(len(body), time.perf_counter() - start)
+                if status < 400:
+                    return json.loads(body)
+                if status == 429:
+                    self.throttled += 1
+                    delay = float(headers.get('Retry-After') or self.backoff)
+                elif status >= 500:
+                    delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                else:
+                    raise ExtractorError(f"GET {path} failed: HTTP {status}")
+                last_error = f"HTTP {status}"
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                time.sleep(delay)
+
+        raise ExtractorError(f"GET {path} failed after {self.max_retries} retries: {last_error}")
+
+    def list_channel(self, channel_url):
+        path = urlparse(channel_url).path.strip('/') or 'channel'
+        # '@handle/videos' → '@handle'
+        name = path.split('/')[0]
+        return self._get_json(f"/channel/{quote(name)}")['entries']
+
+    def fetch_video(self, entry):
+        path = f"/video/{quote(entry['id'])}"
+        if self.fields:
+            path += f"?fields={','.join(self.fields)}"
+        return {**entry, **self._get_json(path)}
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Channel Growth Store
+Append-only time series of per-video view/like/comment counts, one snapshot per run.
+
+Each snapshot is stored as integer deltas against the video's previous snapshot
+(the first snapshot stores the absolute values), keyed by an integer video key and a
+Unix timestamp. A small `latest` table holds the current absolute counts, so appending
+a snapshot never has to read history, and "views gained since X" is a range sum over
+the delta rows.
+
+Usage:
+    python3 growth_store.py --channel channelname --since 7 --top 20
+    python3 growth_store.py --channel channelname --video VIDEO_ID
+"""
+
+import argparse
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+GROWTH_STORE_PATH = Path("analysis") / "growth.sqlite3"
+
+# A channel reached through different URLs (@handle, /channel/UC...) gets a key per name,
+# so the same video may be recorded under several channels: video ids are unique per channel
+VIDEOS_TABLE = """
+CREATE TABLE IF NOT EXISTS videos (
+    key      INTEGER PRIMARY KEY,
+    channel  TEXT    NOT NULL,
+    video_id TEXT    NOT NULL,
+    title    TEXT,
+    first_ts INTEGER NOT NULL,
+    UNIQUE (channel, video_id)
+);
+"""
+
+SCHEMA = VIDEOS_TABLE + """
+CREATE INDEX IF NOT EXISTS videos_by_channel ON videos (channel);
+
+CREATE TABLE IF NOT EXISTS latest (
+    key      INTEGER PRIMARY KEY,
+    ts       INTEGER NOT NULL,
+    views    INTEGER NOT NULL,
+    likes    INTEGER NOT NULL,
+    comments INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS deltas (
+    ts         INTEGER NOT NULL,
+    key        INTEGER NOT NULL,
+    d_views    INTEGER NOT NULL,
+    d_likes    INTEGER NOT NULL,
+    d_comments INTEGER NOT NULL,
+    PRIMARY KEY (ts, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deltas_by_video ON deltas (key, ts);
+"""
+
+DAY = 86400
+
+
+def _count(value):
+    """Counts from yt-dlp may be missing; None means 'unknown', not zero."""
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+class GrowthStore:
+    """Delta-encoded per-video snapshot history."""
+
+    def __init__(self, path=GROWTH_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Rebuild a videos table from before per-channel keys (video_id UNIQUE on its own)."""
+        for index in conn.execute("PRAGMA index_list(videos)").fetchall():
+            columns = [row['name'] for row in conn.execute(f"PRAGMA index_info(\"{index['name']}\")")]
+            if index['unique'] and columns == ['video_id']:
+                break
+        else:
+            return
+        # Keys are kept, so the latest and deltas rows still point at their videos
+        conn.executescript(f"""
+            BEGIN;
+            ALTER TABLE videos RENAME TO videos_global;
+            {VIDEOS_TABLE}
+            INSERT INTO videos (key, channel, video_id, title, first_ts)
+                SELECT key, channel, video_id, title, first_ts FROM videos_global;
+            DROP TABLE videos_global;
+            CREATE INDEX IF NOT EXISTS videos_by_channel ON videos (channel);
+            COMMIT;
+        """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record_snapshot(self, channel, videos, ts=None):
+        """Append one snapshot for `channel`.
+
+        `videos` is an iterable of dicts with video_id/id, title, view_count, like_count,
+        comment_count. Unknown counts carry the previous value forward. Returns rows written.
+        """
+        ts = int(ts if ts is not None else time.time())
+        written = 0
+
+        with closing(self._connect()) as conn, conn:
+            keys = {row['video_id']: row['key'] for row in conn.execute(
+                "SELECT video_id, key FROM videos WHERE channel = ?", (channel,)
+            )}
+            latest = {row['key']: row for row in conn.execute(
+                "SELECT l.* FROM latest l JOIN videos v ON v.key = l.key WHERE v.channel = ?", (channel,)
+            )}
+
+            delta_rows = []
+            latest_rows = []
+            for video in videos:
+                video_id = video.get('video_id') or video.get('id')
+                if not video_id:
+                    continue
+
+                key = keys.get(video_id)
+                if key is None:
+                    key = conn.execute(
+                        "INSERT INTO videos (channel, video_id, title, first_ts) VALUES (?, ?, ?, ?)",
+                        (channel, video_id, video.get('title'), ts)
+                    ).lastrowid
+                    keys[video_id] = key
+
+                previous = latest.get(key)
+                counts = []
+                for field, column in (('view_count', 'views'), ('like_count', 'likes'), ('comment_count', 'comments')):
+                    value = _count(video.get(field))
+                    if value is None:
+                        value = previous[column] if previous else 0
+                    counts.append(value)
+
+                if previous is not None and previous['ts'] >= ts:
+                    continue  # Already have a snapshot this recent for this video
+                base = (previous['views'], previous['likes'], previous['comments']) if previous else (0, 0, 0)
+                delta_rows.append((ts, key) + tuple(c - b for c, b in zip(counts, base)))
+                latest_rows.append((key, ts) + tuple(counts))
+                written += 1
+
+            conn.executemany("INSERT INTO deltas VALUES (?, ?, ?, ?, ?)", delta_rows)
+            conn.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?, ?)", latest_rows)
+
+        return written
+
+    def views_gained(self, since, channel=None, limit=50):
+        """Views gained per video since `since` (Unix time), largest first.
+
+        A video's first snapshot is its baseline, so videos first seen after `since`
+        only count growth from their second snapshot on.
+        """
+        query = """
+            SELECT v.video_id, v.channel, v.title, SUM(d.d_views) AS views_gained,
+                   SUM(d.d_likes) AS likes_gained, SUM(d.d_comments) AS comments_gained
+            FROM deltas d JOIN videos v ON v.key = d.key
+            WHERE d.ts > ? AND d.ts > v.first_ts
+        """
+        params = [int(since)]
+        if channel:
+            query += " AND v.channel = ?"
+            params.append(channel)
+        query += " GROUP BY d.key ORDER BY views_gained DESC LIMIT ?"
+        params.append(limit)
+
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def velocity_ranking(self, since, channel=None, limit=50):
+        """Videos ranked by views per day over the window starting at `since`."""
+        query = """
+            SELECT v.video_id, v.channel, v.title, SUM(d.d_views) AS views_gained,
+                   MAX(l.ts) - MAX(?, v.first_ts) AS window_s, l.views AS views
+            FROM deltas d
+            JOIN videos v ON v.key = d.key
+            JOIN latest l ON l.key = d.key
+            WHERE d.ts > ? AND d.ts > v.first_ts
+        """
+        params = [int(since), int(since)]
+        if channel:
+            query += " AND v.channel = ?"
+            params.append(channel)
+        query += " GROUP BY d.key"
+
+        with closing(self._connect()) as conn:
+            rows = [dict(row) for row in conn.execute(query, params)]
+
+        for row in rows:
+            row['views_per_day'] = round(row['views_gained'] / max(row.pop('window_s'), 1) * DAY, 1)
+        rows.sort(key=lambda r: r['views_per_day'], reverse=True)
+        return rows[:limit]
+
+    def history(self, channel, video_id):
+        """Absolute counts per snapshot for one channel's video, reconstructed from its deltas."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT d.ts, d.d_views, d.d_likes, d.d_comments FROM deltas d "
+                "JOIN videos v ON v.key = d.key WHERE v.channel = ? AND v.video_id = ? ORDER BY d.ts",
+                (channel, video_id)
+            ).fetchall()
+
+        views = likes = comments = 0
+        series = []
+        for row in rows:
+            views += row['d_views']
+            likes += row['d_likes']
+            comments += row['d_comments']
+            series.append({'ts': row['ts'], 'views': views, 'likes': likes, 'comments': comments})
+        return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query channel growth across analysis runs")
+    parser.add_argument('--channel', help="Limit to one channel")
+    parser.add_argument('--since', type=float, default=7, help="Window in days (default: 7)")
+    parser.add_argument('--top', type=int, default=20, help="Number of videos to show")
+    parser.add_argument('--velocity', action='store_true', help="Rank by views/day instead of views gained")
+    parser.add_argument('--video', help="Show one video's counts per snapshot (needs --channel)")
+    args = parser.parse_args()
+    if args.video and not args.channel:
+        parser.error("--video needs --channel: video ids are recorded per channel")
+
+    store = GrowthStore()
+    since = time.time() - args.since * DAY
+
+    if args.video:
+        print(f"📼 {args.video} on {args.channel}:\n")
+        for row in store.history(args.channel, args.video):
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['ts']))
+            print(f"   {when}  {row['views']:>12,} views  {row['likes']:>9,} likes  {row['comments']:>7,} comments")
+    elif args.velocity:
+        print(f"🚀 Fastest-growing videos (views/day, last {args.since:g} days):\n")
+        for i, row in enumerate(store.velocity_ranking(since, args.channel, args.top), 1):
+            print(f"   {i:>3}. {row['views_per_day']:>12,.1f}/day  {row['title'] or row['video_id']}")
+    else:
+        print(f"📈 Views gained (last {args.since:g} days):\n")
+        for i, row in enumerate(store.views_gained(since, args.channel, args.top), 1):
+            print(f"   {i:>3}. {row['views_gained']:>+12,}  {row['title'] or row['video_id']}")
+
+
+if __name__ == "__main__":
+    main()
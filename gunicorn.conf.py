@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for the YouTube Success Analyzer web backend.
+
+Runs WEB_CONCURRENCY worker processes (default 2) and sets up Prometheus multi-process
+mode so /metrics aggregates every worker.
+
+Workers are threaded (gthread): every /api/analyze progress stream holds a thread for as long
+as its analysis runs or waits in the queue. Each worker gets a thread per admitted analysis
+(ANALYZE_CONCURRENCY running + ANALYZE_QUEUE_SIZE waiting, see admission.py) plus SPARE_THREADS
+for everything else, so status and metrics requests, and the fast 429s for analyses over the
+limit, are answered while the queue is full. Override with WEB_THREADS. The admission limits
+are shared by all workers, so any one of them may hold every admitted stream.
+"""
+
+import os
+import shutil
+import tempfile
+
+from admission import limits_from_env
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+SPARE_THREADS = 4
+_concurrency, _max_queued, _ = limits_from_env()
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', _concurrency + _max_queued + SPARE_THREADS))
+
+# Must be set before workers import prometheus_client
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'youtube-analyzer-metrics')
+)
+
+
+def on_starting(server):
+    """Start each deployment with an empty metrics directory."""
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges so they stop counting."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Report Downloads
+Helpers for serving a run's artefacts (Markdown reports, the video CSV, prompts) over HTTP
+from the web backend, so remote users get their results without access to the server's disk:
+
+- artefacts are listed and resolved strictly inside their run directory
+- text artefacts are compressed once per encoding (brotli when the `brotli` package is
+  installed, gzip otherwise) into a cache keyed by each file's size and mtime, so repeat
+  downloads stream the cached copy instead of compressing again
+- the whole run is bundled as the same .zip `publish(archive='zip')` writes next to it,
+  rebuilt only when an artefact is newer than the archive
+
+Files are always streamed from disk, never read into memory, and the web backend serves them
+with ETag / Last-Modified validators and range support.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from run_output import write_archive, is_staging
+
+COMPRESSIBLE_SUFFIXES = {'.md', '.csv', '.json', '.txt', '.html'}
+MIN_COMPRESS_BYTES = 1024   # Smaller files gain less than the headers cost
+COPY_BUFFER = 1 << 20
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+_bundle_lock = threading.Lock()  # One build per run at a time in this process; other workers stage their own
+
+
+def _brotli():
+    """The optional brotli module, or None."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def supported_encodings():
+    """Content-codings this server can produce, most compact first."""
+    return ('br', 'gzip') if _brotli() else ('gzip',)
+
+
+def list_artefacts(run_dir):
+    """Every file of a run as {'name', 'size', 'modified'}; names are relative POSIX paths."""
+    run_dir = Path(run_dir)
+    artefacts = []
+    for path in sorted(run_dir.rglob('*')):
+        relative = path.relative_to(run_dir)
+        if not path.is_file() or any(part.startswith('.') for part in relative.parts):
+            continue
+        stat = path.stat()
+        artefacts.append({'name': relative.as_posix(), 'size': stat.st_size, 'modified': stat.st_mtime})
+    return artefacts
+
+
+def resolve_artefact(run_dir, name):
+    """The file `name` inside run_dir, or None for anything outside it, hidden or missing."""
+    if not name:
+        return None
+    run_dir = Path(run_dir).resolve()
+    path = (run_dir / name).resolve()
+    relative = path.relative_to(run_dir) if run_dir in path.parents else None
+    if relative is None or any(part.startswith('.') for part in relative.parts) or not path.is_file():
+        return None
+    return path
+
+
+def choose_encoding(path, accepted):
+    """The content-coding to send path with, given the client's acceptable codings (or None)."""
+    path = Path(path)
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES or path.stat().st_size < MIN_COMPRESS_BYTES:
+        return None
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compressed_copy(path, encoding, cache_dir):
+    """Path of a cached `encoding` copy of path, compressed (streaming) on first request."""
+    path = Path(path)
+    stat = path.stat()
+    key = hashlib.sha1(str(path).encode()).hexdigest()[:16]
+    cached = Path(cache_dir) / f"{key}-{stat.st_size}-{stat.st_mtime_ns}{ENCODING_SUFFIXES[encoding]}"
+    if cached.exists():
+        return cached
+
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    for stale in cached.parent.glob(f"{key}-*{ENCODING_SUFFIXES[encoding]}"):
+        stale.unlink(missing_ok=True)  # Copies of an older version of the file
+
+    partial = cached.with_name(f".{cached.name}.{os.getpid()}.{threading.get_ident()}.partial")
+    with open(path, 'rb') as src:
+        if encoding == 'gzip':
+            with open(partial, 'wb') as raw, gzip.GzipFile('', 'wb', 6, raw, mtime=0) as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER)
+        else:
+            compressor = _brotli().Compressor(quality=6)
+            with open(partial, 'wb') as dst:
+                for chunk in iter(lambda: src.read(COPY_BUFFER), b''):
+                    dst.write(compressor.process(chunk))
+                dst.write(compressor.finish())
+    os.replace(partial, cached)
+    return cached
+
+
+def run_bundle(run_dir):
+    """The run's .zip archive next to it, (re)built if missing or older than any artefact."""
+    run_dir = Path(run_dir)
+    if is_staging(run_dir):
+        raise ValueError("Run has not been published yet")
+    archive = run_dir.parent / f"{run_dir.name}.zip"
+    newest = max((f['modified'] for f in list_artefacts(run_dir)), default=0)
+    with _bundle_lock:
+        try:
+            built = archive.stat().st_mtime
+        except OSError:
+            built = None
+        if built is None or newest > built:
+            archive = write_archive(run_dir, 'zip')
+    return archive
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Run Catalogue
+SQLite index of every completed analysis run under analysis/, so history queries
+(latest run, per-channel run lists, views over time) never have to walk the tree.
+
+The analyzer records each run when it completes. Existing run directories can be
+imported once with:
+
+    python3 run_catalogue.py --rebuild
+"""
+
+import argparse
+import json
+import pickle
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+CATALOGUE_PATH = Path("analysis") / "catalogue.sqlite3"
+RUN_ID_FORMAT = '%Y%m%d_%H%M%S'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY,
+    channel        TEXT    NOT NULL,
+    run_id         TEXT    NOT NULL,
+    path           TEXT    NOT NULL,
+    channel_url    TEXT,
+    started_at     REAL,
+    completed_at   REAL    NOT NULL,
+    video_count    INTEGER NOT NULL DEFAULT 0,
+    total_views    INTEGER NOT NULL DEFAULT 0,
+    total_likes    INTEGER NOT NULL DEFAULT 0,
+    total_comments INTEGER NOT NULL DEFAULT 0,
+    files          TEXT    NOT NULL DEFAULT '[]',
+    UNIQUE (channel, run_id)
+);
+CREATE INDEX IF NOT EXISTS runs_by_completion ON runs (completed_at);
+CREATE INDEX IF NOT EXISTS runs_by_channel ON runs (channel, completed_at);
+"""
+
+COLUMNS = ('channel', 'run_id', 'path', 'channel_url', 'started_at', 'completed_at',
+           'video_count', 'total_views', 'total_likes', 'total_comments', 'files')
+
+
+def run_totals(video_data):
+    """Summarise a run's video_data into the catalogue's total columns."""
+    return {
+        'video_count': len(video_data),
+        'total_views': sum(v.get('view_count') or 0 for v in video_data),
+        'total_likes': sum(v.get('like_count') or 0 for v in video_data),
+        'total_comments': sum(v.get('comment_count') or 0 for v in video_data),
+    }
+
+
+def _row_to_dict(row):
+    run = dict(row)
+    run['files'] = json.loads(run['files'])
+    return run
+
+
+class RunCatalogue:
+    """Read/write access to the run catalogue database.
+
+    With read_only=True the database is never created or migrated: queries against a
+    catalogue that does not exist yet return no runs.
+    """
+
+    def __init__(self, path=CATALOGUE_PATH, read_only=False):
+        self.path = Path(path)
+        self.read_only = read_only
+        if read_only:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # readers never block the analyzer's write
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        if self.read_only:
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, timeout=10)
+        else:
+            conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _query(self, query, params=()):
+        """All rows of a read query; none while a read-only catalogue does not exist."""
+        if self.read_only and not self.path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).fetchall()
+
+    def record_run(self, channel, run_id, path, video_data, files, channel_url='',
+                   started_at=None, completed_at=None):
+        """Insert (or replace) a completed run."""
+        run = {
+            'channel': channel,
+            'run_id': run_id,
+            'path': str(path),
+            'channel_url': channel_url,
+            'started_at': started_at,
+            'completed_at': completed_at or time.time(),
+            'files': json.dumps(sorted(files)),
+            **run_totals(video_data),
+        }
+        placeholders = ', '.join(f':{c}' for c in COLUMNS)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"INSERT OR REPLACE INTO runs ({', '.join(COLUMNS)}) VALUES ({placeholders})", run)
+
+    def latest_run(self, channel=None):
+        """Most recently completed run, optionally for one channel."""
+        query = "SELECT * FROM runs"
+        params = ()
+        if channel:
+            query += " WHERE channel = ?"
+            params = (channel,)
+        query += " ORDER BY completed_at DESC LIMIT 1"
+
+        rows = self._query(query, params)
+        return _row_to_dict(rows[0]) if rows else None
+
+    def get_run(self, channel, run_id):
+        rows = self._query("SELECT * FROM runs WHERE channel = ? AND run_id = ?", (channel, run_id))
+        return _row_to_dict(rows[0]) if rows else None
+
+    def channel_runs(self, channel, limit=100):
+        """Runs for one channel, newest first."""
+        rows = self._query(
+            "SELECT * FROM runs WHERE channel = ? ORDER BY completed_at DESC LIMIT ?",
+            (channel, limit)
+        )
+        return [_row_to_dict(row) for row in rows]
+
+    def channels(self):
+        """Every catalogued channel with its run count and latest completion time."""
+        rows = self._query(
+            "SELECT channel, COUNT(*) AS runs, MAX(completed_at) AS last_completed_at "
+            "FROM runs GROUP BY channel ORDER BY last_completed_at DESC"
+        )
+        return [dict(row) for row in rows]
+
+    def views_over_time(self, channel, since=None):
+        """(completed_at, total_views, video_count) per run for one channel, oldest first."""
+        query = "SELECT completed_at, total_views, video_count FROM runs WHERE channel = ?"
+        params = [channel]
+        if since is not None:
+            query += " AND completed_at >= ?"
+            params.append(since)
+        query += " ORDER BY completed_at"
+
+        rows = self._query(query, params)
+        return [dict(row) for row in rows]
+
+    def count(self):
+        rows = self._query("SELECT COUNT(*) FROM runs")
+        return rows[0][0] if rows else 0
+
+    def rebuild(self, analysis_dir):
+        """One-off import of run directories that predate the catalogue. Returns runs added."""
+        from youtube_success_analyzer import DATASET_FILENAME
+        from run_output import is_failed
+
+        added = 0
+        for channel_dir in Path(analysis_dir).iterdir():
+            if not channel_dir.is_dir() or channel_dir.name.startswith('.'):
+                continue
+            for run_dir in channel_dir.iterdir():
+                if not run_dir.is_dir() or run_dir.name.startswith('.') or is_failed(run_dir):
+                    continue
+
+                files = [f.name for f in run_dir.iterdir() if f.is_file()]
+                if not files:
+                    continue
+
+                video_data, channel_url = [], ''
+                dataset = run_dir / DATASET_FILENAME
+                if dataset.exists():
+                    with open(dataset, 'rb') as f:
+                        snapshot = pickle.load(f)
+                    video_data = snapshot.get('video_data', [])
+                    channel_url = snapshot.get('channel_url', '')
+
+                try:
+                    started_at = datetime.strptime(run_dir.name, RUN_ID_FORMAT).timestamp()
+                except ValueError:
+                    started_at = None
+
+                self.record_run(
+                    channel_dir.name, run_dir.name, run_dir, video_data, files,
+                    channel_url=channel_url,
+                    started_at=started_at,
+                    completed_at=max(run_dir.stat().st_mtime, started_at or 0)
+                )
+                added += 1
+        return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild the analysis run catalogue")
+    parser.add_argument('--rebuild', action='store_true', help="Import existing run directories under analysis/")
+    parser.add_argument('--channel', help="List runs for this channel")
+    args = parser.parse_args()
+
+    catalogue = RunCatalogue()
+
+    if args.rebuild:
+        started = time.perf_counter()
+        added = catalogue.rebuild(CATALOGUE_PATH.parent)
+        print(f"✅ Catalogued {added} runs in {time.perf_counter() - started:.2f}s")
+
+    if args.channel:
+        for run in catalogue.channel_runs(args.channel):
+            print(f"   {run['run_id']}  {run['video_count']:>6} videos  {run['total_views']:>14,} views  {run['path']}")
+    else:
+        for channel in catalogue.channels():
+            print(f"   {channel['channel']:<40} {channel['runs']:>5} runs")
+
+
+if __name__ == "__main__":
+    main()
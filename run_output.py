@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Run Output
+Builds a run directory in a hidden staging directory next to its final location and
+publishes it with a single atomic rename, so readers (the status checker, the run
+catalogue, the web UI) only ever see complete runs.
+
+    analysis/<channel>/.<timestamp>.partial/   ← everything is written here
+    analysis/<channel>/<timestamp>/            ← appears all at once on publish()
+
+A run that fails or is cancelled is published with a RUN_FAILED.json marker, so what it
+did produce (its profile, --anytime interim reports) stays visible; an empty one is
+discarded. Staging directories left by crashed processes are swept by later runs.
+publish() can also write a single compressed archive of the run
+(analysis/<channel>/<timestamp>.zip or .tar.gz).
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+STAGING_PREFIX = '.'
+STAGING_SUFFIX = '.partial'
+ARCHIVE_FORMATS = ('zip', 'tar.gz')
+WRITE_BUFFER = 1 << 20  # 1 MiB: large reports and the CSV go out in a few big writes
+FAILED_MARKER = 'RUN_FAILED.json'
+STALE_STAGING_SECONDS = 24 * 3600  # Untouched this long, a staging directory belongs to a dead run
+
+
+def is_staging(path):
+    """True for a run directory that has not been published."""
+    name = Path(path).name
+    return name.startswith(STAGING_PREFIX) and name.endswith(STAGING_SUFFIX)
+
+
+def is_failed(path):
+    """True for a published run that did not complete."""
+    return (Path(path) / FAILED_MARKER).exists()
+
+
+def sweep_stale_staging(parent, max_age=STALE_STAGING_SECONDS):
+    """Remove staging directories (and partial archives) under parent untouched for max_age seconds."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(Path(parent).iterdir())
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if not is_staging(entry) or entry.stat().st_mtime > cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+            removed += 1
+        except OSError:
+            pass  # Another process got there first
+    return removed
+
+
+def _fsync_path(path, directory=False):
+    flags = os.O_RDONLY | (getattr(os, 'O_DIRECTORY', 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return  # Directories cannot be opened on Windows; NTFS renames are journaled anyway
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_archive(run_dir, fmt='zip'):
+    """Write run_dir as one compressed archive next to it (atomically); return the archive path."""
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format {fmt!r} (choose from {', '.join(ARCHIVE_FORMATS)})")
+
+    # Deferred: only needed when an archive is requested
+    import tarfile
+    import zipfile
+
+    run_dir = Path(run_dir)
+    archive = run_dir.parent / f"{run_dir.name}.{fmt}"
+    # One partial file per build: web workers may bundle the same run at the same time
+    partial = run_dir.parent / (f"{STAGING_PREFIX}{archive.name}.{os.getpid()}.{threading.get_ident()}"
+                                f"{STAGING_SUFFIX}")
+    files = sorted(f for f in run_dir.rglob('*') if f.is_file())
+
+    try:
+        if fmt == 'zip':
+            with zipfile.ZipFile(partial, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for f in files:
+                    zf.write(f, f"{run_dir.name}/{f.relative_to(run_dir).as_posix()}")
+        else:
+            with tarfile.open(partial, 'w:gz') as tf:
+                for f in files:
+                    tf.add(f, f"{run_dir.name}/{f.relative_to(run_dir).as_posix()}")
+        os.replace(partial, archive)
+    finally:
+        partial.unlink(missing_ok=True)
+    return archive
+
+
+class RunOutput:
+    """A run directory that is staged, then published with one rename."""
+
+    def __init__(self, final_dir, sync=True):
+        self.final_dir = Path(final_dir)
+        self.staging_dir = self.final_dir.parent / f"{STAGING_PREFIX}{self.final_dir.name}{STAGING_SUFFIX}"
+        self.sync = sync
+        self.archive = None
+        self.published = False
+
+    def open(self):
+        """Create an empty staging directory and return it."""
+        sweep_stale_staging(self.final_dir.parent)
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)  # Left over from a crashed run with the same timestamp
+        self.staging_dir.mkdir(parents=True)
+        return self.staging_dir
+
+    def _free_final_dir(self):
+        # Two runs of one channel in the same second must not merge
+        candidate, n = self.final_dir, 1
+        while candidate.exists():
+            n += 1
+            candidate = self.final_dir.with_name(f"{self.final_dir.name}_{n}")
+        return candidate
+
+    def publish(self, archive=None):
+        """Atomically move the staged run into place; optionally archive it. Returns the final dir."""
+        if self.sync:
+            # One flush pass over the finished run instead of an fsync per write
+            for f in self.staging_dir.rglob('*'):
+                if f.is_file():
+                    _fsync_path(f)
+            _fsync_path(self.staging_dir, directory=True)
+
+        self.final_dir = self._free_final_dir()
+        os.rename(self.staging_dir, self.final_dir)
+        self.published = True
+        if self.sync:
+            _fsync_path(self.final_dir.parent, directory=True)
+
+        if archive:
+            self.archive = write_archive(self.final_dir, archive)
+        return self.final_dir
+
+    def publish_failed(self, state, error=None):
+        """Publish an unfinished run ('failed' or 'cancelled') marked with RUN_FAILED.json.
+
+        Returns the final dir, or None when the run wrote nothing and was discarded instead.
+        """
+        if not self.staging_dir.is_dir():
+            return None
+        if not any(self.staging_dir.iterdir()):
+            self.discard()
+            return None
+        marker = {'state': state, 'error': error, 'finished_at': time.time()}
+        with open(self.staging_dir / FAILED_MARKER, 'w', encoding='utf-8') as f:
+            json.dump(marker, f, indent=2)
+        return self.publish()
+
+    def discard(self):
+        """Remove the staging directory of a run that will not be published."""
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
@@ -2,20 +2,41 @@
 """
 Automated YouTube Performance Auditor Runner
 Automatically finds and analyzes your CSV files from Downloads folder.
+
+Portfolio mode audits every export set found under a directory tree (one channel's
+Totals / Chart data / Table data CSVs each) in a process pool and ranks the channels:
+
+    python3 run_performance_audit.py --portfolio ~/exports --workers 4
+    python3 run_performance_audit.py --portfolio ~/exports --baseline   # also time a sequential run
+
+Portfolios too small for a pool to pay for its start-up are audited in-process.
 """
 
+import argparse
+import io
+import json
 import os
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
 from pathlib import Path
 from youtube_performance_auditor import YouTubePerformanceAuditor
+from run_output import RunOutput
+
+EXPORT_KINDS = ('totals', 'chart', 'table')  # Matched in this order against lower-cased file names
+PORTFOLIO_DIR = Path("portfolio_audits")
+MIN_SETS_PER_WORKER = 2            # Each worker's start-up (a pandas import) is paid back over several audits
+POOL_MIN_BYTES = 16 * 1024 * 1024  # Below this much CSV the whole portfolio audits faster than a pool starts
 
 
 def find_csv_files():
     """Automatically find the CSV files in Downloads folder."""
     downloads = Path.home() / "Downloads"
-    
+
     totals_file = None
     chart_file = None
-    
+    table_file = None
+
     # Look for the CSV files
     for file in downloads.glob("*.csv"):
         filename = file.name.lower()
@@ -23,26 +44,258 @@ def find_csv_files():
             totals_file = str(file)
         elif "chart" in filename:
             chart_file = str(file)
-    
-    return totals_file, chart_file
+        elif "table" in filename:
+            table_file = str(file)
+
+    return totals_file, chart_file, table_file
+
+
+def find_export_sets(root):
+    """Every export set under root: CSVs sharing a directory and a file-name prefix.
+
+    'ChannelA/Untitled spreadsheet - Totals.csv' and '... - Chart data.csv' form one set.
+    Returns a list of {'name', 'totals', 'chart', 'table'} dicts (missing files are None).
+    """
+    root = Path(root)
+    groups = {}
+    for file in sorted(root.rglob("*.csv")):
+        filename = file.name.lower()
+        for kind in EXPORT_KINDS:
+            if kind in filename:
+                groups.setdefault((file.parent, filename[:filename.index(kind)]), {})[kind] = str(file)
+                break
+
+    per_directory = {}
+    for directory, _ in groups:
+        per_directory[directory] = per_directory.get(directory, 0) + 1
+
+    export_sets = []
+    for (directory, prefix), files in groups.items():
+        if 'totals' not in files and 'chart' not in files:
+            continue  # A Table data CSV alone cannot be audited
+        name = directory.relative_to(root).as_posix() if directory != root else root.resolve().name
+        if per_directory[directory] > 1:
+            name = f"{name}/{prefix.strip(' -_') or 'export'}"
+        export_sets.append({'name': name, **{kind: files.get(kind) for kind in EXPORT_KINDS}})
+    return export_sets
+
+
+def _warm_up():
+    """Pool initializer: import the analysis stack once per worker, outside any audit's timing."""
+    import pandas  # noqa: F401
+    import trends  # noqa: F401
+    import anomalies  # noqa: F401
+
+
+def audit_export_set(export_set):
+    """Audit one export set quietly; returns its summary, report text and timing.
+
+    Runs in a worker process, so it must not raise: failures are reported in 'error'.
+    """
+    start, cpu_start = time.perf_counter(), time.process_time()
+    report = io.StringIO()
+    result = {'name': export_set['name'], 'error': None}
+    try:
+        auditor = YouTubePerformanceAuditor(export_set['totals'], export_set['chart'], export_set['table'])
+        with redirect_stdout(report):
+            ok = auditor.run_audit()
+        if ok:
+            result.update(auditor.summary())
+        else:
+            result['error'] = "Could not load the CSV files"
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    result['cpu_seconds'] = round(time.process_time() - cpu_start, 3)
+    result['report'] = report.getvalue()
+    return result
+
+
+def plan_workers(export_sets, requested=None):
+    """(workers, reason): the pool size for export_sets, 1 (in-process) when a pool would not pay off."""
+    cpus = os.cpu_count() or 1
+    workers = min(requested or cpus, cpus, len(export_sets))  # Workers beyond the cores only add overhead
+    if workers == 1:
+        capped = min(requested or cpus, len(export_sets)) > 1  # A pool was wanted, but there is one core
+        return 1, f"only {cpus} CPU core" if capped else None
+    size = sum(os.path.getsize(s[kind]) for s in export_sets for kind in EXPORT_KINDS if s[kind])
+    if size < POOL_MIN_BYTES:
+        return 1, f"{size / 1e6:.1f} MB of exports is too little to pay for starting workers"
+    if len(export_sets) < MIN_SETS_PER_WORKER * 2:
+        return 1, f"{len(export_sets)} export sets are too few to pay for starting workers"
+    return min(workers, len(export_sets) // MIN_SETS_PER_WORKER), None
+
+
+def _format_growth(value):
+    return f"{value:+.1f}%" if value is not None else "n/a"
+
+
+def write_portfolio_report(results, ranking, output_dir, timing):
+    """Write per-channel audit reports, PORTFOLIO.md and portfolio.json into output_dir."""
+    reports = {}
+    for number, result in enumerate(sorted(results, key=lambda r: r['name']), 1):
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in result['name'])
+        reports[result['name']] = f"{number:02d}_{safe}_audit.txt"
+        with open(output_dir / reports[result['name']], 'w', encoding='utf-8') as f:
+            f.write(result['report'])
+
+    lines = [
+        "# YouTube Portfolio Audit",
+        "",
+        f"**Audit Date**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"**Channels**: {len(ranking)} audited, {len(results) - len(ranking)} failed",
+        f"**Total Views**: {sum(r['total_views'] for r in ranking):,}",
+        "",
+        "## Ranking",
+        "",
+        "| Rank | Channel | Total Views | Avg Daily | 7-Day Avg | Week over Week | Growth | Videos | Top Video | Spikes | Report |",
+        "|------|---------|-------------|-----------|-----------|----------------|--------|--------|-----------|--------|--------|",
+    ]
+    for rank, r in enumerate(ranking, 1):
+        lines.append(
+            f"| {rank} | {r['name']} | {r['total_views']:,} | {r['avg_daily_views'] or 0:.1f} | "
+            f"{r['avg_7d'] or 0:.1f} | {_format_growth(r['week_over_week'])} | {_format_growth(r['growth_rate'])} | "
+            f"{r['videos']} | {(r['top_video'] or '-').replace('|', '/')} ({r['top_video_views']:,}) | "
+            f"{r['spikes']} | [{reports[r['name']]}]({reports[r['name']]}) |")
+
+    failed = [r for r in results if r['error']]
+    if failed:
+        lines += ["", "## Failed", ""]
+        lines += [f"- **{r['name']}**: {r['error']}" for r in failed]
+
+    lines += ["", "## Timing", "", f"- Workers: {timing['workers']}", f"- Wall time: {timing['wall_seconds']:.2f}s"]
+    if timing.get('sequential_seconds') is not None:
+        how = "measured" if timing['sequential_measured'] else "estimated from the audits' summed CPU time"
+        lines += [
+            f"- Sequential time ({how}): {timing['sequential_seconds']:.2f}s",
+            f"- Speed-up ({how}): {timing['speedup']:.2f}x",
+        ]
+    lines.append("")
+    with open(output_dir / "PORTFOLIO.md", 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+
+    with open(output_dir / "portfolio.json", 'w', encoding='utf-8') as f:
+        json.dump({
+            'timing': timing,
+            'ranking': [{k: v for k, v in r.items() if k != 'report'} for r in ranking],
+            'failed': [{'name': r['name'], 'error': r['error']} for r in failed],
+        }, f, indent=2)
+
+
+def run_portfolio(root, workers=None, output_dir=None, baseline=False):
+    """Audit every export set under root in a process pool and rank the channels.
+
+    With baseline, the portfolio is audited again in-process so the speed-up is measured
+    rather than estimated.
+    """
+    # Deferred: only portfolio mode needs a process pool
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    print(f"\n🔍 Searching for export sets under {root}...\n")
+    export_sets = find_export_sets(root)
+    if not export_sets:
+        print("❌ No Totals / Chart data CSVs found.")
+        return None
+
+    workers, reason = plan_workers(export_sets, workers)
+    print(f"✅ Found {len(export_sets)} export sets - auditing with {workers} worker(s)")
+    if reason:
+        print(f"   💡 Auditing in-process: {reason}")
+    print()
+
+    results = []
+
+    def collect(result):
+        results.append(result)
+        status = f"❌ {result['error']}" if result['error'] else f"✅ {result['total_views']:,} views"
+        print(f"   [{len(results)}/{len(export_sets)}] {result['name']}: {status} ({result['seconds']:.2f}s)")
+
+    # Wall time includes starting the workers, but not an in-process run's one-off imports
+    start = time.perf_counter()
+    if workers == 1:
+        _warm_up()
+        start = time.perf_counter()
+        for export_set in export_sets:
+            collect(audit_export_set(export_set))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as pool:
+            for future in as_completed([pool.submit(audit_export_set, s) for s in export_sets]):
+                collect(future.result())
+    wall = time.perf_counter() - start
+
+    timing = {'workers': workers, 'wall_seconds': round(wall, 3), 'sequential_seconds': None,
+              'sequential_measured': False, 'speedup': None}
+    if workers > 1:
+        if baseline:
+            print("\n   ⏱️  Timing a sequential baseline in-process...")
+            _warm_up()
+            baseline_start = time.perf_counter()
+            for export_set in export_sets:
+                audit_export_set(export_set)
+            sequential = time.perf_counter() - baseline_start
+        else:
+            # Summed CPU time does not grow when workers share a core, unlike their wall time
+            sequential = sum(r['cpu_seconds'] for r in results)
+        timing.update(sequential_seconds=round(sequential, 3), sequential_measured=baseline,
+                      speedup=round(sequential / wall, 2) if wall else 1.0)
+
+    ranking = sorted((r for r in results if not r['error']), key=lambda r: r['total_views'], reverse=True)
+
+    print("\n🏆 PORTFOLIO RANKING:\n")
+    for rank, r in enumerate(ranking, 1):
+        print(f"   #{rank}. {r['name']}: {r['total_views']:,} views, "
+              f"{_format_growth(r['week_over_week'])} week over week, {r['spikes']} spikes")
+    if timing['speedup'] is None:
+        print(f"\n   ⚡ {wall:.2f}s in-process")
+    elif baseline:
+        print(f"\n   ⚡ {wall:.2f}s with {workers} workers vs {timing['sequential_seconds']:.2f}s "
+              f"sequential (measured: {timing['speedup']:.2f}x speed-up)")
+    else:
+        print(f"\n   ⚡ {wall:.2f}s with {workers} workers vs ~{timing['sequential_seconds']:.2f}s "
+              f"sequential (estimated from CPU time: ~{timing['speedup']:.2f}x; --baseline measures it)")
+
+    run_output = RunOutput(Path(output_dir or PORTFOLIO_DIR) / datetime.now().strftime('%Y%m%d_%H%M%S'))
+    write_portfolio_report(results, ranking, run_output.open(), timing)
+    final_dir = run_output.publish()
+    print(f"\n📁 Portfolio report: {final_dir / 'PORTFOLIO.md'}\n")
+    return ranking
 
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Audit YouTube Analytics CSV exports")
+    parser.add_argument('--portfolio', metavar='DIR',
+                        help="Audit every export set under DIR in parallel and rank the channels")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for --portfolio (default: CPU count; 1 = sequential; "
+                             "small portfolios are always audited in-process)")
+    parser.add_argument('--baseline', action='store_true',
+                        help="With --portfolio: also audit in-process and report the measured speed-up")
+    parser.add_argument('--output-dir', default=None,
+                        help=f"Where --portfolio writes its report (default: {PORTFOLIO_DIR}/)")
+    args = parser.parse_args()
+
+    if args.portfolio:
+        run_portfolio(args.portfolio, args.workers, args.output_dir, args.baseline)
+        return
+
     print("\n🔍 Searching for your YouTube Analytics CSV files...\n")
-    
-    totals_path, chart_path = find_csv_files()
-    
+
+    totals_path, chart_path, table_path = find_csv_files()
+
     if totals_path:
         print(f"✅ Found Totals CSV: {os.path.basename(totals_path)}")
     else:
         print("⚠️  Totals CSV not found in Downloads folder")
-    
+
     if chart_path:
         print(f"✅ Found Chart Data CSV: {os.path.basename(chart_path)}")
     else:
         print("⚠️  Chart Data CSV not found in Downloads folder")
-    
+
+    if table_path:
+        print(f"✅ Found Table Data CSV: {os.path.basename(table_path)}")
+
     if not totals_path and not chart_path:
         print("\n❌ No CSV files found. Please download them from YouTube Analytics first.")
         print("\n📥 How to get your data:")
@@ -51,11 +304,11 @@ def main():
         print("   3. Save to your Downloads folder")
         print("   4. Run this script again")
         return
-    
+
     print()
-    
+
     # Create auditor and run analysis
-    auditor = YouTubePerformanceAuditor(totals_path, chart_path)
+    auditor = YouTubePerformanceAuditor(totals_path, chart_path, table_path)
     auditor.run_audit()
 
 
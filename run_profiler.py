@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Run Profiler
+Lightweight instrumentation for the analyzer pipeline: stage and per-video timers,
+network request/byte counters, memory high-water mark and an opt-in CPU profiler.
+
+Everything is written to `run_profile.json` in the run's output directory so slow
+networks can be told apart from slow report code.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_FILENAME = "run_profile.json"
+CPROFILE_FILENAME = "cpu_profile.prof"
+SAMPLES_FILENAME = "cpu_samples.txt"
+
+CPU_PROFILERS = ('cprofile', 'sample')
+
+
+def peak_memory_mb():
+    """Return the process's peak resident set size in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StackSampler:
+    """Sampling profiler: snapshots the main thread's stack every `interval` seconds.
+
+    Output is in collapsed-stack format (one `frame;frame;frame count` per line),
+    which flamegraph.pl and speedscope load directly.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """Collects timings and counters for one analyzer run."""
+
+    def __init__(self, cpu_profiler=None):
+        if cpu_profiler not in (None,) + CPU_PROFILERS:
+            raise ValueError(f"Unknown CPU profiler {cpu_profiler!r} (choose from {', '.join(CPU_PROFILERS)})")
+
+        self.cpu_profiler = cpu_profiler
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self.stages = []
+        self.video_timings = []
+        self.video_errors = 0
+        self.network = {'requests': 0, 'bytes': 0, 'seconds': 0.0}
+        self.request_timings = []
+        self.sampling = None  # Estimated vs actual deep-fetch cost, set by the analyzer
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self._sampler = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({
+                'name': name,
+                'start_s': round(start - self._t0, 4),
+                'seconds': round(time.perf_counter() - start, 4),
+            })
+
+    @contextmanager
+    def video(self, video_id):
+        """Time the processing of a single video."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.video_timings.append((video_id, time.perf_counter() - start))
+
+    def elapsed(self):
+        """Seconds since the run started."""
+        return time.perf_counter() - self._t0
+
+    def record_error(self):
+        """Count a video that failed to process."""
+        self.video_errors += 1
+
+    def record_request(self, nbytes=0, seconds=0.0):
+        with self._lock:
+            self.network['requests'] += 1
+            self.network['bytes'] += nbytes
+            self.network['seconds'] += seconds
+            self.request_timings.append(seconds)
+
+    def record_bytes(self, nbytes):
+        with self._lock:
+            self.network['bytes'] += nbytes
+
+    def attach(self, ydl):
+        """Count requests and response bytes made through a yt_dlp.YoutubeDL instance."""
+        original_urlopen = ydl.urlopen
+        profiler = self
+
+        def counted_urlopen(req):
+            start = time.perf_counter()
+            response = original_urlopen(req)
+            profiler.record_request(seconds=time.perf_counter() - start)
+
+            original_read = response.read
+
+            def counted_read(*args, **kwargs):
+                data = original_read(*args, **kwargs)
+                profiler.record_bytes(len(data))
+                return data
+
+            response.read = counted_read
+            return response
+
+        ydl.urlopen = counted_urlopen
+        return ydl
+
+    def start_cpu_profile(self):
+        if self.cpu_profiler == 'cprofile':
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.cpu_profiler == 'sample':
+            self._sampler = StackSampler()
+            self._sampler.start()
+
+    def stop_cpu_profile(self):
+        if self._cprofile:
+            self._cprofile.disable()
+        if self._sampler:
+            self._sampler.stop()
+
+    def summary(self):
+        """Return the profile as a JSON-serialisable dict."""
+        durations = sorted(seconds for _, seconds in self.video_timings)
+        slowest = sorted(self.video_timings, key=lambda item: item[1], reverse=True)[:10]
+        total_seconds = time.perf_counter() - self._t0
+        latencies = sorted(self.request_timings)
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_seconds': round(total_seconds, 4),
+            'stages': self.stages,
+            'videos': {
+                'count': len(durations),
+                'errors': self.video_errors,
+                'total_seconds': round(sum(durations), 4),
+                'mean_seconds': round(sum(durations) / len(durations), 4) if durations else 0.0,
+                'p50_seconds': round(_percentile(durations, 0.50), 4),
+                'p95_seconds': round(_percentile(durations, 0.95), 4),
+                'max_seconds': round(durations[-1], 4) if durations else 0.0,
+                'per_second': round(len(durations) / sum(durations), 2) if durations and sum(durations) else 0.0,
+                'slowest': [{'video_id': vid, 'seconds': round(s, 4)} for vid, s in slowest],
+            },
+            'network': {
+                'requests': self.network['requests'],
+                'bytes': self.network['bytes'],
+                'seconds': round(self.network['seconds'], 4),
+                'latency_ms': {
+                    'mean': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                    'p50': round(_percentile(latencies, 0.50) * 1000, 2),
+                    'p95': round(_percentile(latencies, 0.95) * 1000, 2),
+                },
+            },
+            'sampling': self.sampling,
+            'memory': {'peak_rss_mb': peak_memory_mb()},
+            'cpu_profiler': self.cpu_profiler,
+        }
+
+    def write(self, output_dir, variant=''):
+        """Write run_profile.json (and any CPU profile) to `output_dir`; return the JSON path.
+
+        A variant ('regenerate') is inserted before each file's extension, so a later pass over
+        the same run directory (run_profile.regenerate.json) never replaces the run's own profile.
+        """
+        output_dir = Path(output_dir)
+        self.stop_cpu_profile()
+
+        def name(filename):
+            stem, suffix = os.path.splitext(filename)
+            return f"{stem}.{variant}{suffix}" if variant else filename
+
+        if self._cprofile:
+            self._cprofile.dump_stats(str(output_dir / name(CPROFILE_FILENAME)))
+        if self._sampler:
+            self._sampler.write(output_dir / name(SAMPLES_FILENAME))
+
+        path = output_dir / name(PROFILE_FILENAME)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+def load_profile(run_dir):
+    """Read a run's profile, or return None if it has none."""
+    path = Path(run_dir) / PROFILE_FILENAME
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
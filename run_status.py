@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Live Run Status
+The analyzer publishes a small JSON status file while it runs (current stage, progress,
+last activity and a heartbeat), and a pointer to the most recent finished run when it exits.
+
+Readers (check_analyzer_status.py, the web backend) get the state of a run in O(1)
+instead of scanning `ps` output or walking cache and output directories.
+
+Layout:
+    analysis/.status/<pid>.json   one file per running analyzer, removed when it finishes
+    analysis/.status/latest.json  the most recently finished run
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+STATUS_DIR = Path("analysis") / ".status"
+LATEST_FILENAME = "latest.json"
+
+HEARTBEAT_INTERVAL = 5.0   # seconds between heartbeats while running
+PROGRESS_INTERVAL = 1.0    # minimum seconds between progress writes
+
+
+def _write_json_atomic(path, data):
+    """Write JSON so readers never see a half-written file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class StatusPublisher:
+    """Publishes the live status of one analyzer run.
+
+    Does nothing until start() is called, so report-only runs stay silent.
+    """
+
+    def __init__(self, status_dir=STATUS_DIR):
+        self.status_dir = Path(status_dir)
+        self.path = self.status_dir / f"{os.getpid()}.json"
+        self.status = None
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def start(self, channel_name, channel_url, output_dir):
+        now = time.time()
+        self.status = {
+            'pid': os.getpid(),
+            'state': 'running',
+            'channel': channel_name,
+            'channel_url': channel_url,
+            'output_dir': str(output_dir),
+            'run_id': Path(output_dir).name,
+            'started_at': now,
+            'stage': 'starting',
+            'done': 0,
+            'total': 0,
+            'last_activity_at': now,
+            'heartbeat_at': now,
+        }
+        self.status_dir.mkdir(parents=True, exist_ok=True)
+        self._flush()
+
+        self._heartbeat = threading.Thread(target=self._beat, name='status-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def stage(self, name, total=0):
+        """Record that a new pipeline stage has begun."""
+        self._update(stage=name, done=0, total=total, force=True)
+
+    def progress(self, done, total=None):
+        """Record progress within the current stage (throttled)."""
+        changes = {'done': done}
+        if total is not None:
+            changes['total'] = total
+        self._update(force=False, **changes)
+
+    def finish(self, state='completed', **extra):
+        """Mark the run finished, update latest.json and remove the live status file."""
+        if self.status is None:
+            return
+
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.join()
+
+        with self._lock:
+            now = time.time()
+            self.status.update(extra)
+            self.status.update(state=state, finished_at=now, last_activity_at=now, heartbeat_at=now)
+            try:
+                _write_json_atomic(self.status_dir / LATEST_FILENAME, self.status)
+                self.path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            self.status = None
+
+    def _update(self, force, **changes):
+        if self.status is None:
+            return
+
+        with self._lock:
+            now = time.time()
+            self.status.update(changes)
+            self.status['last_activity_at'] = now
+            if force or now - self._last_write >= PROGRESS_INTERVAL:
+                self._flush()
+
+    def _beat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with self._lock:
+                if self.status is None:
+                    return
+                self._flush()
+
+    def _flush(self):
+        now = time.time()
+        self.status['heartbeat_at'] = now
+        self._last_write = now
+        try:
+            _write_json_atomic(self.path, self.status)
+        except OSError:
+            pass  # Status is best-effort; never break the analysis over it
+
+
+def pid_alive(pid):
+    """Best-effort check that a process exists."""
+    if sys.platform == 'win32':
+        return True  # os.kill(pid, 0) would terminate the process on Windows; rely on heartbeats
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def active_runs(status_dir=STATUS_DIR):
+    """Return the status of every analyzer currently publishing, newest first."""
+    status_dir = Path(status_dir)
+    if not status_dir.exists():
+        return []
+
+    runs = []
+    now = time.time()
+    for path in status_dir.glob('[0-9]*.json'):
+        status = _read_json(path)
+        if not status:
+            continue
+        status['heartbeat_age_s'] = now - status.get('heartbeat_at', 0)
+        status['activity_age_s'] = now - status.get('last_activity_at', 0)
+        status['alive'] = pid_alive(status.get('pid', 0)) and status['heartbeat_age_s'] < HEARTBEAT_INTERVAL * 6
+        runs.append(status)
+
+    runs.sort(key=lambda s: s.get('started_at', 0), reverse=True)
+    return runs
+
+
+def latest_run(status_dir=STATUS_DIR):
+    """Return the status recorded for the most recently finished run, or None."""
+    return _read_json(Path(status_dir) / LATEST_FILENAME)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Sampling Strategies
+Choose which videos from the flat channel listing get the deep (per-video) analysis.
+
+Every strategy takes the scanned candidates ({'index', 'video', 'view_count'} dicts, in
+listing order - newest first on a channel's /videos tab) and returns the videos to
+fetch, best first:
+
+- TopKStrategy        the highest-viewed videos: top 30% (minimum 10) or a fixed k (default)
+- StratifiedStrategy  a proportional sample across view deciles × upload-date buckets
+- RecentStrategy      the newest N uploads
+- TimeBudgetStrategy  highest-viewed first until a wall-clock budget runs out
+
+Each strategy estimates its fetch cost up front and reports the estimate next to the
+actual cost once the deep analysis has run. The analyzer sets seconds_per_video to 0 when
+its extractor makes no request per video (yt-dlp without --deep).
+"""
+
+import random
+import time
+
+DEFAULT_FRACTION = 0.30
+DEFAULT_MINIMUM = 10
+DEFAULT_SECONDS_PER_VIDEO = 1.5  # A deep yt-dlp fetch: it sleeps 1-2s between requests
+
+
+def _views(candidate):
+    return candidate['view_count'] or 0
+
+
+def _by_views(candidates):
+    return sorted(candidates, key=_views, reverse=True)
+
+
+def _rank_buckets(candidates, key, buckets):
+    """Bucket number (0..buckets-1) for every candidate by its rank under `key`."""
+    ranked = sorted(range(len(candidates)), key=lambda i: key(candidates[i]))
+    assignment = [0] * len(candidates)
+    for rank, i in enumerate(ranked):
+        assignment[i] = rank * buckets // len(candidates)
+    return assignment
+
+
+class SamplingStrategy:
+    """Base class: subclasses implement select() and set `name`."""
+
+    name = ''
+
+    def __init__(self, size=None, fraction=DEFAULT_FRACTION, minimum=DEFAULT_MINIMUM,
+                 seconds_per_video=DEFAULT_SECONDS_PER_VIDEO):
+        self.size = size
+        self.fraction = fraction
+        self.minimum = minimum
+        self.seconds_per_video = seconds_per_video
+        self.selected = 0
+        self._started = None
+
+    def sample_size(self, total):
+        """Videos to select out of `total`: a fixed size, or the fraction with a minimum."""
+        if self.size is not None:
+            return min(max(self.size, 1), total)
+        return min(max(int(total * self.fraction), self.minimum), total)
+
+    def select(self, candidates):
+        raise NotImplementedError
+
+    def describe(self, total):
+        if self.size is not None:
+            return f"{self.name}, {self.selected}/{total} videos"
+        return f"{self.name}, {self.fraction:.0%} = {self.selected}/{total} videos"
+
+    def estimated_fetches(self):
+        return self.selected
+
+    def start(self):
+        """Called as the deep analysis begins."""
+        self._started = time.perf_counter()
+
+    def should_stop(self):
+        """Checked before every fetch; True ends the deep analysis early."""
+        return False
+
+    def report(self, fetched):
+        """Estimated versus actual fetch cost, for the run profile."""
+        actual_seconds = time.perf_counter() - self._started if self._started else 0.0
+        estimated = self.estimated_fetches()
+        return {
+            'strategy': self.name,
+            'selected': self.selected,
+            'estimated_fetches': estimated,
+            'estimated_seconds': round(estimated * self.seconds_per_video, 2),
+            'actual_fetches': fetched,
+            'actual_seconds': round(actual_seconds, 2),
+            'actual_seconds_per_video': round(actual_seconds / fetched, 4) if fetched else 0.0,
+        }
+
+
+class TopKStrategy(SamplingStrategy):
+    """The most-viewed videos (the original fixed top-30% cut)."""
+
+    name = 'top'
+
+    def select(self, candidates):
+        selected = _by_views(candidates)[:self.sample_size(len(candidates))]
+        self.selected = len(selected)
+        return selected
+
+
+class StratifiedStrategy(SamplingStrategy):
+    """A proportional random sample from every (view decile, upload-date bucket) cell.
+
+    Gives a picture of the whole channel - old and new, hits and misses - for the same
+    fetch cost as the top-k cut. Listing position stands in for the upload date when the
+    flat listing has none.
+    """
+
+    name = 'stratified'
+
+    def __init__(self, view_bins=10, date_bins=4, seed=42, **kwargs):
+        super().__init__(**kwargs)
+        self.view_bins = view_bins
+        self.date_bins = date_bins
+        self.seed = seed
+
+    def select(self, candidates):
+        n = self.sample_size(len(candidates))
+        if not candidates or n == 0:
+            self.selected = 0
+            return []
+
+        view_bucket = _rank_buckets(candidates, _views, self.view_bins)
+        # Newest first in the listing, so a larger index is older
+        date_bucket = _rank_buckets(
+            candidates, lambda c: (c['video'].get('upload_date') or '', -c['index']), self.date_bins)
+
+        cells = {}
+        for i, candidate in enumerate(candidates):
+            cells.setdefault((view_bucket[i], date_bucket[i]), []).append(candidate)
+
+        # Largest-remainder allocation of n across cells, proportional to cell size
+        shares = {cell: n * len(members) / len(candidates) for cell, members in cells.items()}
+        quotas = {cell: int(share) for cell, share in shares.items()}
+        leftover = n - sum(quotas.values())
+        for cell in sorted(shares, key=lambda c: shares[c] - quotas[c], reverse=True)[:leftover]:
+            quotas[cell] += 1
+
+        rng = random.Random(self.seed)
+        selected = []
+        for cell in sorted(cells):
+            selected.extend(rng.sample(cells[cell], quotas[cell]))
+
+        selected = _by_views(selected)
+        self.selected = len(selected)
+        return selected
+
+
+class RecentStrategy(SamplingStrategy):
+    """The newest uploads (upload date when the listing has it, else listing order)."""
+
+    name = 'recent'
+
+    def select(self, candidates):
+        if all(c['video'].get('upload_date') for c in candidates):
+            newest = sorted(candidates, key=lambda c: c['video']['upload_date'], reverse=True)
+        else:
+            newest = sorted(candidates, key=lambda c: c['index'])
+        selected = _by_views(newest[:self.sample_size(len(candidates))])
+        self.selected = len(selected)
+        return selected
+
+
+class TimeBudgetStrategy(SamplingStrategy):
+    """Highest-viewed first, for as long as the wall-clock budget allows."""
+
+    name = 'budget'
+
+    def __init__(self, budget_seconds, **kwargs):
+        super().__init__(**kwargs)
+        self.budget_seconds = budget_seconds
+
+    def select(self, candidates):
+        selected = _by_views(candidates)
+        if self.size is not None:
+            selected = selected[:self.size]
+        self.selected = len(selected)
+        return selected
+
+    def describe(self, total):
+        return f"{self.name}, best of {self.selected}/{total} videos within {self.budget_seconds:g}s"
+
+    def estimated_fetches(self):
+        if not self.seconds_per_video:
+            return self.selected
+        return min(self.selected, int(self.budget_seconds / self.seconds_per_video))
+
+    def should_stop(self):
+        return self._started is not None and time.perf_counter() - self._started >= self.budget_seconds
+
+
+STRATEGIES = {
+    'top': TopKStrategy,
+    'stratified': StratifiedStrategy,
+    'recent': RecentStrategy,
+    'budget': TimeBudgetStrategy,
+}
+DEFAULT_STRATEGY = 'top'
+
+
+def make_strategy(name=DEFAULT_STRATEGY, size=None, budget_seconds=None, **kwargs):
+    """Build a strategy by name; 'budget' requires budget_seconds."""
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy {name!r} (choose from {', '.join(STRATEGIES)})")
+    if name == 'budget':
+        if not budget_seconds:
+            raise ValueError("The 'budget' sampling strategy needs a time budget")
+        return TimeBudgetStrategy(budget_seconds, size=size, **kwargs)
+    return STRATEGIES[name](size=size, **kwargs)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Service Metrics
+Prometheus counters, gauges and histograms for the Flask backend.
+
+Values are aggregated in-process by prometheus_client. When PROMETHEUS_MULTIPROC_DIR is
+set (gunicorn.conf.py does this), every worker writes its samples to memory-mapped files
+in that directory and /metrics merges them, so totals stay correct across workers.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+# Stages run from milliseconds (reports) to tens of minutes (deep analysis of big channels)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600)
+
+ANALYSES_TOTAL = Counter(
+    'analyzer_analyses_total',
+    'Channel analyses finished, by outcome',
+    ['status']
+)
+ACTIVE_ANALYSES = Gauge(
+    'analyzer_active_analyses',
+    'Channel analyses currently running',
+    multiprocess_mode='livesum'
+)
+QUEUED_ANALYSES = Gauge(
+    'analyzer_queued_analyses',
+    'Channel analyses admitted and waiting for a free slot',
+    multiprocess_mode='livesum'
+)
+ANALYSES_REJECTED = Counter(
+    'analyzer_analyses_rejected_total',
+    'Analysis requests refused with 429, by reason (queue_full, client_quota)',
+    ['reason']
+)
+ANALYSIS_SECONDS = Histogram(
+    'analyzer_analysis_seconds',
+    'Wall-clock duration of a complete analysis',
+    buckets=STAGE_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    'analyzer_stage_seconds',
+    'Duration of each analyzer pipeline stage',
+    ['stage'],
+    buckets=STAGE_BUCKETS
+)
+VIDEOS_PROCESSED = Counter(
+    'analyzer_videos_processed_total',
+    'Videos deep-analysed (rate() gives videos per second)'
+)
+EXTRACTOR_ERRORS = Counter(
+    'analyzer_extractor_errors_total',
+    'Videos that failed during extraction'
+)
+NETWORK_REQUESTS = Counter(
+    'analyzer_network_requests_total',
+    'HTTP requests made by the extractor'
+)
+NETWORK_BYTES = Counter(
+    'analyzer_network_bytes_total',
+    'Response bytes received by the extractor'
+)
+SSE_CLIENTS = Gauge(
+    'analyzer_sse_clients',
+    'Clients currently connected to a progress stream',
+    multiprocess_mode='livesum'
+)
+
+
+def observe_profile(profile):
+    """Feed a finished run's run_profile.json into the pipeline metrics."""
+    if not profile:
+        return
+
+    for stage in profile.get('stages', []):
+        STAGE_SECONDS.labels(stage=stage['name']).observe(stage['seconds'])
+
+    videos = profile.get('videos', {})
+    VIDEOS_PROCESSED.inc(videos.get('count', 0))
+    EXTRACTOR_ERRORS.inc(videos.get('errors', 0))
+
+    network = profile.get('network', {})
+    NETWORK_REQUESTS.inc(network.get('requests', 0))
+    NETWORK_BYTES.inc(network.get('bytes', 0))
+
+
+def render_metrics():
+    """Return (body, content_type) for the /metrics endpoint."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    from prometheus_client import REGISTRY
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+SSE Stream
+Server-sent event plumbing for the web backend's long-running jobs. A producer thread
+reports log lines, progress and one-off events; the response generator turns them into
+few, small frames instead of one frame per stdout line:
+
+- log lines are coalesced into time-bucketed batches: one 'logs' event per LOG_BATCH_SECONDS
+  (or per MAX_BATCH_LINES lines)
+- progress is throttled to one 'progress' event per PROGRESS_INTERVAL, always ending on
+  the latest value
+- other events (interim, complete, error) flush what is pending first and go out at once,
+  so the order clients see is the order things happened
+- the client picks a verbosity: 'quiet' (no log lines), 'normal' (without per-video
+  progress chatter, which the progress events already carry) or 'verbose' (every line)
+- frames can be gzip-compressed, flushed after every frame so nothing waits in the
+  compressor
+
+    events = EventQueue()
+    threading.Thread(target=job, args=(events,)).start()   # events.log(...), events.close()
+    return Response(encode_events(coalesce(events, 'normal'), compress=True), ...)
+"""
+
+import json
+import queue
+import time
+
+LOG_BATCH_SECONDS = 0.25
+MAX_BATCH_LINES = 200
+PROGRESS_INTERVAL = 0.5
+VERBOSITY_LEVELS = ('quiet', 'normal', 'verbose')
+CHATTER_MARKERS = ('⚡ Progress:', '⚡ Scanned:')  # Lines 'normal' leaves to the progress events
+
+_END = object()
+
+
+class EventQueue:
+    """Thread-safe hand-off from a job to its SSE response."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self.closed = False  # Set once the client has gone: later items are dropped
+
+    def log(self, line):
+        if not self.closed:
+            self._queue.put(('log', line))
+
+    def progress(self, percent):
+        if not self.closed:
+            self._queue.put(('progress', percent))
+
+    def event(self, event):
+        if not self.closed:
+            self._queue.put(('event', event))
+
+    def close(self):
+        """No more items: the response finishes once it has flushed what is pending."""
+        self._queue.put(_END)
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def _wanted(line, verbosity):
+    if verbosity == 'verbose':
+        return True
+    return verbosity == 'normal' and line.strip() != '' and not any(m in line for m in CHATTER_MARKERS)
+
+
+def coalesce(events, verbosity='normal', log_interval=LOG_BATCH_SECONDS,
+             progress_interval=PROGRESS_INTERVAL, max_lines=MAX_BATCH_LINES):
+    """Event dicts for the client from an EventQueue, batched and throttled (see module docs)."""
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"verbosity must be one of: {', '.join(VERBOSITY_LEVELS)}")
+
+    lines = []
+    log_deadline = None
+    progress = None  # Latest value not sent yet
+    progress_sent = float('-inf')
+    try:
+        while True:
+            deadlines = [d for d in (log_deadline, progress is not None and progress_sent + progress_interval) if d]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            item = events.get(timeout)
+            now = time.monotonic()
+
+            if item is _END or (item and item[0] == 'event'):
+                if lines:
+                    yield {'type': 'logs', 'messages': lines}
+                    lines, log_deadline = [], None
+                if progress is not None:
+                    yield {'type': 'progress', 'percent': progress}
+                    progress, progress_sent = None, now
+                if item is _END:
+                    return
+                yield item[1]
+                continue
+
+            if item and item[0] == 'log' and _wanted(item[1], verbosity):
+                lines.append(item[1])
+                log_deadline = log_deadline or now + log_interval
+            elif item and item[0] == 'progress':
+                progress = item[1]
+
+            if lines and (now >= log_deadline or len(lines) >= max_lines):
+                yield {'type': 'logs', 'messages': lines}
+                lines, log_deadline = [], None
+            if progress is not None and now >= progress_sent + progress_interval:
+                yield {'type': 'progress', 'percent': progress}
+                progress, progress_sent = None, now
+    finally:
+        events.closed = True
+
+
+def encode_events(events, compress=False):
+    """SSE frames (bytes) for event dicts; gzip-compressed as one stream when compress is set."""
+    # Deferred: only compressed streams need zlib
+    import zlib
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip framing
+    for event in events:
+        frame = f"data: {json.dumps(event)}\n\n".encode()
+        if compressor:
+            frame = compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield frame
+    if compressor:
+        yield compressor.flush()
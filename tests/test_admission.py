@@ -0,0 +1,121 @@
+"""Admission control: limits, refusals, queue events, and a queue shared between workers."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import admission
+from admission import AdmissionQueue, Rejected, limits_from_env
+from sse_stream import EventQueue
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _events(queue):
+    items = []
+    while (item := queue.get(0)) is not None:
+        items.append(item[1])
+    return [item for item in items if isinstance(item, dict)]
+
+
+@pytest.fixture
+def gate():
+    gate = threading.Event()
+    yield gate
+    gate.set()  # Let blocked jobs finish
+
+
+def test_client_quota_is_refused_with_retry_after(gate):
+    queue = AdmissionQueue(concurrency=2, max_queued=2, per_client=1, update_interval=0.05)
+    queue.submit('alice', gate.wait, EventQueue())
+
+    with pytest.raises(Rejected) as refused:
+        queue.submit('alice', gate.wait, EventQueue())
+    assert refused.value.reason == 'client_quota'
+    assert refused.value.retry_after == admission.DEFAULT_JOB_SECONDS  # Until alice's job should end
+    queue.submit('bob', gate.wait, EventQueue())  # Other clients are unaffected
+
+
+def test_full_queue_is_refused_and_waiting_jobs_start_in_order(gate):
+    queue = AdmissionQueue(concurrency=1, max_queued=1, per_client=1, update_interval=0.05)
+    first, second = EventQueue(), EventQueue()
+    queue.submit('a', gate.wait, first)
+    queue.submit('b', lambda: None, second)
+
+    with pytest.raises(Rejected) as refused:
+        queue.submit('c', lambda: None, EventQueue())
+    assert refused.value.reason == 'queue_full'
+    assert refused.value.retry_after >= 1
+    assert queue.stats()['running'] == 1 and queue.stats()['queued'] == 1
+
+    assert _events(first)[0]['type'] == 'started'
+    queued = _events(second)
+    assert queued[0]['type'] == 'queued' and queued[0]['position'] == 1
+
+    gate.set()
+    _wait_for(lambda: queue.stats()['running'] == 0)
+    assert [e['type'] for e in _events(second) if e['type'] != 'queued'] == ['started']
+
+
+def test_disconnected_client_leaves_the_queue(gate):
+    queue = AdmissionQueue(concurrency=1, max_queued=1, per_client=1, update_interval=0.05)
+    ran = threading.Event()
+    queue.submit('a', gate.wait, EventQueue())
+    waiting = EventQueue()
+    queue.submit('b', ran.set, waiting)
+
+    waiting.closed = True  # The client went away
+    queue.submit('c', lambda: None, EventQueue())  # Its place is free again
+    gate.set()
+    _wait_for(lambda: queue.stats()['running'] == 0 and queue.stats()['queued'] == 0)
+    assert not ran.is_set()
+
+
+def test_limits_hold_across_workers_sharing_a_queue(tmp_path, gate):
+    path = tmp_path / 'admission.sqlite3'
+    worker_1 = AdmissionQueue(concurrency=1, max_queued=1, per_client=1, update_interval=0.05, path=path)
+    worker_2 = AdmissionQueue(concurrency=1, max_queued=1, per_client=1, update_interval=0.05, path=path)
+    started = threading.Event()
+
+    worker_1.submit('a', gate.wait, EventQueue())
+    with pytest.raises(Rejected) as refused:
+        worker_2.submit('a', lambda: None, EventQueue())
+    assert refused.value.reason == 'client_quota'
+
+    worker_2.submit('b', started.set, EventQueue())
+    with pytest.raises(Rejected) as refused:
+        worker_1.submit('c', lambda: None, EventQueue())
+    assert refused.value.reason == 'queue_full'
+    assert worker_1.stats()['queued'] == worker_2.stats()['queued'] == 1
+
+    gate.set()  # Worker 1's job ends: worker 2 starts its own on its next poll
+    assert started.wait(5)
+
+
+def test_jobs_of_a_dead_worker_expire(tmp_path, monkeypatch):
+    monkeypatch.setattr(admission, 'STALE_SECONDS', 0.2)
+    path = tmp_path / 'admission.sqlite3'
+    queue = AdmissionQueue(concurrency=1, max_queued=0, per_client=1, path=path)
+    queue.stats()  # Creates the tables
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO jobs (owner, client, submitted, started, seen) VALUES (1, 'x', ?, ?, ?)",
+                     (time.time(),) * 3)
+
+    with pytest.raises(Rejected):
+        queue.submit('a', lambda: None, EventQueue())
+    time.sleep(0.3)
+    queue.submit('a', lambda: None, EventQueue())
+
+
+def test_limits_are_read_from_the_environment():
+    assert limits_from_env({}) == (2, 8, 1)
+    assert limits_from_env({'ANALYZE_CONCURRENCY': '4', 'ANALYZE_QUEUE_SIZE': '0'}) == (4, 0, 1)
+    with pytest.raises(ValueError):
+        AdmissionQueue(concurrency=0)
@@ -0,0 +1,71 @@
+"""Anytime mode: interim reports appear during the deep analysis, and a budget stops it early."""
+
+import json
+import time
+
+from sampling import TimeBudgetStrategy, TopKStrategy
+from youtube_success_analyzer import INTERIM_FILENAME, YouTubeSuccessAnalyzer
+
+URL = 'https://www.youtube.com/@standin'
+
+
+class _Extractor:
+    """In-process stand-in: a flat listing, and a per-video fetch that takes `seconds`."""
+
+    per_video_requests = True
+    profiler = None
+    fields = None
+
+    def __init__(self, videos, seconds=0.0):
+        self.entries = [{'id': f"vid{i:03d}", 'title': f"Video {i}", 'url': f"https://youtu.be/vid{i:03d}",
+                         'view_count': 1000 * (videos - i)} for i in range(videos)]
+        self.seconds = seconds
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def list_channel(self, channel_url):
+        return [dict(entry) for entry in self.entries]
+
+    def fetch_video(self, entry):
+        time.sleep(self.seconds)
+        return {**entry, 'like_count': entry['view_count'] // 20, 'comment_count': 3,
+                'duration': 300, 'upload_date': '20250101'}
+
+
+def test_checkpoints_write_interim_reports_that_the_final_run_replaces(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = YouTubeSuccessAnalyzer(extractor=_Extractor(40), sampler=TopKStrategy(size=10),
+                                      anytime=True, checkpoint_interval=0)
+    checkpoints = []
+    write_interim = analyzer.write_interim_reports
+
+    def record(selected, total_videos):
+        write_interim(selected, total_videos)
+        checkpoints.append(json.loads((analyzer.output_dir / INTERIM_FILENAME).read_text()))
+    analyzer.write_interim_reports = record
+
+    analyzer.run_complete_analysis(channel_url=URL, offer_open=False)
+
+    assert [c['videos_analyzed'] for c in checkpoints] == list(range(1, 11))
+    assert checkpoints[-1]['top_videos'][0]['title'] == 'Video 0'
+    run_dir = analyzer.output_dir
+    assert not (run_dir / INTERIM_FILENAME).exists()
+    assert 'Interim results' not in (run_dir / '00_MASTER_SUMMARY.md').read_text(encoding='utf-8')
+
+
+def test_time_budget_stops_the_deep_analysis_best_first(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = YouTubeSuccessAnalyzer(extractor=_Extractor(100, seconds=0.02),
+                                      sampler=TimeBudgetStrategy(budget_seconds=0.3), anytime=True)
+    analyzer.run_complete_analysis(channel_url=URL, offer_open=False)
+
+    analysed = [video['video_id'] for video in analyzer.video_data]
+    assert 0 < len(analysed) < 100
+    assert analysed == [f"vid{i:03d}" for i in range(len(analysed))]  # Most viewed first
+    profile = json.loads((analyzer.output_dir / 'run_profile.json').read_text())
+    assert profile['sampling']['actual_fetches'] == len(analysed)
+    assert (analyzer.output_dir / '00_MASTER_SUMMARY.md').exists()
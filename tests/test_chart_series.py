@@ -0,0 +1,53 @@
+"""Chart series: downsampled indices stay inside the series and keep its shape."""
+
+import numpy as np
+import pytest
+
+from chart_series import downsample, lttb, min_max
+
+SHAPES = [(10, 4), (11, 3), (365, 5), (1001, 7), (1001, 500)]  # (days, target points)
+
+
+def _series(days, width=3, seed=0):
+    values = np.random.default_rng(seed).poisson(100, size=(days, width)).astype(float)
+    values[days // 3, 0] = 10_000  # A spike in the first series
+    return values
+
+
+@pytest.mark.parametrize('days,target', SHAPES)
+def test_lttb_keeps_the_ends_and_one_point_per_bucket(days, target):
+    selected = lttb(_series(days), target)
+    assert selected.shape == (target, 3)
+    assert (selected[0] == 0).all() and (selected[-1] == days - 1).all()
+    assert (np.diff(selected, axis=0) > 0).all()  # Strictly increasing, so inside [0, days)
+
+
+@pytest.mark.parametrize('days,target', SHAPES)
+def test_min_max_stays_in_range_and_keeps_extremes(days, target):
+    values = _series(days)
+    selected = min_max(values, target)
+    assert selected.shape[0] <= target
+    assert selected.min() >= 0 and selected.max() < days
+    for column in range(values.shape[1]):
+        kept = values[selected[:, column], column]
+        assert kept.max() == values[:, column].max()
+        assert kept.min() == values[:, column].min()
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_short_series_are_kept_whole(method):
+    values = _series(5)
+    assert [row.tolist() for row in downsample(values, 500, method)] == [list(range(5))] * 3
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_returns_sorted_unique_days(method):
+    values = np.zeros((1000, 2))  # Flat: min and max of a bucket are the same day
+    for row in downsample(values, 50, method):
+        assert (np.diff(row) > 0).all()
+        assert row[0] >= 0 and row[-1] < 1000
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        downsample(_series(10), 5, 'mean')
@@ -0,0 +1,70 @@
+"""Streaming export parser: chunked uploads parse exactly like the whole file."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from export_stream import ExportStreamParser, frames_from_parsers
+
+CHART = (
+    'Date,Content,Video title,Video publish time,Duration,Views\n'
+    '2025-10-01,vid_a,"Intro, part 1",Oct 1 2025,120,10\n'
+    '2025-10-01,vid_b,"A title with a\nline break",Oct 1 2025,300,5\n'
+    '"Oct 2, 2025",vid_a,"Intro, part 1",Oct 1 2025,120,7\n'
+    '2025-10-02,vid_c,Third video,Oct 2 2025,,3\n'
+    '2025-10-03,vid_b,"A title with a\nline break",Oct 1 2025,300,1\n'
+)
+TOTALS = 'Date,Views\n2025-10-01,15\n2025-10-02,10\n2025-10-03,1\n'
+TABLE = ('Content,Video title,Video publish time,Duration,Views,Average view duration\n'
+         'Total,,,,26,\nvid_a,"Intro, part 1",Oct 1 2025,120,17,0:00:40\n')
+
+
+def _parse(text, chunk=None, batch_bytes=64):
+    parser = ExportStreamParser(batch_bytes=batch_bytes)
+    data = ('﻿' + text).encode('utf-8')  # Studio exports start with a BOM
+    chunk = chunk or len(data)
+    for start in range(0, len(data), chunk):
+        parser.write(data[start:start + chunk])
+    return parser.finish()
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 50, None])
+def test_chunked_chart_upload_matches_whole_file(chunk):
+    whole_chart, whole_videos = _parse(CHART, batch_bytes=1 << 20).chart_frame()
+    chart, videos = _parse(CHART, chunk).chart_frame()
+    pd.testing.assert_frame_equal(chart, whole_chart)
+    pd.testing.assert_frame_equal(videos, whole_videos)
+
+
+def test_chart_rows_refer_to_each_video_once():
+    parser = _parse(CHART, 7)
+    chart, videos = parser.chart_frame()
+    assert parser.kind == 'chart' and parser.rows == 5
+    assert videos['Content'].tolist() == ['vid_a', 'vid_b', 'vid_c']  # In order of first appearance
+    assert videos['Video title'].tolist() == ['Intro, part 1', 'A title with a\nline break', 'Third video']
+    assert chart['video_code'].tolist() == [0, 1, 0, 2, 1]
+    assert chart['Views'].tolist() == [10, 5, 7, 3, 1]
+    assert chart['Date'].dt.strftime('%Y-%m-%d').tolist() == [
+        '2025-10-01', '2025-10-01', '2025-10-02', '2025-10-02', '2025-10-03']
+
+
+def test_kind_comes_from_the_header():
+    assert [_parse(text).kind for text in (TOTALS, CHART, TABLE)] == ['totals', 'chart', 'table']
+    reference = pd.read_csv(io.StringIO(TABLE))
+    pd.testing.assert_frame_equal(_parse(TABLE).table_frame(), reference)
+
+
+@pytest.mark.parametrize('text', ['', 'Name,Value\nx,1\n'])
+def test_other_uploads_are_refused(text):
+    with pytest.raises(ValueError):
+        _parse(text)
+
+
+def test_frames_need_one_totals_or_chart_export():
+    frames = frames_from_parsers([_parse(TOTALS), _parse(CHART), _parse(TABLE)])
+    assert sorted(frames) == ['chart_df', 'table_df', 'totals_df', 'videos_df']
+    with pytest.raises(ValueError):
+        frames_from_parsers([_parse(TABLE)])
+    with pytest.raises(ValueError):
+        frames_from_parsers([_parse(CHART), _parse(CHART)])
@@ -0,0 +1,54 @@
+"""Growth store: video keys are per channel name."""
+
+import sqlite3
+from contextlib import closing
+
+from growth_store import GrowthStore
+
+DAY = 86400
+
+
+def test_same_video_under_two_channel_names(tmp_path):
+    # One channel reached as @handle and as /channel/UC... gets two channel keys
+    store = GrowthStore(tmp_path / 'growth.sqlite3')
+    video = {'video_id': 'abc123', 'title': 'Video', 'view_count': 100, 'like_count': 5, 'comment_count': 1}
+
+    assert store.record_snapshot('handle', [video], ts=DAY) == 1
+    assert store.record_snapshot('UCchannel', [video], ts=DAY) == 1
+    assert store.record_snapshot('handle', [{**video, 'view_count': 150}], ts=2 * DAY) == 1
+    assert store.record_snapshot('UCchannel', [{**video, 'view_count': 130}], ts=2 * DAY) == 1
+
+    assert [r['views_gained'] for r in store.views_gained(0, channel='handle')] == [50]
+    assert [r['views_gained'] for r in store.views_gained(0, channel='UCchannel')] == [30]
+
+
+def test_store_with_global_video_ids_is_migrated(tmp_path):
+    path = tmp_path / 'growth.sqlite3'
+    store = GrowthStore(path)
+    store.record_snapshot('handle', [{'video_id': 'abc123', 'view_count': 100}], ts=DAY)
+    # Recreate the videos table as it was before keys were per channel
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript("""
+            ALTER TABLE videos RENAME TO videos_current;
+            CREATE TABLE videos (key INTEGER PRIMARY KEY, channel TEXT NOT NULL,
+                                 video_id TEXT NOT NULL UNIQUE, title TEXT, first_ts INTEGER NOT NULL);
+            INSERT INTO videos SELECT * FROM videos_current;
+            DROP TABLE videos_current;
+        """)
+
+    store = GrowthStore(path)
+    store.record_snapshot('UCchannel', [{'video_id': 'abc123', 'view_count': 100}], ts=DAY)
+    store.record_snapshot('handle', [{'video_id': 'abc123', 'view_count': 160}], ts=2 * DAY)
+    assert [r['views_gained'] for r in store.views_gained(0, channel='handle')] == [60]
+
+
+def test_history_keeps_channels_apart(tmp_path):
+    store = GrowthStore(tmp_path / 'growth.sqlite3')
+    store.record_snapshot('handle', [{'video_id': 'abc123', 'view_count': 100}], ts=DAY)
+    store.record_snapshot('UCchannel', [{'video_id': 'abc123', 'view_count': 200}], ts=DAY)
+    store.record_snapshot('handle', [{'video_id': 'abc123', 'view_count': 150}], ts=2 * DAY)
+    store.record_snapshot('UCchannel', [{'video_id': 'abc123', 'view_count': 250}], ts=2 * DAY)
+
+    assert [r['views'] for r in store.history('handle', 'abc123')] == [100, 150]
+    assert [r['views'] for r in store.history('UCchannel', 'abc123')] == [200, 250]
+    assert store.history('other', 'abc123') == []
@@ -0,0 +1,72 @@
+"""Report downloads: artefacts resolve only inside their run; copies and bundles are reused."""
+
+import gzip
+import os
+
+import pytest
+
+from report_downloads import compressed_copy, list_artefacts, resolve_artefact, run_bundle
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    run_dir = tmp_path / 'analysis' / 'channel' / '20260101_000000'
+    (run_dir / 'prompts').mkdir(parents=True)
+    (run_dir / '00_MASTER_SUMMARY.md').write_text('# Summary\n' * 500)
+    (run_dir / 'prompts' / 'master.txt').write_text('prompt')
+    (run_dir / '.hidden').write_text('secret')
+    (tmp_path / 'analysis' / 'secret.txt').write_text('outside the run')
+    return run_dir
+
+
+def test_artefacts_resolve_inside_the_run(run_dir):
+    assert resolve_artefact(run_dir, '00_MASTER_SUMMARY.md') == (run_dir / '00_MASTER_SUMMARY.md').resolve()
+    assert resolve_artefact(run_dir, 'prompts/master.txt') == (run_dir / 'prompts' / 'master.txt').resolve()
+
+
+@pytest.mark.parametrize('name', [
+    '', '../../secret.txt', '../20260101_000000/../../secret.txt', '/etc/passwd',
+    '.hidden', 'prompts', 'missing.md', 'prompts/../../../secret.txt',
+])
+def test_paths_outside_the_run_hidden_or_missing_are_refused(run_dir, name):
+    assert resolve_artefact(run_dir, name) is None
+
+
+def test_symlinks_out_of_the_run_are_refused(run_dir):
+    os.symlink(run_dir.parent.parent / 'secret.txt', run_dir / 'link.txt')
+    assert resolve_artefact(run_dir, 'link.txt') is None
+
+
+def test_listing_skips_hidden_files(run_dir):
+    assert [a['name'] for a in list_artefacts(run_dir)] == ['00_MASTER_SUMMARY.md', 'prompts/master.txt']
+
+
+def test_compressed_copy_is_made_once_per_version(run_dir, tmp_path):
+    source = run_dir / '00_MASTER_SUMMARY.md'
+    cache = tmp_path / 'cache'
+    first = compressed_copy(source, 'gzip', cache)
+    assert gzip.decompress(first.read_bytes()) == source.read_bytes()
+    assert compressed_copy(source, 'gzip', cache) == first
+
+    source.write_text('# Changed\n' * 500)
+    os.utime(source, (first.stat().st_mtime + 10,) * 2)
+    second = compressed_copy(source, 'gzip', cache)
+    assert second != first and not first.exists()
+    assert [p.name for p in cache.iterdir()] == [second.name]
+
+
+def test_bundle_is_rebuilt_only_when_the_run_changes(run_dir):
+    archive = run_bundle(run_dir)
+    built = archive.stat().st_mtime_ns
+    assert run_bundle(run_dir).stat().st_mtime_ns == built
+
+    report = run_dir / '00_MASTER_SUMMARY.md'
+    os.utime(report, (archive.stat().st_mtime + 10,) * 2)
+    assert run_bundle(run_dir).stat().st_mtime_ns != built
+
+
+def test_unpublished_runs_are_not_bundled(run_dir):
+    staging = run_dir.with_name('.20260102_000000.partial')
+    staging.mkdir()
+    with pytest.raises(ValueError):
+        run_bundle(staging)
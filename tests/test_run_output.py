@@ -0,0 +1,77 @@
+"""Run output: staged runs appear only when published; unfinished ones are marked or discarded."""
+
+import json
+import os
+import time
+import zipfile
+
+from run_output import (FAILED_MARKER, RunOutput, is_failed, is_staging, sweep_stale_staging,
+                        write_archive)
+
+
+def test_run_is_invisible_until_published(tmp_path):
+    output = RunOutput(tmp_path / 'channel' / '20260101_000000', sync=False)
+    staging = output.open()
+    (staging / 'report.md').write_text('# Report')
+
+    assert is_staging(staging)
+    assert not output.final_dir.exists()
+
+    final_dir = output.publish()
+    assert output.published
+    assert (final_dir / 'report.md').read_text() == '# Report'
+    assert not staging.exists()
+
+
+def test_runs_in_the_same_second_do_not_merge(tmp_path):
+    final_dir = tmp_path / 'channel' / '20260101_000000'
+    first, second = RunOutput(final_dir, sync=False), RunOutput(final_dir, sync=False)
+    first.open()
+    assert first.publish() == final_dir
+    second.open()
+    assert second.publish() == final_dir.with_name('20260101_000000_2')
+
+
+def test_failed_run_is_published_with_a_marker(tmp_path):
+    output = RunOutput(tmp_path / 'channel' / '20260101_000000', sync=False)
+    (output.open() / 'run_profile.json').write_text('{}')
+
+    final_dir = output.publish_failed('cancelled', error='interrupted')
+    assert is_failed(final_dir)
+    marker = json.loads((final_dir / FAILED_MARKER).read_text())
+    assert (marker['state'], marker['error']) == ('cancelled', 'interrupted')
+
+
+def test_empty_failed_run_is_discarded(tmp_path):
+    output = RunOutput(tmp_path / 'channel' / '20260101_000000', sync=False)
+    output.open()
+
+    assert output.publish_failed('failed', error='no videos') is None
+    assert not output.published
+    assert list((tmp_path / 'channel').iterdir()) == []
+
+
+def test_only_stale_staging_dirs_are_swept(tmp_path):
+    stale = tmp_path / '.20250101_000000.partial'
+    fresh = tmp_path / '.20260101_000000.partial'
+    published = tmp_path / '20250101_000000'
+    for path in (stale, fresh, published):
+        path.mkdir()
+    day_old = time.time() - 2 * 24 * 3600
+    os.utime(stale, (day_old, day_old))
+    os.utime(published, (day_old, day_old))
+
+    assert sweep_stale_staging(tmp_path) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [fresh.name, published.name]
+
+
+def test_archive_holds_the_run_and_leaves_no_partial_file(tmp_path):
+    run_dir = tmp_path / 'channel' / '20260101_000000'
+    (run_dir / 'prompts').mkdir(parents=True)
+    (run_dir / 'report.md').write_text('# Report')
+    (run_dir / 'prompts' / 'master.txt').write_text('prompt')
+
+    archive = write_archive(run_dir, 'zip')
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == ['20260101_000000/prompts/master.txt', '20260101_000000/report.md']
+    assert sorted(p.name for p in run_dir.parent.iterdir()) == ['20260101_000000', '20260101_000000.zip']
@@ -0,0 +1,77 @@
+"""SSE stream: log lines are batched, progress throttled, and events keep their order."""
+
+import json
+import zlib
+
+import pytest
+
+from sse_stream import EventQueue, coalesce, encode_events
+
+
+def _queue(*items):
+    events = EventQueue()
+    for kind, value in items:
+        getattr(events, kind)(value)
+    events.close()
+    return events
+
+
+def test_events_flush_pending_logs_and_progress_first():
+    events = _queue(('log', 'one'), ('progress', 10), ('log', 'two'), ('progress', 20),
+                    ('event', {'type': 'interim'}), ('log', 'three'), ('event', {'type': 'complete'}))
+    assert list(coalesce(events, log_interval=60, progress_interval=60)) == [
+        {'type': 'progress', 'percent': 10},  # The first progress value is never held back
+        {'type': 'logs', 'messages': ['one', 'two']},
+        {'type': 'progress', 'percent': 20},
+        {'type': 'interim'},
+        {'type': 'logs', 'messages': ['three']},
+        {'type': 'complete'},
+    ]
+
+
+def test_batches_are_capped_at_max_lines():
+    events = _queue(*[('log', f"line {i}") for i in range(5)])
+    batches = [e['messages'] for e in coalesce(events, log_interval=60, max_lines=2)]
+    assert batches == [['line 0', 'line 1'], ['line 2', 'line 3'], ['line 4']]
+
+
+def test_progress_is_throttled_to_the_latest_value():
+    events = _queue(*[('progress', p) for p in range(1, 51)])
+    sent = [e['percent'] for e in coalesce(events, progress_interval=60)]
+    assert sent[-1] == 50
+    assert len(sent) <= 2  # The first value, then the latest when the stream ends
+
+
+@pytest.mark.parametrize('verbosity,expected', [
+    ('quiet', []),
+    ('normal', ['Found 10 videos']),
+    ('verbose', ['Found 10 videos', '      ⚡ Progress: 5/10 (50%)', '']),
+])
+def test_verbosity_filters_log_lines(verbosity, expected):
+    events = _queue(('log', 'Found 10 videos'), ('log', '      ⚡ Progress: 5/10 (50%)'), ('log', ''))
+    lines = [line for e in coalesce(events, verbosity, log_interval=60) if e['type'] == 'logs'
+             for line in e['messages']]
+    assert lines == expected
+
+
+def test_closing_the_stream_marks_the_queue_closed():
+    events = EventQueue()
+    stream = coalesce(events)
+    events.event({'type': 'queued'})
+    assert next(stream) == {'type': 'queued'}
+    stream.close()  # The client went away
+    assert events.closed
+    events.log('dropped')
+    assert events.get(0) is None
+
+
+def test_unknown_verbosity_is_rejected():
+    with pytest.raises(ValueError):
+        next(coalesce(_queue(), 'loud'))
+
+
+def test_compressed_frames_decode_to_the_plain_stream():
+    stream = [{'type': 'logs', 'messages': ['a']}, {'type': 'complete'}]
+    plain = b''.join(encode_events(stream))
+    assert plain == b''.join(f"data: {json.dumps(e)}\n\n".encode() for e in stream)
+    assert zlib.decompress(b''.join(encode_events(stream, compress=True)), 31) == plain
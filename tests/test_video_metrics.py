@@ -0,0 +1,24 @@
+"""Video metrics: display formatting matches the original strptime-based output."""
+
+from datetime import datetime
+
+from video_metrics import format_rows
+
+
+def _strptime_format(upload_date):
+    try:
+        return datetime.strptime(upload_date, '%Y%m%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return upload_date
+
+
+def test_upload_dates_are_formatted_like_strptime():
+    dates = ['20230115', '20231231', '20240229', '20230229', '20230230', '20230431',
+             '20231301', '20230100', '2023011', 'not-a-date']
+    rows = format_rows([{'upload_date': date} for date in dates])
+    assert [row['upload_date_formatted'] for row in rows] == [_strptime_format(d) for d in dates]
+    assert rows[4]['upload_date_formatted'] == '20230230'
+
+
+def test_missing_upload_date_is_unknown():
+    assert format_rows([{'upload_date': None}])[0]['upload_date_formatted'] == 'Unknown'
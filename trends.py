@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Trend Engine
+Rolling-window view trends for YouTubePerformanceAuditor, computed from cumulative sums so
+every window costs O(1) per day (or per video) however many years the export covers:
+
+- moving averages (7 and 28 days by default)
+- week-over-week growth
+- per-video view velocity and peak days
+- summaries of any date range, cached per range
+- chart series (daily, cumulative or 7-day mean views) for any range and set of videos
+
+Daily views are laid out on a dense calendar (days missing from the export count as zero
+views): one channel series plus a Date × Video matrix whose columns are the auditor's
+integer video codes.
+
+    trends = TrendEngine.from_frames(auditor.totals_df, auditor.chart_df, len(auditor.videos_df))
+    trends.summary('2025-09-01', '2025-09-30')
+"""
+
+import numpy as np
+
+SHORT_WINDOW = 7
+LONG_WINDOW = 28
+SERIES_METRICS = ('daily', 'cumulative', 'avg7')
+
+
+def _prefix_sums(values):
+    """Cumulative sums with a leading zero row, so sum(values[i:j]) == out[j] - out[i]."""
+    out = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.int64)
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+def _day_index(dates, start):
+    return (dates.to_numpy().astype('datetime64[D]') - start).astype(np.int64)
+
+
+class TrendEngine:
+    """Cumulative-sum trend queries over a channel's daily views."""
+
+    def __init__(self, dates, channel_views, video_views=None):
+        self.dates = dates                    # Contiguous datetime64[D] calendar
+        self.daily = channel_views            # Views per day
+        self.video_daily = video_views        # Days × videos, or None without Chart data
+        self.cumulative = _prefix_sums(channel_views)
+        self.active = _prefix_sums((channel_views > 0).astype(np.int64))
+        self.video_cumulative = _prefix_sums(video_views) if video_views is not None else None
+        self._averages = {}
+        self._growth = None
+        self._summaries = {}
+
+    @classmethod
+    def from_frames(cls, totals_df=None, chart_df=None, videos=0):
+        """Build from the auditor's Totals and Chart frames (chart_df needs 'video_code')."""
+        frames = [df for df in (totals_df, chart_df) if df is not None and len(df)]
+        if not frames:
+            raise ValueError("No daily views to build trends from")
+
+        start = min(df['Date'].min() for df in frames).to_datetime64().astype('datetime64[D]')
+        end = max(df['Date'].max() for df in frames).to_datetime64().astype('datetime64[D]')
+        dates = np.arange(start, end + 1, dtype='datetime64[D]')
+        days = len(dates)
+
+        video_views = None
+        if chart_df is not None and len(chart_df) and videos:
+            # One bincount lays the long-format rows out as the dense Date × Video matrix
+            cells = _day_index(chart_df['Date'], start) * videos + chart_df['video_code'].to_numpy()
+            weights = chart_df['Views'].fillna(0).to_numpy(dtype=np.float64)
+            video_views = np.bincount(cells, weights=weights, minlength=days * videos)
+            video_views = video_views.astype(np.int64).reshape(days, videos)
+
+        if totals_df is not None and len(totals_df):
+            channel_views = np.bincount(_day_index(totals_df['Date'], start),
+                                        weights=totals_df['Views'].fillna(0).to_numpy(dtype=np.float64),
+                                        minlength=days).astype(np.int64)
+        else:
+            channel_views = video_views.sum(axis=1)
+
+        return cls(dates, channel_views, video_views)
+
+    def _range(self, start=None, end=None):
+        """Half-open day indices [i, j) covering start..end inclusive (None = open-ended)."""
+        i = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'D'), 'left'))
+        j = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'D'), 'right'))
+        return i, max(i, j)
+
+    def window_sum(self, i, j):
+        return int(self.cumulative[j] - self.cumulative[i])
+
+    def moving_average(self, window=SHORT_WINDOW):
+        """Trailing `window`-day mean for every day (shorter at the start of the export)."""
+        if window not in self._averages:
+            ends = np.arange(1, len(self.dates) + 1)
+            starts = np.maximum(ends - window, 0)
+            self._averages[window] = (self.cumulative[ends] - self.cumulative[starts]) / (ends - starts)
+        return self._averages[window]
+
+    def rolling_sum(self, window=SHORT_WINDOW):
+        """Sum of every complete `window`-day span, indexed by the span's first day."""
+        return self.cumulative[window:] - self.cumulative[:-window]
+
+    def week_over_week(self):
+        """Growth (%) of each trailing 7 days over the 7 before; NaN for the first 13 days."""
+        if self._growth is None:
+            growth = np.full(len(self.dates), np.nan)
+            weeks = self.rolling_sum(SHORT_WINDOW)
+            if len(weeks) > SHORT_WINDOW:
+                this_week, last_week = weeks[SHORT_WINDOW:], weeks[:-SHORT_WINDOW]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    growth[2 * SHORT_WINDOW - 1:] = np.where(
+                        last_week > 0, (this_week - last_week) / last_week * 100, np.nan)
+            self._growth = growth
+        return self._growth
+
+    def video_velocity(self, start=None, end=None):
+        """Average views per day of every video over the range, indexed by video code."""
+        if self.video_cumulative is None:
+            return None
+        i, j = self._range(start, end)
+        return (self.video_cumulative[j] - self.video_cumulative[i]) / max(j - i, 1)
+
+    def recent_velocity(self, days=SHORT_WINDOW):
+        """Views per day of every video over the last `days` days of the export."""
+        if self.video_cumulative is None:
+            return None
+        i = max(len(self.dates) - days, 0)
+        return (self.video_cumulative[-1] - self.video_cumulative[i]) / (len(self.dates) - i)
+
+    def series(self, metric='daily', start=None, end=None, videos=None):
+        """(dates, values) over a date range for charts: days × 1 for the channel, or days × videos.
+
+        metric is 'daily' views, 'cumulative' views since the start of the export or 'avg7' (the
+        trailing 7-day mean); videos is an array of video codes, or a slice for every video.
+        """
+        if metric not in SERIES_METRICS:
+            raise ValueError(f"metric must be one of: {', '.join(SERIES_METRICS)}")
+        if videos is not None and self.video_cumulative is None:
+            raise ValueError("No per-video data (the audit had no Chart data)")
+        prefix = self.cumulative[:, None] if videos is None else self.video_cumulative[:, videos]
+        i, j = self._range(start, end)
+        ends = np.arange(i + 1, j + 1)
+        if metric == 'daily':
+            values = prefix[ends] - prefix[ends - 1]
+        elif metric == 'cumulative':
+            values = prefix[ends]
+        else:
+            starts = np.maximum(ends - SHORT_WINDOW, 0)
+            values = (prefix[ends] - prefix[starts]) / (ends - starts)[:, None]
+        return self.dates[i:j], values
+
+    def video_peaks(self):
+        """(peak dates, peak daily views) of every video, indexed by video code."""
+        if self.video_daily is None:
+            return None, None
+        peak_days = self.video_daily.argmax(axis=0)
+        return self.dates[peak_days], self.video_daily[peak_days, np.arange(self.video_daily.shape[1])]
+
+    def summary(self, start=None, end=None):
+        """Views, peaks, moving averages and growth for a date range (cached per range)."""
+        key = self._range(start, end)
+        if key in self._summaries:
+            return self._summaries[key]
+
+        i, j = key
+        days = j - i
+        total = self.window_sum(i, j)
+        half = i + days // 2
+        first_half, second_half = self.window_sum(i, half), self.window_sum(half, j)
+
+        result = {
+            'start': str(self.dates[i]) if days else None,
+            'end': str(self.dates[j - 1]) if days else None,
+            'days': days,
+            'total_views': total,
+            'days_active': int(self.active[j] - self.active[i]),
+            'avg_daily_views': total / days if days else 0.0,
+            'growth_rate': (second_half - first_half) / first_half * 100 if first_half > 0 else 0,
+        }
+        if days:
+            peak = i + int(self.daily[i:j].argmax())
+            result.update({
+                'peak_date': str(self.dates[peak]),
+                'peak_views': int(self.daily[peak]),
+                'avg_7d': float(self.moving_average(SHORT_WINDOW)[j - 1]),
+                'avg_28d': float(self.moving_average(LONG_WINDOW)[j - 1]),
+                'week_over_week': float(self.week_over_week()[j - 1]),
+            })
+            if days >= SHORT_WINDOW:
+                weeks = self.rolling_sum(SHORT_WINDOW)[i:j - SHORT_WINDOW + 1]
+                best = int(weeks.argmax())
+                result['peak_week_start'] = str(self.dates[i + best])
+                result['peak_week_views'] = int(weeks[best])
+
+        self._summaries[key] = result
+        return result
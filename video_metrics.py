@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Video Metrics
+Batch derivation of engagement metrics and display formatting for extracted videos.
+
+`derive_metrics` computes engagement/like/comment rates for every video at once with
+vectorised numpy arithmetic. `format_rows` fills the human-readable `*_formatted`
+fields, and is only called for rows that are actually rendered (report tables, CSV).
+"""
+
+from datetime import datetime
+
+FORMATTED_FIELDS = (
+    'duration_formatted',
+    'upload_date_formatted',
+    'view_count_formatted',
+    'like_count_formatted',
+    'comment_count_formatted',
+)
+
+RATE_FIELDS = ('engagement_rate', 'like_rate', 'comment_rate')
+
+
+def format_number(num):
+    """Format numbers for readability."""
+    if not isinstance(num, (int, float)) or num == 0:
+        return "0"
+
+    if num >= 1_000_000:
+        return f"{num / 1_000_000:.1f}M"
+    elif num >= 1_000:
+        return f"{num / 1_000:.1f}K"
+    else:
+        return str(int(num))
+
+
+def _counts(videos, field):
+    """Missing/None counts become 0."""
+    return [v.get(field) or 0 for v in videos]
+
+
+def derive_metrics(videos):
+    """Compute engagement, like and comment rates (percent, 2 dp) for all videos in place."""
+    if not videos:
+        return videos
+
+    # Deferred: numpy is only needed once there is data to crunch
+    import numpy as np
+
+    views = np.asarray(_counts(videos, 'view_count'), dtype=np.float64)
+    likes = np.asarray(_counts(videos, 'like_count'), dtype=np.float64)
+    comments = np.asarray(_counts(videos, 'comment_count'), dtype=np.float64)
+
+    has_views = views > 0
+    safe_views = np.where(has_views, views, 1.0)
+
+    rates = {
+        'engagement_rate': (likes + comments) / safe_views * 100,
+        'like_rate': likes / safe_views * 100,
+        'comment_rate': comments / safe_views * 100,
+    }
+    columns = {
+        field: np.where(has_views, np.round(values, 2), 0).tolist()
+        for field, values in rates.items()
+    }
+
+    for i, video in enumerate(videos):
+        video['engagement_rate'] = columns['engagement_rate'][i]
+        video['like_rate'] = columns['like_rate'][i]
+        video['comment_rate'] = columns['comment_rate'][i]
+
+    return videos
+
+
+def _format_duration(seconds):
+    if not seconds:
+        return "Unknown"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def _format_upload_date(upload_date):
+    if not upload_date:
+        return "Unknown"
+    # yt-dlp dates are YYYYMMDD. Days 01-28 exist in every month, so only the rest need the
+    # calendar check; anything strptime rejects (20230230, free text) is shown as-is
+    if (len(upload_date) == 8 and upload_date.isdigit() and upload_date[:4] >= '1000'
+            and '01' <= upload_date[4:6] <= '12' and '01' <= upload_date[6:] <= '28'):
+        return f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:]}"
+    try:
+        return datetime.strptime(upload_date, '%Y%m%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return upload_date
+
+
+def format_rows(videos):
+    """Fill the display fields for the given rows only; rows already formatted are skipped."""
+    for video in videos:
+        if 'view_count_formatted' in video:
+            continue
+        video['duration_formatted'] = _format_duration(video.get('duration'))
+        video['upload_date_formatted'] = _format_upload_date(video.get('upload_date'))
+        video['view_count_formatted'] = format_number(video.get('view_count'))
+        video['like_count_formatted'] = format_number(video.get('like_count'))
+        video['comment_count_formatted'] = format_number(video.get('comment_count'))
+    return videos
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Export Watcher
+Long-running daemon that audits YouTube Analytics exports as they land in a folder,
+instead of re-auditing everything on a schedule:
+
+- notices new or updated CSVs with inotify on Linux (through ctypes, no dependencies),
+  or by polling file sizes and modification times elsewhere
+- waits until a file has been quiet (and its size stable) for a few seconds, so
+  half-written downloads are never read
+- re-audits only the export set a changed file belongs to, and only if its files
+  differ from the last audited version
+
+Each audit is published to audits/<export set>/<timestamp>/ (audit.txt + summary.json).
+
+Usage:
+    python3 watch_exports.py                       # watch ~/Downloads
+    python3 watch_exports.py ~/exports --quiet 10  # watch a tree of per-channel folders
+    python3 watch_exports.py ~/exports --once      # audit anything new or changed, then exit
+"""
+
+import argparse
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from run_output import RunOutput
+
+WATCH_OUTPUT_DIR = Path("audits")
+STATE_FILENAME = ".watch_state.json"
+QUIET_SECONDS = 5.0    # A file must be unchanged this long before it is audited
+POLL_INTERVAL = 2.0    # Seconds between scans for the polling watcher
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len (name follows)
+
+
+def _signature(path):
+    """(size, mtime) of a file, or None once it is gone."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _scan(root):
+    return {str(p): _signature(p) for p in Path(root).rglob('*.csv')}
+
+
+class PollingWatcher:
+    """Finds changed CSVs by comparing sizes and mtimes between scans (works everywhere)."""
+
+    name = 'polling'
+
+    def __init__(self, root, interval=POLL_INTERVAL):
+        self.root = Path(root)
+        self.interval = interval
+        self._seen = _scan(self.root)
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds; return the set of CSV paths that changed."""
+        time.sleep(min(timeout, self.interval))
+        current = _scan(self.root)
+        changed = {path for path, signature in current.items() if self._seen.get(path) != signature}
+        self._seen = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Kernel change notifications for a directory tree (Linux), read through ctypes."""
+
+    name = 'inotify'
+
+    def __init__(self, root):
+        # Deferred: only the Linux watcher needs ctypes
+        import ctypes
+        import ctypes.util
+
+        self.root = Path(root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        for directory in [self.root, *(p for p in self.root.rglob('*') if p.is_dir())]:
+            self._add_watch(directory)
+
+    def _add_watch(self, directory):
+        import ctypes
+
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = Path(directory)
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds; return the set of CSV paths that changed."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return set(_scan(self.root))  # Events were lost: treat every export as changed
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A new channel folder (possibly moved in whole): watch it and pick up its files
+                    for directory in [path, *(p for p in path.rglob('*') if p.is_dir())]:
+                        self._add_watch(directory)
+                    changed.update(str(p) for p in path.rglob('*.csv'))
+            elif name.lower().endswith('.csv'):
+                changed.add(str(path))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(root, polling=False, interval=POLL_INTERVAL):
+    """inotify where available, otherwise the polling watcher."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:  # AttributeError: libc without inotify
+            print(f"⚠️  inotify unavailable ({e}); polling every {interval:g}s instead")
+    return PollingWatcher(root, interval)
+
+
+class Debouncer:
+    """Holds changed files back until they have been quiet, with a stable size, for `quiet` seconds."""
+
+    def __init__(self, quiet=QUIET_SECONDS):
+        self.quiet = quiet
+        self._pending = {}  # path -> (last change time, signature at that time)
+
+    def touch(self, path, now=None):
+        self._pending[path] = (now or time.monotonic(), _signature(path))
+
+    def next_timeout(self, default):
+        """Seconds until the earliest pending file could be ready."""
+        if not self._pending:
+            return default
+        earliest = min(changed for changed, _ in self._pending.values())
+        return max(0.05, min(default, earliest + self.quiet - time.monotonic()))
+
+    def ready(self, now=None):
+        """Pending files that have settled; files still growing are re-armed."""
+        now = now or time.monotonic()
+        settled = set()
+        for path, (changed, signature) in list(self._pending.items()):
+            if now - changed < self.quiet:
+                continue
+            current = _signature(path)
+            if current is None:
+                del self._pending[path]  # Deleted (or renamed away) before it settled
+            elif current != signature:
+                self._pending[path] = (now, current)  # Still being written without events (polling)
+            else:
+                del self._pending[path]
+                settled.add(path)
+        return settled
+
+
+class ExportAuditor:
+    """Audits changed export sets and publishes each result; remembers what it has audited."""
+
+    def __init__(self, root, output_dir=WATCH_OUTPUT_DIR):
+        self.root = Path(root)
+        self.output_dir = Path(output_dir)
+        self.state_path = self.output_dir / STATE_FILENAME
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def _fingerprint(self, export_set):
+        return [[path, *(_signature(path) or ())] for path in sorted(
+            export_set[kind] for kind in ('totals', 'chart', 'table') if export_set[kind])]
+
+    def _save_state(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        partial = self.state_path.with_name(self.state_path.name + '.partial')
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(partial, self.state_path)
+
+    def audit(self, changed_paths=None):
+        """Audit the export sets containing changed_paths (None: every set); returns audited names."""
+        # Deferred: importing the runner pulls in the auditor
+        from run_performance_audit import find_export_sets, audit_export_set
+
+        audited = []
+        for export_set in find_export_sets(self.root):
+            files = {export_set[kind] for kind in ('totals', 'chart', 'table') if export_set[kind]}
+            if changed_paths is not None and not files & changed_paths:
+                continue
+            fingerprint = self._fingerprint(export_set)
+            if self.state.get(export_set['name']) == fingerprint:
+                continue  # Touched, but identical to what was last audited
+
+            print(f"🔍 Auditing {export_set['name']}...")
+            result = audit_export_set(export_set)
+            if result['error']:
+                print(f"   ❌ {result['error']}")
+            else:
+                final_dir = self.publish(export_set, result)
+                print(f"   ✅ {result['total_views']:,} views, {result['spikes']} spikes "
+                      f"({result['seconds']:.2f}s) → {final_dir}")
+            self.state[export_set['name']] = fingerprint
+            self._save_state()
+            audited.append(export_set['name'])
+        return audited
+
+    def publish(self, export_set, result):
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in export_set['name'])
+        run_output = RunOutput(self.output_dir / safe / datetime.now().strftime('%Y%m%d_%H%M%S'))
+        staging = run_output.open()
+        with open(staging / 'audit.txt', 'w', encoding='utf-8') as f:
+            f.write(result['report'])
+        with open(staging / 'summary.json', 'w', encoding='utf-8') as f:
+            json.dump({**{k: v for k, v in result.items() if k != 'report'}, 'files': export_set}, f, indent=2)
+        return run_output.publish()
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def watch(root, output_dir=WATCH_OUTPUT_DIR, quiet=QUIET_SECONDS, polling=False, interval=POLL_INTERVAL):
+    """Audit new and changed exports under root until interrupted (Ctrl+C or SIGTERM)."""
+    signal.signal(signal.SIGTERM, _stop)  # Service managers stop daemons with SIGTERM
+    auditor = ExportAuditor(root, output_dir)
+    auditor.audit()  # Catch up on anything that changed while we were not running
+
+    watcher = make_watcher(root, polling, interval)
+    debouncer = Debouncer(quiet)
+    print(f"👀 Watching {root} for Analytics exports ({watcher.name}, {quiet:g}s quiet period). Ctrl+C to stop.")
+    try:
+        while True:
+            for path in watcher.poll(debouncer.next_timeout(default=60.0)):
+                debouncer.touch(path)
+            settled = debouncer.ready()
+            if settled:
+                auditor.audit(settled)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit YouTube Analytics exports as they land in a folder")
+    parser.add_argument('directory', nargs='?', default=str(Path.home() / "Downloads"),
+                        help="Folder (or tree of per-channel folders) to watch (default: ~/Downloads)")
+    parser.add_argument('--output-dir', default=str(WATCH_OUTPUT_DIR),
+                        help=f"Where audits are published (default: {WATCH_OUTPUT_DIR}/)")
+    parser.add_argument('--quiet', type=float, default=QUIET_SECONDS,
+                        help=f"Seconds a file must stay unchanged before it is audited (default: {QUIET_SECONDS:g})")
+    parser.add_argument('--poll', action='store_true', help="Poll instead of using inotify")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f"Polling interval in seconds (default: {POLL_INTERVAL:g})")
+    parser.add_argument('--once', action='store_true',
+                        help="Audit new or changed export sets once and exit (for cron)")
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir():
+        parser.error(f"{args.directory} is not a directory")
+
+    if args.once:
+        audited = ExportAuditor(args.directory, args.output_dir).audit()
+        print(f"✅ {len(audited)} export set(s) audited" if audited else "✅ Nothing new to audit")
+        return
+    watch(args.directory, args.output_dir, args.quiet, args.poll, args.interval)
+
+
+if __name__ == "__main__":
+    main()
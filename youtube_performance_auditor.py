@@ -4,7 +4,6 @@ YouTube Performance Auditor
 Analyzes your channel's performance data and provides actionable optimization insights.
 """
 
-import pandas as pd
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -12,13 +11,30 @@ import sys
 
 
 class YouTubePerformanceAuditor:
-    def __init__(self, totals_csv=None, chart_data_csv=None):
-        """Initialize the auditor with CSV file paths."""
+    def __init__(self, totals_csv=None, chart_data_csv=None, table_data_csv=None):
+        """Initialize the auditor with CSV file paths (Table data is optional)."""
         self.totals_csv = totals_csv
         self.chart_data_csv = chart_data_csv
+        self.table_data_csv = table_data_csv
         self.totals_df = None
         self.chart_df = None
+        self.table_df = None
+        self.videos_df = None  # One row per video, indexed by the integer code in chart_df['video_code']
+        self.trends = None  # TrendEngine over the loaded daily views
         self.analysis_results = {}
+    
+    @classmethod
+    def from_frames(cls, totals_df=None, chart_df=None, table_df=None, videos_df=None):
+        """Audit already-parsed frames (e.g. a streamed upload) instead of CSV files.
+        
+        Dates must already be datetimes. With videos_df, chart_df must carry its 'video_code'.
+        """
+        auditor = cls()
+        auditor.totals_df = totals_df
+        auditor.chart_df = chart_df
+        auditor.table_df = table_df
+        auditor.videos_df = videos_df
+        return auditor
         
     def display_banner(self):
         """Display the auditor banner."""
@@ -42,24 +58,44 @@ class YouTubePerformanceAuditor:
         print("📂 STEP 1: Loading Your Performance Data")
         print("-"*80)
         
+        # Deferred: pandas dominates start-up time and is only needed once we load data
+        import pandas as pd
+        
         try:
-            # Load totals data
-            if self.totals_csv and os.path.exists(self.totals_csv):
+            # Load totals data (unless from_frames() supplied it)
+            if self.totals_df is None and self.totals_csv and os.path.exists(self.totals_csv):
                 self.totals_df = pd.read_csv(self.totals_csv)
                 self.totals_df['Date'] = pd.to_datetime(self.totals_df['Date'])
+            if self.totals_df is not None:
                 print(f"   ✅ Loaded totals data: {len(self.totals_df)} days")
             else:
                 print("   ⚠️  No totals CSV found")
             
             # Load chart data
-            if self.chart_data_csv and os.path.exists(self.chart_data_csv):
+            if self.chart_df is None and self.chart_data_csv and os.path.exists(self.chart_data_csv):
                 self.chart_df = pd.read_csv(self.chart_data_csv)
                 self.chart_df['Date'] = pd.to_datetime(self.chart_df['Date'])
+            if self.chart_df is not None:
+                if self.videos_df is None:
+                    self.index_videos()
                 print(f"   ✅ Loaded chart data: {len(self.chart_df)} records")
-                print(f"   📹 Videos tracked: {self.chart_df['Video title'].nunique()}")
+                print(f"   📹 Videos tracked: {len(self.videos_df)}")
             else:
                 print("   ⚠️  No chart data CSV found")
             
+            # Load per-video table data (retention metrics)
+            if self.table_df is None and self.table_data_csv and os.path.exists(self.table_data_csv):
+                self.table_df = pd.read_csv(self.table_data_csv)
+            if self.table_df is not None and self.videos_df is not None:
+                matched = self.join_table_data(self.table_df)
+                print(f"   ✅ Loaded table data: retention metrics for {matched} videos")
+            
+            if self.totals_df is not None or self.chart_df is not None:
+                # Deferred with pandas: the trend engine needs numpy
+                from trends import TrendEngine
+                videos = len(self.videos_df) if self.videos_df is not None else 0
+                self.trends = TrendEngine.from_frames(self.totals_df, self.chart_df, videos)
+            
             print()
             return True
             
@@ -67,6 +103,38 @@ class YouTubePerformanceAuditor:
             print(f"   ❌ Error loading data: {e}")
             return False
     
+    def index_videos(self):
+        """Factorise Content ids into integer video codes and keep per-video attributes once.
+        
+        Grouping on a small integer is much cheaper than hashing (title, id, duration) string
+        tuples on every row of a large export.
+        """
+        import pandas as pd
+        
+        codes, content_ids = pd.factorize(self.chart_df['Content'])
+        self.chart_df['video_code'] = codes
+        
+        first_rows = self.chart_df.drop_duplicates('video_code')
+        self.videos_df = pd.DataFrame({
+            'Content': content_ids,
+            'Video title': first_rows['Video title'].to_numpy(),
+            'Duration': first_rows['Duration'].to_numpy(),
+        })
+        self.videos_df.index.name = 'video_code'
+    
+    def join_table_data(self, table_df):
+        """Attach Table data retention metrics to videos_df by video code; return the match count."""
+        import pandas as pd
+        
+        table_df = table_df[table_df['Content'] != 'Total']
+        codes = pd.Index(self.videos_df['Content']).get_indexer(table_df['Content'])
+        table_df = table_df[codes >= 0].set_axis(codes[codes >= 0])
+        
+        self.videos_df['Avg View Duration'] = pd.to_timedelta(
+            table_df['Average view duration'], errors='coerce').dt.total_seconds()
+        self.videos_df['Avg % Viewed'] = pd.to_numeric(table_df['Average percentage viewed (%)'], errors='coerce')
+        return len(table_df)
+    
     def analyze_overall_performance(self):
         """Analyze overall channel performance."""
         print("📈 STEP 2: Overall Performance Analysis")
@@ -76,25 +144,30 @@ class YouTubePerformanceAuditor:
             print("   ⚠️  No data to analyze")
             return
         
-        # Calculate key metrics
-        total_views = self.totals_df['Views'].sum()
-        days_active = len(self.totals_df[self.totals_df['Views'] > 0])
-        avg_daily_views = self.totals_df['Views'].mean()
-        peak_day_views = self.totals_df['Views'].max()
-        peak_date = self.totals_df[self.totals_df['Views'] == peak_day_views]['Date'].iloc[0]
+        import pandas as pd
         
-        # Growth trend
-        first_half = self.totals_df.iloc[:len(self.totals_df)//2]['Views'].sum()
-        second_half = self.totals_df.iloc[len(self.totals_df)//2:]['Views'].sum()
-        growth_rate = ((second_half - first_half) / max(first_half, 1)) * 100 if first_half > 0 else 0
+        # Key metrics for the whole export, from the trend engine's cumulative sums
+        trend = self.trends.summary()
+        total_views = trend['total_views']
+        days_active = trend['days_active']
+        avg_daily_views = trend['avg_daily_views']
+        peak_day_views = trend['peak_views']
+        peak_date = pd.Timestamp(trend['peak_date'])
+        growth_rate = trend['growth_rate']
         
         print(f"   📊 Total Views: {total_views}")
-        print(f"   📅 Days with Activity: {days_active} / {len(self.totals_df)}")
+        print(f"   📅 Days with Activity: {days_active} / {trend['days']}")
         print(f"   📈 Average Daily Views: {avg_daily_views:.1f}")
         print(f"   🔥 Peak Day: {peak_date.strftime('%Y-%m-%d')} ({int(peak_day_views)} views)")
+        if 'peak_week_start' in trend:
+            print(f"   🔥 Peak Week: from {trend['peak_week_start']} ({trend['peak_week_views']} views)")
         print(f"   📊 Growth Trend: {growth_rate:+.1f}% (first half vs second half)")
+        print(f"   📉 Moving Average: {trend['avg_7d']:.1f}/day (7-day), {trend['avg_28d']:.1f}/day (28-day)")
+        if not pd.isna(trend['week_over_week']):
+            print(f"   📆 Week over Week: {trend['week_over_week']:+.1f}%")
         print()
         
+        self.analysis_results['trends'] = trend
         self.analysis_results['overall'] = {
             'total_views': total_views,
             'days_active': days_active,
@@ -113,13 +186,21 @@ class YouTubePerformanceAuditor:
             print("   ⚠️  No video data to analyze")
             return
         
-        # Group by video and calculate metrics
-        video_stats = self.chart_df.groupby(['Video title', 'Content', 'Duration']).agg({
-            'Views': 'sum',
-            'Date': ['min', 'max']
-        }).reset_index()
+        import pandas as pd
+        
+        # Group by integer video code, then attach the per-video attributes (and any retention metrics)
+        grouped = self.chart_df.groupby('video_code', sort=False)
+        totals = grouped['Views'].sum().rename('Total Views')
+        video_stats = self.videos_df.join([
+            totals,
+            grouped['Date'].min().rename('First Date'),
+            grouped['Date'].max().rename('Last Date'),
+        ]).reset_index(drop=True)
+        
+        # Per-video velocity and peak day, indexed by video code like videos_df
+        video_stats['Recent Daily Views'] = self.trends.recent_velocity()
+        video_stats['Peak Date'], video_stats['Peak Views'] = self.trends.video_peaks()
         
-        video_stats.columns = ['Video title', 'Content', 'Duration', 'Total Views', 'First Date', 'Last Date']
         video_stats['Days Active'] = (video_stats['Last Date'] - video_stats['First Date']).dt.days + 1
         video_stats['Avg Daily Views'] = video_stats['Total Views'] / video_stats['Days Active']
         video_stats['Duration Minutes'] = video_stats['Duration'] / 60
@@ -134,6 +215,11 @@ class YouTubePerformanceAuditor:
             print(f"      📈 Avg Daily Views: {row['Avg Daily Views']:.1f}")
             print(f"      ⏱️  Duration: {row['Duration Minutes']:.1f} minutes")
             print(f"      📅 Active: {row['Days Active']} days")
+            print(f"      🚀 Last 7 Days: {row['Recent Daily Views']:.1f} views/day "
+                  f"(peak {row['Peak Date'].strftime('%Y-%m-%d')}: {int(row['Peak Views'])} views)")
+            if pd.notna(row.get('Avg % Viewed')):
+                minutes, seconds = divmod(int(row['Avg View Duration']), 60)
+                print(f"      🎯 Retention: {minutes}:{seconds:02d} average view ({row['Avg % Viewed']:.1f}% viewed)")
             print()
         
         # Find underperformers
@@ -147,9 +233,48 @@ class YouTubePerformanceAuditor:
         
         self.analysis_results['videos'] = video_stats
     
+    def detect_spikes(self):
+        """Flag one-off spikes, sustained growth and drops per video and for the channel."""
+        print("⚡ STEP 4: Spike & Drop Detection")
+        print("-"*80)
+        
+        if self.trends is None or self.trends.video_daily is None:
+            print("   ⚠️  No daily video data to scan")
+            print()
+            return
+        
+        # Deferred with pandas: the detector needs numpy
+        from anomalies import detect_anomalies, BASELINE_WINDOW, EVENT_LABELS
+        
+        anomalies = detect_anomalies(self.trends)
+        titles = self.videos_df['Video title']
+        
+        if not anomalies['channel'] and not anomalies['videos']:
+            print(f"   ✅ No unusual days against each video's {BASELINE_WINDOW}-day baseline")
+            print()
+        
+        if anomalies['channel']:
+            print("   📈 CHANNEL-LEVEL EVENTS:\n")
+            for event in anomalies['channel'][:3]:
+                print(f"   • {event['peak_date']}: {event['peak_views']} views vs {event['baseline']:.0f} usual "
+                      f"({EVENT_LABELS[event['kind'], event['pattern']]}, {event['days']} days, z={event['z']:+.1f})")
+                for driver in event.get('drivers', []):
+                    print(f"      ↳ \"{titles[driver['video_code']]}\": "
+                          f"+{driver['excess_views']:.0f} views ({driver['share']:.0%} of the spike)")
+            print()
+        
+        if anomalies['videos']:
+            print("   🎬 VIDEO-LEVEL EVENTS:\n")
+            for event in anomalies['videos'][:5]:
+                print(f"   • \"{titles[event['video_code']]}\" - {EVENT_LABELS[event['kind'], event['pattern']]} "
+                      f"from {event['start']} ({event['peak_views']} views vs {event['baseline']:.0f} usual)")
+            print()
+        
+        self.analysis_results['anomalies'] = anomalies
+    
     def identify_success_patterns(self):
         """Identify patterns in successful content."""
-        print("🔍 STEP 4: Success Pattern Identification")
+        print("🔍 STEP 5: Success Pattern Identification")
         print("-"*80)
         
         if self.chart_df is None or 'videos' not in self.analysis_results:
@@ -198,7 +323,7 @@ class YouTubePerformanceAuditor:
     
     def analyze_timing_patterns(self):
         """Analyze when videos perform best."""
-        print("⏰ STEP 5: Timing & Engagement Pattern Analysis")
+        print("⏰ STEP 6: Timing & Engagement Pattern Analysis")
         print("-"*80)
         
         if self.chart_df is None:
@@ -228,7 +353,7 @@ class YouTubePerformanceAuditor:
     
     def generate_recommendations(self):
         """Generate actionable optimization recommendations."""
-        print("🎯 STEP 6: Strategic Optimization Recommendations")
+        print("🎯 STEP 7: Strategic Optimization Recommendations")
         print("="*80)
         print()
         
@@ -298,6 +423,21 @@ class YouTubePerformanceAuditor:
             
             print()
         
+        # Spike-based recommendations
+        growing = [e for e in self.analysis_results.get('anomalies', {}).get('videos', [])
+                   if e['kind'] == 'spike' and e['pattern'] == 'sustained']
+        if growing:
+            title = self.videos_df['Video title'][growing[0]['video_code']]
+            print("⚡ MOMENTUM OPPORTUNITIES:\n")
+            print(f"   🚀 SUSTAINED GROWTH: \"{title}\" since {growing[0]['start']}")
+            print("      → Find the traffic source (search, suggested, external) and feed it")
+            recommendations.append({
+                'priority': 'HIGH',
+                'action': f'Capitalise on "{title[:30]}..." momentum',
+                'why': f"Views have stayed above its usual level since {growing[0]['start']}"
+            })
+            print()
+        
         # Pattern-based recommendations
         if 'patterns' in self.analysis_results:
             patterns = self.analysis_results['patterns']
@@ -376,6 +516,85 @@ class YouTubePerformanceAuditor:
         print("="*80)
         print()
     
+    def summary(self):
+        """Headline numbers of a finished audit, for comparing channels (JSON-safe)."""
+        import pandas as pd
+        
+        overall = self.analysis_results.get('overall', {})
+        trend = self.analysis_results.get('trends', {})
+        video_stats = self.analysis_results.get('videos')
+        anomalies = self.analysis_results.get('anomalies', {'channel': [], 'videos': []})
+        top = video_stats.iloc[0] if video_stats is not None and len(video_stats) else None
+        
+        def number(value):
+            return None if value is None or pd.isna(value) else round(float(value), 2)
+        
+        return {
+            'total_views': int(overall['total_views']) if overall else
+                           int(video_stats['Total Views'].sum()) if video_stats is not None else 0,
+            'avg_daily_views': number(overall.get('avg_daily_views')),
+            'growth_rate': number(overall.get('growth_rate')),
+            'avg_7d': number(trend.get('avg_7d')),
+            'week_over_week': number(trend.get('week_over_week')),
+            'videos': len(video_stats) if video_stats is not None else 0,
+            'top_video': top['Video title'] if top is not None else None,
+            'top_video_views': int(top['Total Views']) if top is not None else 0,
+            'spikes': sum(e['kind'] == 'spike' for e in anomalies['channel'] + anomalies['videos']),
+            'drops': sum(e['kind'] == 'drop' for e in anomalies['channel'] + anomalies['videos']),
+            'recommendations': len(self.analysis_results.get('recommendations', [])),
+        }
+    
+    def results(self, top=10):
+        """Structured results of a finished audit (JSON-safe: NaN becomes None, dates strings)."""
+        import pandas as pd
+        
+        def clean(value):
+            if isinstance(value, dict):
+                return {k: clean(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [clean(v) for v in value]
+            if isinstance(value, pd.Timestamp):
+                return value.strftime('%Y-%m-%d')
+            if hasattr(value, 'item'):
+                value = value.item()  # numpy scalars
+            if isinstance(value, float) and pd.isna(value):
+                return None
+            return value
+        
+        top_videos = []
+        video_stats = self.analysis_results.get('videos')
+        if video_stats is not None:
+            for _, row in video_stats.head(top).iterrows():
+                top_videos.append({
+                    'content': row['Content'],
+                    'title': row['Video title'],
+                    'total_views': row['Total Views'],
+                    'avg_daily_views': row['Avg Daily Views'],
+                    'recent_daily_views': row['Recent Daily Views'],
+                    'peak_date': row['Peak Date'],
+                    'peak_views': row['Peak Views'],
+                    'duration_minutes': row['Duration Minutes'],
+                    'avg_percent_viewed': row.get('Avg % Viewed'),
+                })
+        
+        # Events refer to videos by code: name them for readers outside this process
+        anomalies = self.analysis_results.get('anomalies', {'channel': [], 'videos': []})
+        titles = self.videos_df['Video title'] if self.videos_df is not None else {}
+        channel_events = [
+            {**event, 'drivers': [{**d, 'title': titles[d['video_code']]} for d in event.get('drivers', [])]}
+            for event in anomalies['channel']
+        ]
+        video_events = [{**event, 'title': titles[event['video_code']]} for event in anomalies['videos'][:top * 2]]
+        
+        return clean({
+            'summary': self.summary(),
+            'trends': self.analysis_results.get('trends', {}),
+            'top_videos': top_videos,
+            'anomalies': {'channel': channel_events, 'videos': video_events},
+            'timing': self.analysis_results.get('timing', {}),
+            'recommendations': self.analysis_results.get('recommendations', []),
+        })
+    
     def run_audit(self):
         """Run the complete audit process."""
         self.display_banner()
@@ -386,6 +605,7 @@ class YouTubePerformanceAuditor:
         
         self.analyze_overall_performance()
         self.analyze_video_performance()
+        self.detect_spikes()
         self.identify_success_patterns()
         self.analyze_timing_patterns()
         self.generate_recommendations()
@@ -404,13 +624,15 @@ def main():
     
     totals_path = input("1. Path to Totals CSV (e.g., 'Untitled spreadsheet - Totals.csv'): ").strip()
     chart_path = input("2. Path to Chart Data CSV (e.g., 'Untitled spreadsheet - Chart data.csv'): ").strip()
+    table_path = input("3. Path to Table Data CSV (optional, Enter to skip): ").strip()
     
     # Handle quotes in paths
     totals_path = totals_path.strip('"').strip("'")
     chart_path = chart_path.strip('"').strip("'")
+    table_path = table_path.strip('"').strip("'") or None
     
     # Create auditor and run analysis
-    auditor = YouTubePerformanceAuditor(totals_path, chart_path)
+    auditor = YouTubePerformanceAuditor(totals_path, chart_path, table_path)
     auditor.run_audit()
 
 
@@ -15,29 +15,68 @@ Perfect for content creators analyzing successful YouTube channels!
 ================================================================================
 """
 
-import yt_dlp
 import json
 import os
 import csv
+import pickle
+import time
 from urllib.parse import urlparse
 from pathlib import Path
 from datetime import datetime
 from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+import io
 import subprocess
 import sys
 from typing import List, Dict, Any
 
+from run_profiler import RunProfiler, PROFILE_FILENAME, CPU_PROFILERS
+from run_status import StatusPublisher
+from run_catalogue import RunCatalogue
+from growth_store import GrowthStore
+from run_output import RunOutput, ARCHIVE_FORMATS, WRITE_BUFFER
+from extractors import (YtDlpExtractor, StandInExtractor, DEFAULT_POOL_SIZE,
+                        PROFILE_FIELDS, EXTRACTION_PROFILES, DEFAULT_PROFILE, source_fields)
+from sampling import TopKStrategy, STRATEGIES, DEFAULT_STRATEGY, DEFAULT_SECONDS_PER_VIDEO, make_strategy
+from video_metrics import derive_metrics, format_rows, format_number, FORMATTED_FIELDS, RATE_FIELDS
+
 # Global configuration
 CHANNEL_URL = ""
 CHANNEL_NAME = ""
 OUTPUT_DIR = None
 
+# Binary snapshot of video_data saved with every run (lossless, unlike the CSV)
+DATASET_FILENAME = "video_dataset.pkl"
+DATASET_VERSION = 1
+
+# Anytime mode: interim reports are rewritten at most this often during the deep analysis
+INTERIM_FILENAME = "interim.json"
+CHECKPOINT_INTERVAL = 15
+
+# Column order for detailed_video_data.csv
+CSV_FIELDS = (
+    'index', 'title', 'url', 'video_id', 'description', 'upload_date', 'uploader',
+    'duration', 'view_count', 'like_count', 'comment_count', 'tags', 'categories', 'thumbnail',
+) + FORMATTED_FIELDS + RATE_FIELDS
+
 class YouTubeSuccessAnalyzer:
-    def __init__(self):
+    def __init__(self, cpu_profiler=None, extractor=None, profile=DEFAULT_PROFILE, sampler=None,
+                 anytime=False, checkpoint_interval=CHECKPOINT_INTERVAL, archive=None):
         self.channel_url = ""
         self.channel_name = ""
         self.output_dir = Path(".")  # Initialize with current directory
         self.video_data = []
+        self.scanned_videos = []  # Flat-list entries for every video (view counts only)
+        self.profiler = RunProfiler(cpu_profiler=cpu_profiler)
+        self.status = StatusPublisher()
+        self.extractor = extractor  # None → yt-dlp against live YouTube
+        self.profile = profile  # Which per-video fields are fetched, kept and exported
+        self.sampler = sampler or TopKStrategy()  # Which videos get the deep analysis
+        self.anytime = anytime  # Write interim reports at checkpoints during the deep analysis
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = 0
+        self.run_output = None  # Staged run directory, published atomically when the run completes
+        self.archive = archive  # Also write a compressed archive of the run ('zip' or 'tar.gz')
         
         # Master Prompt Template - Optimized for NotebookLM (500K word limit, 50 queries/day)
         self.master_prompt_template = """
@@ -136,25 +175,8 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
             if not url_input:
                 print("❌ Please enter a valid URL.")
                 continue
-                
-            # Add /videos to the URL if not present
-            if 'youtube.com' in url_input and '/videos' not in url_input:
-                if url_input.endswith('/'):
-                    url_input += 'videos'
-                else:
-                    url_input += '/videos'
             
-            self.channel_url = url_input
-            self.channel_name = self.extract_channel_name(url_input)
-            
-            # Create output directory
-            self.output_dir = Path("analysis") / self.channel_name / datetime.now().strftime('%Y%m%d_%H%M%S')
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-            
-            print(f"\n✅ Channel Selected: {self.channel_name}")
-            print(f"📁 Results will be saved to: {self.output_dir}")
-            print(f"🔗 Analyzing: {self.channel_url}")
-            print()
+            self.set_channel(url_input)
             print("💰 This analysis will help you:")
             print("   • Identify what makes videos successful")
             print("   • Find profitable content patterns")
@@ -168,6 +190,27 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
             else:
                 print("\nLet's try again...\n")
     
+    def set_channel(self, url_input):
+        """Normalize the channel URL and create the run's output directory."""
+        # Add /videos to the URL if not present
+        if 'youtube.com' in url_input and '/videos' not in url_input:
+            if url_input.endswith('/'):
+                url_input += 'videos'
+            else:
+                url_input += '/videos'
+        
+        self.channel_url = url_input
+        self.channel_name = self.extract_channel_name(url_input)
+        
+        # Create output directory: files are staged in a hidden directory until the run completes
+        self.run_output = RunOutput(Path("analysis") / self.channel_name / datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.output_dir = self.run_output.open()
+        
+        print(f"\n✅ Channel Selected: {self.channel_name}")
+        print(f"📁 Results will be saved to: {self.run_output.final_dir}")
+        print(f"🔗 Analyzing: {self.channel_url}")
+        print()
+    
     def extract_channel_name(self, url):
         """Extract clean channel name from URL."""
         try:
@@ -191,17 +234,21 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
         except Exception:
             return "unknown_channel"
     
+    @contextmanager
+    def stage(self, name, total=0):
+        """Time a pipeline stage and publish it as the run's live status."""
+        self.status.stage(name, total=total)
+        with self.profiler.stage(name):
+            yield
+    
+    def csv_fields(self):
+        """CSV columns for this run's extraction profile (derived fields are always included)."""
+        dropped = set(PROFILE_FIELDS['full']) - set(PROFILE_FIELDS[self.profile])
+        return [field for field in CSV_FIELDS if field not in dropped]
+    
     def format_number(self, num):
         """Format numbers for readability."""
-        if not isinstance(num, (int, float)) or num == 0:
-            return "0"
-        
-        if num >= 1_000_000:
-            return f"{num / 1_000_000:.1f}M"
-        elif num >= 1_000:
-            return f"{num / 1_000:.1f}K"
-        else:
-            return str(int(num))
+        return format_number(num)
     
     def extract_video_metadata(self):
         """Extract comprehensive video metadata using yt-dlp."""
@@ -211,138 +258,118 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
         print("💡 Grab a coffee - this goldmine of insights is worth the wait!")
         print()
         
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': 'in_playlist',  # Fast: get basic info first, then fetch details only for videos we process
-            'writeinfojson': False,
-            'writethumbnail': False,
-            'writesubtitles': False,
-            'writeautomaticsub': False,
-            'ignoreerrors': True,
-            'no_check_certificate': True,
-            'proxy': '',  # Explicitly disable proxy
-            'socket_timeout': 30,  # Add timeout to prevent hangs
-            'extractor_args': {'youtube': {'player_client': ['ios', 'web']}},  # Use multiple clients for reliability
-            'sleep_interval': 1,  # Reduced to 1 second - still safe but much faster
-            'max_sleep_interval': 2,  # Max 2 seconds
-            'sleep_interval_requests': 1,  # 1 second between API requests
-        }
+        extractor = self.extractor or YtDlpExtractor()
+        extractor.profiler = self.profiler  # Shared extractors report into this run's profile
+        extractor.fields = source_fields(self.profile)
+        kept_fields = ('index',) + PROFILE_FIELDS[self.profile]
+        if not extractor.per_video_requests:
+            # The flat listing already holds every deep-analysed video: no fetch costs anything
+            self.sampler.seconds_per_video = 0.0
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                channel_dict = ydl.extract_info(self.channel_url, download=False)
+            with extractor:
+                with self.stage('channel_listing'):
+                    all_videos = extractor.list_channel(self.channel_url)
                 
-                if 'entries' in channel_dict:
+                if all_videos:
                     # First pass: collect ALL videos with basic metadata
-                    all_videos = [v for v in channel_dict['entries'] if v]
+                    self.scanned_videos = all_videos
                     total_videos = len(all_videos)
                     print(f"   📊 Found {total_videos} videos - analyzing performance...\n")
                     
-                    # Extract view counts for all videos to determine top performers
-                    print(f"   🔍 STEP 2A: Quick scan to identify top performers...")
-                    video_performance = []
+                    with self.stage('scan', total=total_videos):
+                        # Extract view counts for all videos to determine top performers
+                        print(f"   🔍 STEP 2A: Quick scan to identify top performers...")
+                        video_performance = []
                     
-                    for i, video in enumerate(all_videos, 1):
-                        if video:
-                            try:
-                                view_count = video.get('view_count', 0)
-                                video_performance.append({
-                                    'index': i,
-                                    'video': video,
-                                    'view_count': view_count
-                                })
+                        for i, video in enumerate(all_videos, 1):
+                            if video:
+                                try:
+                                    view_count = video.get('view_count', 0)
+                                    video_performance.append({
+                                        'index': i,
+                                        'video': video,
+                                        'view_count': view_count
+                                    })
                                 
-                                if i % 50 == 0:
-                                    percent = (i / total_videos) * 100
-                                    print(f"      ⚡ Scanned: {i}/{total_videos} ({percent:.0f}%)")
-                            except:
-                                continue
+                                    if i % 50 == 0:
+                                        percent = (i / total_videos) * 100
+                                        print(f"      ⚡ Scanned: {i}/{total_videos} ({percent:.0f}%)")
+                                except:
+                                    continue
                     
-                    # Sort by view count and take top 30%
-                    video_performance.sort(key=lambda x: x['view_count'], reverse=True)
-                    top_30_percent = int(len(video_performance) * 0.30)
-                    top_30_percent = max(top_30_percent, 10)  # Minimum 10 videos
+                        # Pick the videos worth a deep fetch (default: top 30% by views)
+                        top_videos = self.sampler.select(video_performance)
+                        estimate = self.sampler.estimated_fetches() * self.sampler.seconds_per_video
                     
-                    top_videos = video_performance[:top_30_percent]
+                        print(f"\n   ✅ Selected {len(top_videos)} videos ({self.sampler.describe(total_videos)}) for deep analysis")
+                        print(f"   📊 View range: {self.format_number(top_videos[-1]['view_count'])} to {self.format_number(top_videos[0]['view_count'])} views")
+                        print(f"   ⏳ Estimated cost: {self.sampler.estimated_fetches()} fetches, ~{estimate:.1f}s\n")
                     
-                    print(f"\n   ✅ Identified top {len(top_videos)} videos (top 30%) for deep analysis")
-                    print(f"   📊 View range: {self.format_number(top_videos[-1]['view_count'])} to {self.format_number(top_videos[0]['view_count'])} views\n")
+                    with self.stage('deep_analysis', total=len(top_videos)):
+                        # Second pass: Extract full metadata only for top performers
+                        print(f"   🔍 STEP 2B: Deep analysis of top {len(top_videos)} performers...")
                     
-                    # Second pass: Extract full metadata only for top performers
-                    print(f"   🔍 STEP 2B: Deep analysis of top {len(top_videos)} performers...")
-                    
-                    for i, item in enumerate(top_videos, 1):
-                        video = item['video']
-                        try:
-                            # Progress updates every 10 videos
-                            if i % 10 == 0 or i == 1:
-                                percent = (i / len(top_videos)) * 100
-                                print(f"      ⚡ Progress: {i}/{len(top_videos)} ({percent:.0f}%) - Extracting detailed metrics...")
-                            elif i == len(top_videos):
-                                print(f"      ✅ Complete: {i}/{len(top_videos)} (100%) - Top performers analyzed!\n")
-                            
-                            # Extract comprehensive metadata
-                            metadata = {
-                                'index': item['index'],  # Keep original index
-                                'title': video.get('title', 'Unknown Title'),
-                                'url': video.get('webpage_url', video.get('url', '')),
-                                'video_id': video.get('id', ''),
-                                'description': video.get('description', ''),
-                                'upload_date': video.get('upload_date', ''),
-                                'uploader': video.get('uploader', ''),
-                                'duration': video.get('duration', 0),
-                                'view_count': video.get('view_count', 0),
-                                'like_count': video.get('like_count', 0),
-                                'comment_count': video.get('comment_count', 0),
-                                'tags': video.get('tags', []),
-                                'categories': video.get('categories', []),
-                                'thumbnail': video.get('thumbnail', ''),
-                            }
-                            
-                            # Format data
-                            if metadata['duration']:
-                                duration = int(metadata['duration'])
-                                duration_str = f"{duration // 3600:02d}:{(duration % 3600) // 60:02d}:{duration % 60:02d}"
-                                metadata['duration_formatted'] = duration_str
-                            else:
-                                metadata['duration_formatted'] = "Unknown"
-                            
-                            if metadata['upload_date']:
+                        self.sampler.start()
+                        last_checkpoint = time.perf_counter()
+                        for i, item in enumerate(top_videos, 1):
+                            if self.sampler.should_stop():
+                                print(f"      ⏱️ Time budget reached after {i - 1}/{len(top_videos)} videos - stopping deep analysis\n")
+                                break
+                            video = item['video']
+                            self.status.progress(i, len(top_videos))
+                            with self.profiler.video(video.get('id', '')):
                                 try:
-                                    date_obj = datetime.strptime(metadata['upload_date'], '%Y%m%d')
-                                    metadata['upload_date_formatted'] = date_obj.strftime('%Y-%m-%d')
-                                except ValueError:
-                                    metadata['upload_date_formatted'] = metadata['upload_date']
-                            else:
-                                metadata['upload_date_formatted'] = "Unknown"
-                            
-                            metadata['view_count_formatted'] = self.format_number(metadata['view_count'])
-                            metadata['like_count_formatted'] = self.format_number(metadata['like_count'])
-                            metadata['comment_count_formatted'] = self.format_number(metadata['comment_count'])
+                                    # Progress updates every 10 videos
+                                    if i % 10 == 0 or i == 1:
+                                        percent = (i / len(top_videos)) * 100
+                                        print(f"      ⚡ Progress: {i}/{len(top_videos)} ({percent:.0f}%) - Extracting detailed metrics...")
+                                    elif i == len(top_videos):
+                                        print(f"      ✅ Complete: {i}/{len(top_videos)} (100%) - Top performers analyzed!\n")
                             
-                            # Calculate engagement metrics
-                            views = metadata['view_count']
-                            likes = metadata['like_count']
-                            comments = metadata['comment_count']
+                                    video = extractor.fetch_video(video)
                             
-                            if views > 0:
-                                metadata['engagement_rate'] = round(((likes + comments) / views) * 100, 2)
-                                metadata['like_rate'] = round((likes / views) * 100, 2)
-                                metadata['comment_rate'] = round((comments / views) * 100, 2)
-                            else:
-                                metadata['engagement_rate'] = 0
-                                metadata['like_rate'] = 0
-                                metadata['comment_rate'] = 0
+                                    # Extract comprehensive metadata
+                                    metadata = {
+                                        'index': item['index'],  # Keep original index
+                                        'title': video.get('title', 'Unknown Title'),
+                                        'url': video.get('webpage_url', video.get('url', '')),
+                                        'video_id': video.get('id', ''),
+                                        'description': video.get('description', ''),
+                                        'upload_date': video.get('upload_date', ''),
+                                        'uploader': video.get('uploader', ''),
+                                        'duration': video.get('duration', 0),
+                                        'view_count': video.get('view_count', 0),
+                                        'like_count': video.get('like_count', 0),
+                                        'comment_count': video.get('comment_count', 0),
+                                        'tags': video.get('tags', []),
+                                        'categories': video.get('categories', []),
+                                        'thumbnail': video.get('thumbnail', ''),
+                                    }
+                                    if self.profile != 'full':
+                                        metadata = {k: metadata[k] for k in kept_fields}
                             
-                            self.video_data.append(metadata)
+                                    self.video_data.append(metadata)
+                                    
+                                    if self.anytime and time.perf_counter() - last_checkpoint >= self.checkpoint_interval:
+                                        self.write_interim_reports(len(top_videos), total_videos)
+                                        last_checkpoint = time.perf_counter()
                             
-                        except Exception as e:
-                            print(f"      ⚠️ Error processing video {i}: {e}")
-                            continue
+                                except Exception as e:
+                                    self.profiler.record_error()
+                                    print(f"      ⚠️ Error processing video {i}: {e}")
+                                    continue
+                    
+                        sampling = self.profiler.sampling = self.sampler.report(len(self.video_data))
+                    
+                    # Engagement rates for every video in one vectorised pass
+                    with self.stage('derive_metrics'):
+                        derive_metrics(self.video_data)
                     
                     print(f"\n   ✅ Successfully analyzed {len(self.video_data)} top-performing videos")
-                    print(f"   💡 Focused on top 30% = {len(self.video_data)}/{total_videos} videos analyzed")
+                    print(f"   💡 Sampling ({self.sampler.describe(total_videos)}): {len(self.video_data)}/{total_videos} videos analyzed")
+                    print(f"   ⏳ Fetch cost: estimated {sampling['estimated_fetches']} fetches / {sampling['estimated_seconds']:.1f}s, "
+                          f"actual {sampling['actual_fetches']} / {sampling['actual_seconds']:.1f}s")
                     print(f"   🚀 Speed improvement: {100 - int((len(self.video_data)/total_videos)*100)}% faster than full scan!\n")
                     return True
                     
@@ -350,6 +377,170 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
             print(f"❌ Error extracting metadata: {e}")
             return False
     
+    def save_dataset(self):
+        """Save a binary snapshot of the extracted data so reports can be rebuilt offline."""
+        snapshot = {
+            'version': DATASET_VERSION,
+            'channel_name': self.channel_name,
+            'channel_url': self.channel_url,
+            'profile': self.profile,
+            'saved_at': datetime.now().isoformat(timespec='seconds'),
+            'video_data': self.video_data,
+        }
+        with open(self.output_dir / DATASET_FILENAME, 'wb', buffering=WRITE_BUFFER) as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def load_dataset(self, path):
+        """Load a snapshot written by save_dataset(). `path` may be the file or its run directory."""
+        path = Path(path)
+        if path.is_dir():
+            path = path / DATASET_FILENAME
+        
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        
+        if snapshot.get('version') != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset version {snapshot.get('version')!r} in {path}")
+        
+        self.channel_name = snapshot['channel_name']
+        self.channel_url = snapshot['channel_url']
+        self.video_data = snapshot['video_data']
+        self.profile = snapshot.get('profile', DEFAULT_PROFILE)
+        self.output_dir = path.parent
+        return snapshot
+    
+    def regenerate_reports(self, dataset_path, output_dir=None):
+        """Rebuild every report from a saved dataset without touching the network."""
+        started = time.perf_counter()
+        snapshot = self.load_dataset(dataset_path)
+        if output_dir:
+            self.output_dir = Path(output_dir)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        print(f"\n♻️  Regenerating reports for {self.channel_name}")
+        print(f"   📦 Dataset: {len(self.video_data)} videos (saved {snapshot['saved_at']})")
+        
+        self.profiler.start_cpu_profile()
+        self.run_report_stages()
+        # The run's own run_profile.json stays as it was: it is what regeneration is compared to
+        self.write_profile(variant='regenerate')
+        
+        elapsed = time.perf_counter() - started
+        print(f"✅ Reports rebuilt in {elapsed * 1000:.0f} ms")
+        print(f"📁 All files saved to: {self.output_dir}")
+        return True
+    
+    def write_interim_reports(self, selected, total_videos):
+        """Anytime checkpoint: lightweight master summary and rankings from the videos analyzed so far."""
+        self.checkpoints += 1
+        videos = self.video_data
+        elapsed = self.profiler.elapsed()
+        note = (f"> ⏳ **Interim results** (checkpoint {self.checkpoints}): {len(videos)} of {selected} "
+                f"selected videos analyzed after {elapsed:.0f}s. This file is replaced when the analysis finishes.\n\n")
+        
+        try:
+            derive_metrics(videos)
+            with redirect_stdout(io.StringIO()):
+                self.create_master_summary(note=note)
+            
+            top = sorted(videos, key=lambda x: x.get('view_count', 0), reverse=True)[:20]
+            format_rows(top)
+            content = f"# {self.channel_name} - Performance Rankings\n\n{note}"
+            content += "## 📈 Top 20 by Views\n\n| Rank | Title | Views | Engagement | Duration | Date |\n"
+            content += "|------|-------|-------|------------|----------|------|\n"
+            for i, video in enumerate(top, 1):
+                content += f"| {i} | {video['title'][:60]}... | {video['view_count_formatted']} | {video['engagement_rate']}% | {video['duration_formatted']} | {video['upload_date_formatted']} |\n"
+            with open(self.output_dir / "04_performance_rankings.md", 'w', encoding='utf-8') as f:
+                f.write(content)
+            
+            interim = {
+                'checkpoint': self.checkpoints,
+                'videos_analyzed': len(videos),
+                'videos_selected': selected,
+                'videos_total': total_videos,
+                'elapsed_seconds': round(elapsed, 1),
+                'total_views': sum(v.get('view_count') or 0 for v in videos),
+                'avg_engagement': round(sum(v.get('engagement_rate', 0) for v in videos) / len(videos), 2),
+                'top_videos': [
+                    {'title': v['title'], 'url': v['url'], 'views': v.get('view_count') or 0,
+                     'engagement_rate': v['engagement_rate']}
+                    for v in top[:10]
+                ],
+            }
+            with open(self.output_dir / INTERIM_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump(interim, f)
+        except OSError as e:
+            print(f"      ⚠️ Could not write interim reports: {e}")
+            return
+        
+        print(f"      📝 Interim reports ({len(videos)}/{selected} videos): {self.output_dir}")
+    
+    def run_report_stages(self):
+        """Build every report from self.video_data, timing each stage."""
+        with self.stage('reports'):
+            self.generate_analysis_reports()
+        with self.stage('notebooklm_prompts'):
+            self.generate_notebooklm_prompts()
+        with self.stage('master_summary'):
+            self.create_master_summary()
+    
+    def write_profile(self, variant=''):
+        """Write run_profile.json (timings, network, memory) into the output directory."""
+        try:
+            path = self.profiler.write(self.output_dir, variant)
+            print(f"   ⏱️  Run profile saved to: {path}")
+        except OSError as e:
+            print(f"   ⚠️ Could not write {PROFILE_FILENAME}: {e}")
+    
+    def record_growth_snapshot(self):
+        """Append this run's per-video counts to the growth time-series store."""
+        # Every scanned video contributes its view count; deep-analysed ones add likes/comments
+        snapshot = {v.get('id'): v for v in self.scanned_videos if v.get('id')}
+        for video in self.video_data:
+            snapshot[video['video_id']] = video
+        
+        try:
+            GrowthStore().record_snapshot(self.channel_name, snapshot.values(),
+                                          ts=self.profiler.started_at.timestamp())
+        except Exception as e:
+            print(f"   ⚠️ Could not update growth store: {e}")
+    
+    def publish_output(self):
+        """Move the staged run directory into place in one atomic rename (plus the optional archive)."""
+        (self.output_dir / INTERIM_FILENAME).unlink(missing_ok=True)
+        self.output_dir = self.run_output.publish(archive=self.archive)
+        if self.run_output.archive:
+            print(f"   🗜️  Archive saved to: {self.run_output.archive}")
+    
+    def publish_unfinished(self, state, error=None):
+        """Publish a failed or cancelled run marked as such, so its profile and interim reports stay reachable."""
+        if self.run_output is None or self.run_output.published:
+            return
+        try:
+            final_dir = self.run_output.publish_failed(state, error)
+        except OSError as e:
+            print(f"   ⚠️ Could not keep the unfinished run: {e}")
+            self.run_output.discard()
+            return
+        if final_dir:
+            self.output_dir = final_dir
+            print(f"   📁 Partial results kept in: {final_dir}")
+    
+    def catalogue_run(self):
+        """Record the finished run in the SQLite run catalogue."""
+        try:
+            RunCatalogue().record_run(
+                self.channel_name,
+                self.output_dir.name,
+                self.output_dir,
+                self.video_data,
+                [f.name for f in self.output_dir.iterdir() if f.is_file()],
+                channel_url=self.channel_url,
+                started_at=self.profiler.started_at.timestamp()
+            )
+        except Exception as e:
+            print(f"   ⚠️ Could not update run catalogue: {e}")
+    
     def generate_analysis_reports(self):
         """Generate comprehensive analysis reports."""
         print("\n\n📊 STEP 3: Generating Your Business Reports")
@@ -390,6 +581,7 @@ Create **3 distinct, niche-focused video concepts** using the patterns above. Ea
         # Find top performers
         most_viewed = max(self.video_data, key=lambda x: x.get('view_count', 0))
         highest_engagement = max(self.video_data, key=lambda x: x.get('engagement_rate', 0))
+        format_rows([most_viewed, highest_engagement])
         
         stats_content = f"""# {self.channel_name} - Channel Statistics Report
 
@@ -441,6 +633,8 @@ Based on the data analysis:
         # Sort videos by different metrics
         by_views = sorted(self.video_data, key=lambda x: x.get('view_count', 0), reverse=True)[:20]
         by_engagement = sorted(self.video_data, key=lambda x: x.get('engagement_rate', 0), reverse=True)[:20]
+        format_rows(by_views)
+        format_rows(by_engagement)
         
         content = f"""# {self.channel_name} - Success Metrics Analysis
 
@@ -579,14 +773,16 @@ Based on the data analysis:
 |------|-------|-------|------------|----------|------|
 """
         
+        format_rows(rankings['views'][:50])
         for i, video in enumerate(rankings['views'][:50], 1):
             content += f"| {i} | {video['title'][:60]}... | {video['view_count_formatted']} | {video['engagement_rate']}% | {video['duration_formatted']} | {video['upload_date_formatted']} |\n"
         
         # Export detailed CSV for analysis
         csv_file = self.output_dir / "detailed_video_data.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        with open(csv_file, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as f:
             if self.video_data:
-                writer = csv.DictWriter(f, fieldnames=self.video_data[0].keys())
+                format_rows(self.video_data)
+                writer = csv.DictWriter(f, fieldnames=self.csv_fields(), extrasaction='ignore')
                 writer.writeheader()
                 writer.writerows(self.video_data)
         
@@ -711,8 +907,8 @@ Use follow-up questions to deepen analysis (50 queries/day on free tier)
         print("   ✅ Generated Master Prompt with full workflow + URL list\n")
 
     
-    def create_master_summary(self):
-        """Create a master summary and action plan."""
+    def create_master_summary(self, note=''):
+        """Create a master summary and action plan (`note` is shown under the title)."""
         print("\n📋 STEP 5: Compiling Master Summary")
         print("="*80)
         print("   🎯 Creating executive summary with actionable insights...")
@@ -723,11 +919,12 @@ Use follow-up questions to deepen analysis (50 queries/day on free tier)
         avg_engagement = sum(v.get('engagement_rate', 0) for v in self.video_data) / len(self.video_data)
         
         top_video = max(self.video_data, key=lambda x: x.get('view_count', 0))
+        format_rows([top_video])
         top_tags = [tag for tag, _ in Counter([tag for video in self.video_data for tag in video.get('tags', [])]).most_common(10)]
         
         summary_content = f"""# 🎯 {self.channel_name} - Master Analysis Summary
 
-**Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{note}**Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Channel URL**: {self.channel_url}
 **Videos Analyzed**: {len(self.video_data)}
 
@@ -786,7 +983,7 @@ Based on the analysis, this channel could:
 
 ## 🔍 Key Success Factors Identified
 
-1. **Content Topics**: {top_tags[0]} content generates highest engagement
+1. **Content Topics**: {(top_tags or ['Core'])[0]} content generates highest engagement
 2. **Video Length**: {sum(v.get('duration', 0) for v in sorted(self.video_data, key=lambda x: x.get('view_count', 0), reverse=True)[:10]) // 10 // 60}-minute videos perform best
 3. **Engagement**: Videos with {avg_engagement:.1f}%+ engagement rate see 3x more growth
 4. **Consistency**: Regular posting in successful categories maintains momentum
@@ -823,6 +1020,8 @@ This analysis provides a complete blueprint for understanding and replicating su
         print("   🏷️  03_content_themes.md - Topic and theme analysis") 
         print("   🏆 04_performance_rankings.md - Complete rankings")
         print("   📊 detailed_video_data.csv - Full dataset for Excel")
+        print(f"   📦 {DATASET_FILENAME} - Snapshot for --from-dataset regeneration")
+        print(f"   ⏱️  {PROFILE_FILENAME} - Stage timings, network and memory profile")
         print("   📝 MASTER_NOTEBOOKLM_PROMPT.md - Get 5 video ideas instantly")
         print("   🔗 video_urls_for_notebooklm.txt - URLs for NotebookLM import")
         print()
@@ -835,30 +1034,48 @@ This analysis provides a complete blueprint for understanding and replicating su
         print("💡 Pro Tip: Start with the Success Analysis prompt in NotebookLM!")
         print("=" * 80)
     
-    def run_complete_analysis(self):
+    def run_complete_analysis(self, channel_url=None, offer_open=True):
         """Run the complete analysis pipeline."""
         try:
             # Display banner and get input
             self.display_banner()
-            self.get_channel_input()
+            if channel_url:
+                self.set_channel(channel_url)
+            else:
+                self.get_channel_input()
+            
+            self.profiler.start_cpu_profile()
+            self.status.start(self.channel_name, self.channel_url, self.output_dir)
             
             # Step 1: Extract metadata
             if not self.extract_video_metadata():
                 print("❌ Failed to extract video metadata. Exiting.")
+                self.write_profile()
+                self.publish_unfinished('failed', error='metadata extraction failed')
+                self.status.finish('failed', error='metadata extraction failed',
+                                   output_dir=str(self.output_dir), run_id=self.output_dir.name)
                 return
             
-            # Step 2: Generate analysis reports  
-            self.generate_analysis_reports()
-            
-            # Step 3: Generate NotebookLM prompts
-            self.generate_notebooklm_prompts()
+            # Keep a lossless copy so reports can be regenerated with --from-dataset
+            with self.stage('save_dataset'):
+                self.save_dataset()
+            with self.stage('growth_snapshot'):
+                self.record_growth_snapshot()
             
-            # Step 4: Create master summary
-            self.create_master_summary()
+            # Steps 2-4: Analysis reports, NotebookLM prompts, master summary
+            self.run_report_stages()
+            self.write_profile()
+            self.publish_output()
+            self.catalogue_run()
+            self.status.finish('completed', videos=len(self.video_data),
+                               output_dir=str(self.output_dir), run_id=self.output_dir.name)
             
             # Display completion summary
             self.display_completion_summary()
             
+            if not offer_open:
+                return
+            
             # Ask to open output folder
             print("\n" + "="*80)
             open_folder = input("\n📂 Open analysis folder to review your success insights? (y/n): ").lower()
@@ -875,9 +1092,18 @@ This analysis provides a complete blueprint for understanding and replicating su
                     
         except KeyboardInterrupt:
             print("\n\n⚠️ Analysis cancelled by user.")
+            if self.run_output is not None and not self.run_output.published:
+                self.write_profile()
+            self.publish_unfinished('cancelled')
+            self.status.finish('cancelled', output_dir=str(self.output_dir), run_id=self.output_dir.name)
             print("💡 Run the script again anytime to analyze channels!")
         except Exception as e:
             print(f"\n❌ Error during analysis: {e}")
+            if self.run_output is not None and not self.run_output.published:
+                self.write_profile()
+            self.publish_unfinished('failed', error=str(e))
+            self.status.finish('failed', error=str(e), output_dir=str(self.output_dir),
+                               run_id=self.output_dir.name)
             print("\n🔧 Troubleshooting:")
             print("   • Make sure the channel URL is valid")
             print("   • Check your internet connection")
@@ -886,6 +1112,109 @@ This analysis provides a complete blueprint for understanding and replicating su
             print("\n💡 Need help? The channel URL should look like:")
             print("   https://www.youtube.com/@channelname")
 
+def _positive(convert):
+    """argparse type for numbers above zero (a sample of 0 or a negative budget selects nothing,
+    and a zero interval or per-video cost divides by zero)."""
+    def parse(value):
+        import argparse
+        try:
+            number = convert(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+        if not number > 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+        return number
+    return parse
+
+def parse_args(argv=None):
+    """Parse command-line options (cheap: no heavy imports happen here)."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Analyze a YouTube channel and generate success reports + NotebookLM prompts."
+    )
+    parser.add_argument('--url', action='append',
+                        help="Channel URL to analyze (skips the interactive prompt). Repeat to analyze several "
+                             "channels in one batch over a shared extraction session")
+    parser.add_argument('--no-open', action='store_true', help="Don't offer to open the output folder")
+    parser.add_argument('--from-dataset', metavar='PATH',
+                        help=f"Rebuild reports from a previous run's {DATASET_FILENAME} (or its run directory) "
+                             "without any network access")
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help="With --from-dataset: write reports here instead of the dataset's directory")
+    parser.add_argument('--cpu-profile', choices=CPU_PROFILERS,
+                        help="Also record a CPU profile: 'cprofile' (deterministic) or 'sample' (low overhead)")
+    parser.add_argument('--deep', action='store_true',
+                        help="Re-extract every deep-analysed video from YouTube for likes, tags and descriptions "
+                             "(one request per video; needed for --time-budget)")
+    parser.add_argument('--extractor-url', metavar='URL',
+                        help="Extract from a local stand-in server (benchmarks/standin_server.py) instead of YouTube")
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"With --extractor-url: keep-alive connections to reuse (0 disables pooling, "
+                             f"default {DEFAULT_POOL_SIZE})")
+    parser.add_argument('--profile', choices=EXTRACTION_PROFILES, default=DEFAULT_PROFILE,
+                        help="Per-video fields to fetch, keep and export: 'minimal' (ids, title, counts, "
+                             "duration, date), 'standard' (+ uploader, tags, categories) or 'full' "
+                             f"(+ description, thumbnail; default {DEFAULT_PROFILE})")
+    parser.add_argument('--sample', choices=tuple(STRATEGIES),
+                        help="Which videos get the deep analysis: 'top' (most viewed, default), 'stratified' "
+                             "(across view deciles and upload-date buckets), 'recent' (newest) or 'budget' "
+                             "(most viewed first until --time-budget runs out)")
+    parser.add_argument('--sample-size', type=_positive(int), metavar='N',
+                        help="Videos to deep-analyze (default: 30%% of the channel, minimum 10)")
+    parser.add_argument('--time-budget', type=_positive(float), metavar='SECONDS',
+                        help="Wall-clock budget for the deep analysis (implies --sample budget, so it cannot be "
+                             "combined with another --sample)")
+    parser.add_argument('--anytime', action='store_true',
+                        help="Write interim 00_MASTER_SUMMARY.md and rankings at checkpoints during the deep "
+                             "analysis, so results are usable before it finishes (pair with --time-budget)")
+    parser.add_argument('--archive', choices=ARCHIVE_FORMATS,
+                        help="Also save the finished run as a single compressed archive next to its directory")
+    parser.add_argument('--checkpoint-interval', type=_positive(float), default=CHECKPOINT_INTERVAL, metavar='SECONDS',
+                        help=f"With --anytime: seconds between interim reports (default {CHECKPOINT_INTERVAL})")
+    parser.add_argument('--seconds-per-video', type=_positive(float), default=DEFAULT_SECONDS_PER_VIDEO,
+                        help=f"Per-video fetch cost used for estimates with --deep or --extractor-url "
+                             f"(default {DEFAULT_SECONDS_PER_VIDEO}s)")
+    args = parser.parse_args(argv)
+    if args.time_budget:
+        if args.sample not in (None, 'budget'):
+            parser.error(f"--time-budget picks videos with --sample budget; it cannot be combined with "
+                         f"--sample {args.sample}")
+        args.sample = 'budget'
+    elif args.sample == 'budget':
+        parser.error("--sample budget needs --time-budget")
+    elif args.sample is None:
+        args.sample = DEFAULT_STRATEGY
+    if args.time_budget and not (args.deep or args.extractor_url):
+        parser.error("--time-budget needs --deep (or --extractor-url): without a request per video the "
+                     "deep analysis takes next to no time, so there is nothing to budget")
+    return args
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = parse_args(argv)
+    
+    if args.from_dataset:
+        YouTubeSuccessAnalyzer(cpu_profiler=args.cpu_profile).regenerate_reports(
+            args.from_dataset, output_dir=args.output_dir)
+        return
+    
+    if args.extractor_url:
+        extractor = StandInExtractor(args.extractor_url, pool_size=args.pool_size)
+    else:
+        extractor = YtDlpExtractor(deep=args.deep)
+    
+    # One session for the whole batch: connections are reused across channels
+    with extractor:
+        for url in args.url or [None]:
+            sampler = make_strategy(args.sample, size=args.sample_size, budget_seconds=args.time_budget,
+                                    seconds_per_video=args.seconds_per_video)
+            analyzer = YouTubeSuccessAnalyzer(cpu_profiler=args.cpu_profile, extractor=extractor,
+                                              profile=args.profile, sampler=sampler, anytime=args.anytime,
+                                              checkpoint_interval=args.checkpoint_interval, archive=args.archive)
+            analyzer.run_complete_analysis(channel_url=url, offer_open=not args.no_open)
+
+
 if __name__ == '__main__':
-    analyzer = YouTubeSuccessAnalyzer()
-    analyzer.run_complete_analysis()
\ No newline at end of file
+    main()
\ No newline at end of file